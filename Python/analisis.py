@@ -0,0 +1,157 @@
+# Análisis de un tablero: tiempos de salida por casilla y tabla de parejas.
+#
+# Para elegir la casilla inicial interesa saber, sobre un tablero dado, quién
+# gana para cada pareja (inicio1, inicio2). Re-simular cada pareja desde una
+# copia del tablero cuesta O(N⁴·T); acá se comparte trabajo entre parejas:
+#
+#   1. Para cada casilla se simula una sola vez un caminante solitario y se
+#      guarda su camino (casillas que abandona, en orden) y su tiempo de salida.
+#   2. Dos caminantes solo se influyen si uno pisa una casilla que el otro ya
+#      rotó. Si los caminos (recortados hasta el turno en que terminaría la
+#      partida) no comparten casillas, el resultado sale directo de los dos
+#      tiempos de salida.
+#   3. Solo las parejas cuyos caminos se cruzan se simulan de verdad, sobre una
+#      vista copy-on-write del tablero (un dict con las casillas modificadas),
+#      sin copiar la grilla.
+
+from logica import Tablero
+
+def _caminar(base, filas, columnas, k):
+    """Camino de un caminante solitario desde el índice plano k (tablero sin modificar)."""
+    cambios = {}
+    camino = []
+    primera = {}
+    i, j = divmod(k, columnas)
+    while True:
+        d = cambios.get(k)
+        if d is None:
+            d = base[k]
+        cambios[k] = (d + 1) & 3
+        if k not in primera:
+            primera[k] = len(camino)
+        camino.append(k)
+        di, dj = Tablero.DELTAS[d]
+        i += di
+        j += dj
+        if not (0 <= i < filas and 0 <= j < columnas):
+            return camino, primera
+        k = i * columnas + j
+
+def _simular_sobre(base, filas, columnas, k1, k2):
+    """Partida completa sobre una vista copy-on-write de `base`. Devuelve (ganador, turnos)."""
+    cambios = {}
+    pos = [divmod(k1, columnas), divmod(k2, columnas)]
+    turnos = 0
+    while True:
+        for jug in (0, 1):
+            i, j = pos[jug]
+            k = i * columnas + j
+            d = cambios.get(k)
+            if d is None:
+                d = base[k]
+            cambios[k] = (d + 1) & 3
+            turnos += 1
+            di, dj = Tablero.DELTAS[d]
+            i += di
+            j += dj
+            if not (0 <= i < filas and 0 <= j < columnas):
+                return 2 - jug, turnos
+            pos[jug] = (i, j)
+
+class TablaParejas:
+    """Resultados de todas las parejas de casillas iniciales de un tablero.
+
+    salida[i][j]: movimientos que tarda en salir un caminante solitario desde (i, j).
+    ganador(pos1, pos2) / turnos(pos1, pos2): resultado exacto de la partida en la
+    que el jugador 1 (el que mueve primero) arranca en pos1 y el jugador 2 en pos2.
+    """
+    def __init__(self, filas, columnas, salida, ganadores, turnos, simuladas):
+        self.filas = filas
+        self.columnas = columnas
+        self.salida = salida
+        self._ganadores = ganadores
+        self._turnos = turnos
+        self.simuladas = simuladas  # parejas que hubo que simular completas
+
+    def _indice(self, pos1, pos2):
+        n = self.filas * self.columnas
+        return (pos1[0] * self.columnas + pos1[1]) * n + pos2[0] * self.columnas + pos2[1]
+
+    def ganador(self, pos1, pos2):
+        return self._ganadores[self._indice(pos1, pos2)]
+
+    def turnos(self, pos1, pos2):
+        return self._turnos[self._indice(pos1, pos2)]
+
+    def probabilidad_inicio(self):
+        """
+        Matriz filas x columnas: fracción de respuestas del rival contra las que
+        gana quien elige primero (y mueve primero) empezando en cada casilla.
+        """
+        n = self.filas * self.columnas
+        res = [[0.0] * self.columnas for _ in range(self.filas)]
+        if n < 2:
+            return res
+        for k1 in range(n):
+            fila = self._ganadores[k1 * n:(k1 + 1) * n]
+            res[k1 // self.columnas][k1 % self.columnas] = fila.count(1) / (n - 1)
+        return res
+
+    def respuestas(self, pos1):
+        """
+        Matriz filas x columnas para quien elige segundo, sabiendo que el rival
+        empieza en pos1: 1.0 si gana empezando en esa casilla, 0.0 si pierde y
+        None en la casilla ocupada.
+        """
+        n = self.filas * self.columnas
+        k1 = pos1[0] * self.columnas + pos1[1]
+        res = [[0.0] * self.columnas for _ in range(self.filas)]
+        for k2 in range(n):
+            g = self._ganadores[k1 * n + k2]
+            res[k2 // self.columnas][k2 % self.columnas] = None if k2 == k1 else float(g == 2)
+        return res
+
+def analizar(tablero):
+    """Calcula la TablaParejas de `tablero` sin modificarlo."""
+    base = bytes(tablero.direcciones)
+    filas, columnas = tablero.filas, tablero.columnas
+    n = filas * columnas
+    caminos = []
+    primeras = []
+    for k in range(n):
+        camino, primera = _caminar(base, filas, columnas, k)
+        caminos.append(camino)
+        primeras.append(primera)
+    largos = [len(c) for c in caminos]
+
+    ganadores = bytearray(n * n)  # 0 en la diagonal (misma casilla)
+    turnos = [0] * (n * n)
+    simuladas = 0
+    for k1 in range(n):
+        t1 = largos[k1]
+        camino1 = caminos[k1]
+        fila = k1 * n
+        for k2 in range(n):
+            if k2 == k1:
+                continue
+            t2 = largos[k2]
+            # si no se cruzan: J1 sale en el turno 2*t1-1, J2 en el turno 2*t2
+            if t1 <= t2:
+                m1, m2, g, tt = t1, t1 - 1, 2, 2 * t1 - 1
+            else:
+                m1, m2, g, tt = t2, t2, 1, 2 * t2
+            primera2 = primeras[k2]
+            cruce = False
+            for paso in range(m1):
+                p = primera2.get(camino1[paso])
+                if p is not None and p < m2:
+                    cruce = True
+                    break
+            if cruce:
+                g, tt = _simular_sobre(base, filas, columnas, k1, k2)
+                simuladas += 1
+            ganadores[fila + k2] = g
+            turnos[fila + k2] = tt
+
+    salida = [largos[i * columnas:(i + 1) * columnas] for i in range(filas)]
+    return TablaParejas(filas, columnas, salida, ganadores, turnos, simuladas)
@@ -0,0 +1,368 @@
+# Suite de benchmarks del núcleo del juego y de la GUI, con resultados en JSON.
+#
+# Uso:  python bench.py [--tamanios 8 64 256 1000 2000] [--solo micro|macro]
+#                       [--salida resultados.json] [--comparar anterior.json]
+#
+# Micro (por operación):
+#   tablero.mover_desde, jugador.mover, casilla.rotar (Casilla suelta y
+#   tablero.casillas[i][j]), construcción del tablero (al azar y desde
+#   semilla), Tablero.imprimir de la versión de consola y un cuadro por turno
+#   de consola.RenderizadorConsola (diferencial ANSI y texto completo).
+# Macro:
+#   partidas completas por segundo con motor.simular, turnos por segundo de
+#   PartidaMultiple.ronda con CAMINANTES jugadores, turnos por segundo de
+#   compartido.Simulador publicando en memoria compartida (el efecto de los
+#   lectores se mide con python compartido.py prueba) y costo por turno de
+#   GameWindow.actualizar_tablero_visual (incremental y completo). La parte
+#   de GUI necesita un display: en un servidor, xvfb-run python bench.py.
+#
+# Cada medición se repite REPETICIONES veces y se queda con la mejor. Con
+# --salida se guarda un JSON que después se puede pasar a --comparar (p. ej.
+# el de antes de un cambio) para ver, por cada medición, cuánto mejoró o empeoró.
+# Los bench_*.py sueltos siguen sirviendo para comparar implementaciones.
+
+import argparse
+import contextlib
+import importlib.machinery
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from compartido import Simulador
+from consola import RenderizadorConsola
+from logica import Casilla, Jugador, Tablero
+from motor import PartidaMultiple, simular
+
+TAMANIOS = [8, 64, 256, 1000, 2000]
+REPETICIONES = 3
+PASOS_MICRO = 20000         # operaciones por repetición en los micro-benchmarks
+PRESUPUESTO_PARTIDAS = 0.5  # segundos por repetición de partidas completas
+TURNOS_GUI = 200
+CAMINANTES = 256
+MAX_SEGUNDOS = 2.0
+
+def mejor_tiempo(funcion, repeticiones=REPETICIONES):
+    """
+    Mejor tiempo (s) de hasta `repeticiones` llamadas a funcion(). Si una
+    sola llamada ya tarda más de MAX_SEGUNDOS (p. ej. imprimir 2000x2000),
+    no se repite.
+    """
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - t0)
+        if mejor > MAX_SEGUNDOS:
+            break
+    return mejor
+
+def resultado(nombre, n, segundos, ops, unidad="op"):
+    return {"nombre": nombre, "tamanio": n, "us_por_" + unidad: segundos / ops * 1e6,
+            unidad + "s_por_s": ops / segundos if segundos > 0 else None}
+
+def posiciones_al_azar(n, cantidad, semilla=0):
+    rnd = random.Random(semilla)
+    return [(rnd.randrange(n), rnd.randrange(n)) for _ in range(cantidad)]
+
+# -------------------------------
+# Micro-benchmarks
+# -------------------------------
+def micro_mover_desde(n):
+    tablero = Tablero.desde_semilla(n, n, 0)
+    entradas = posiciones_al_azar(n, 64)
+
+    def caminar():
+        pos = entradas[0]
+        e = 0
+        for _ in range(PASOS_MICRO):
+            pos, _ = tablero.mover_desde(pos)
+            if pos is None:
+                e = (e + 1) & 63
+                pos = entradas[e]
+    return resultado("micro/tablero.mover_desde", n, mejor_tiempo(caminar), PASOS_MICRO)
+
+def micro_jugador_mover(n):
+    tablero = Tablero.desde_semilla(n, n, 0)
+    entradas = posiciones_al_azar(n, 64)
+    jugador = Jugador("bench")
+    jugador.posicion = entradas[0]
+    jugador.preparar(tablero)
+
+    def caminar():
+        e = 0
+        for _ in range(PASOS_MICRO):
+            sigue, _ = jugador.mover(tablero)
+            if not sigue:
+                e = (e + 1) & 63
+                jugador.posicion = entradas[e]
+    return resultado("micro/jugador.mover", n, mejor_tiempo(caminar), PASOS_MICRO)
+
+def micro_casilla_rotar(n):
+    tablero = Tablero.desde_semilla(n, n, 0)
+    celdas = [tablero.casillas[i][j] for i, j in posiciones_al_azar(n, 64)]
+    suelta = Casilla(0)
+
+    def rotar_vistas():
+        for k in range(PASOS_MICRO):
+            celdas[k & 63].rotar()
+
+    def rotar_suelta():
+        for _ in range(PASOS_MICRO):
+            suelta.rotar()
+    return [resultado("micro/casilla.rotar (tablero.casillas[i][j])", n, mejor_tiempo(rotar_vistas), PASOS_MICRO),
+            resultado("micro/casilla.rotar (Casilla suelta)", n, mejor_tiempo(rotar_suelta), PASOS_MICRO)]
+
+def micro_construccion(n):
+    return [resultado("micro/Tablero(n, n)", n, mejor_tiempo(lambda: Tablero(n, n)), n * n, "casilla"),
+            resultado("micro/Tablero.desde_semilla", n, mejor_tiempo(lambda: Tablero.desde_semilla(n, n, 0)),
+                      n * n, "casilla")]
+
+def cargar_consola():
+    """Importa el script de consola (no tiene extensión .py) sin ejecutar el juego."""
+    ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sistema_dinamico_repulsor")
+    cargador = importlib.machinery.SourceFileLoader("sistema_dinamico_repulsor", ruta)
+    spec = importlib.util.spec_from_loader(cargador.name, cargador)
+    modulo = importlib.util.module_from_spec(spec)
+    cargador.exec_module(modulo)
+    return modulo
+
+def micro_imprimir(n, consola):
+    tablero = consola.Tablero.desde_semilla(n, n, 0)
+    pos1, pos2 = (n // 2, n // 2), (n // 2, n // 2 - 1)
+
+    def imprimir():
+        with contextlib.redirect_stdout(io.StringIO()):
+            tablero.imprimir(pos1, pos2)
+    return resultado("micro/Tablero.imprimir (consola)", n, mejor_tiempo(imprimir), n * n, "casilla")
+
+class Descarte(io.StringIO):
+    def write(self, texto):
+        return len(texto)
+
+def micro_renderizador(n):
+    """Un turno + un cuadro de RenderizadorConsola, en una terminal fija de 50x200."""
+    salida = []
+    inicio = ((n // 2, n // 2), (n // 2, n // 2 - 1))
+    for modo, pasos in (("ansi", PASOS_MICRO), ("texto", 200)):
+        tablero = Tablero.desde_semilla(n, n, 0)
+        pantalla = RenderizadorConsola(tablero, Descarte(), modo, alto=50, ancho=200)
+
+        def jugar():
+            pos, otro = inicio
+            for _ in range(pasos):
+                pantalla.dibujar((pos, otro), "bench", foco=pos)
+                nueva, _ = tablero.mover_desde(pos)
+                if nueva is None:
+                    # salió: se empieza otra partida en el mismo tablero
+                    pos, otro = inicio
+                else:
+                    pos, otro = otro, nueva
+        salida.append(resultado(f"micro/RenderizadorConsola.dibujar ({modo})", n, mejor_tiempo(jugar), pasos, "turno"))
+    return salida
+
+# -------------------------------
+# Macro-benchmarks
+# -------------------------------
+def macro_partidas(n):
+    """Partidas completas con motor.simular sobre copias de un tablero, desde casillas al azar."""
+    original = Tablero.desde_semilla(n, n, 0)
+    inicios = posiciones_al_azar(n, 512)
+    mejor = None
+    for _ in range(REPETICIONES):
+        partidas = pasos = 0
+        t0 = time.perf_counter()
+        limite = t0 + PRESUPUESTO_PARTIDAS
+        while time.perf_counter() < limite:
+            p1 = inicios[partidas % 512]
+            p2 = inicios[(partidas * 7 + 1) % 512]
+            pasos += simular(original.copiar(), p1, p2).turnos
+            partidas += 1
+        segundos = time.perf_counter() - t0
+        if mejor is None or partidas / segundos > mejor[0] / mejor[2]:
+            mejor = (partidas, pasos, segundos)
+    partidas, pasos, segundos = mejor
+    r = resultado("macro/partidas motor.simular", n, segundos, partidas, "partida")
+    r["turnos_por_s"] = pasos / segundos
+    return r
+
+def macro_multiple(n):
+    """Rondas de PartidaMultiple con CAMINANTES jugadores; se empieza otra partida si termina."""
+    original = Tablero.desde_semilla(n, n, 0)
+    inicios = posiciones_al_azar(n, CAMINANTES)
+
+    def jugar():
+        turnos = 0
+        limite = time.perf_counter() + PRESUPUESTO_PARTIDAS
+        while time.perf_counter() < limite:
+            partida = PartidaMultiple(original.copiar(), inicios)
+            while not partida.terminada and time.perf_counter() < limite:
+                partida.ronda()
+            turnos += partida.turnos
+        return turnos
+    mejor = None
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        turnos = jugar()
+        segundos = time.perf_counter() - t0
+        if mejor is None or turnos / segundos > mejor[0] / mejor[1]:
+            mejor = (turnos, segundos)
+    return resultado(f"macro/PartidaMultiple.ronda ({CAMINANTES} jugadores)", n, mejor[1], mejor[0], "turno")
+
+def macro_compartido(n):
+    """
+    Turnos por segundo de dos jugadores en Simulador.correr, publicando cada
+    compartido.PERIODO; si la partida termina se empieza otra (con otro bloque).
+    """
+    original = Tablero.desde_semilla(n, n, 0)
+    inicios = posiciones_al_azar(n, 2)
+
+    def jugar():
+        turnos = 0
+        limite = time.monotonic() + PRESUPUESTO_PARTIDAS
+        while time.monotonic() < limite:
+            sim = Simulador(original.copiar(), inicios)
+            try:
+                sim.correr(hasta=limite)
+            finally:
+                sim.compartido.cerrar()
+            turnos += sim.partida.turnos
+        return turnos
+    mejor = None
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        turnos = jugar()
+        segundos = time.perf_counter() - t0
+        if mejor is None or turnos / segundos > mejor[0] / mejor[1]:
+            mejor = (turnos, segundos)
+    return resultado("macro/compartido.Simulador (2 jugadores)", n, mejor[1], mejor[0], "turno")
+
+class GUI:
+    """Una Aplicacion compartida para medir GameWindow (necesita display)."""
+    def __init__(self):
+        import repulsor_gui
+        repulsor_gui.messagebox.showinfo = lambda *a, **k: None  # no esperar el aviso final
+        self.modulo = repulsor_gui
+        self.app = repulsor_gui.Aplicacion()
+
+    def ventana(self, n):
+        j1, j2 = Jugador("1"), Jugador("2")
+        j1.posicion, j2.posicion = (n // 2, n // 2), (n // 2, n // 2 - 1)
+        return self.app.mostrar(self.modulo.GameWindow, j1, j2, n, n, Tablero.desde_semilla(n, n, 0))
+
+    def cerrar(self):
+        self.app.root.destroy()
+
+def macro_gui(n, gui):
+    """Costo por turno de actualizar_tablero_visual (jugar_turno no se cuenta)."""
+    salida = []
+    for nombre, completo in (("incremental", False), ("completo", True)):
+        ventana = gui.ventana(n)
+        ventana.win.update_idletasks()
+        total = 0.0
+        medidos = 0
+        while medidos < TURNOS_GUI:
+            if not ventana.jugar_turno(animar=False):
+                # terminó la partida: se sigue midiendo en una nueva
+                ventana = gui.ventana(n)
+                ventana.win.update_idletasks()
+                continue
+            t0 = time.perf_counter()
+            ventana.actualizar_tablero_visual(completo=completo)
+            ventana.win.update_idletasks()
+            total += time.perf_counter() - t0
+            medidos += 1
+        salida.append(resultado(f"macro/actualizar_tablero_visual ({nombre})", n, total, medidos, "turno"))
+    return salida
+
+# -------------------------------
+# Ejecución, JSON y comparación
+# -------------------------------
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def correr(tamanios, solo=None, mostrar=print):
+    resultados = []
+
+    def agregar(r):
+        for x in (r if isinstance(r, list) else [r]):
+            resultados.append(x)
+            mostrar(formatear(x))
+
+    if solo in (None, "micro"):
+        consola = cargar_consola()
+        for n in tamanios:
+            agregar(micro_mover_desde(n))
+            agregar(micro_jugador_mover(n))
+            agregar(micro_casilla_rotar(n))
+            agregar(micro_construccion(n))
+            agregar(micro_imprimir(n, consola))
+            agregar(micro_renderizador(n))
+    if solo in (None, "macro"):
+        for n in tamanios:
+            agregar(macro_partidas(n))
+            agregar(macro_multiple(n))
+            agregar(macro_compartido(n))
+        try:
+            gui = GUI()
+        except Exception as e:  # sin display (TclError) o sin tkinter
+            mostrar(f"GUI omitida: {e}")
+        else:
+            try:
+                for n in tamanios:
+                    agregar(macro_gui(n, gui))
+            finally:
+                gui.cerrar()
+    return {"commit": commit_actual(), "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(), "plataforma": platform.platform(),
+            "resultados": resultados}
+
+def metrica(r):
+    """Clave y valor de 'microsegundos por unidad' de un resultado."""
+    for clave, valor in r.items():
+        if clave.startswith("us_por_"):
+            return clave[len("us_por_"):], valor
+    return None, None
+
+def formatear(r):
+    unidad, us = metrica(r)
+    return f"{r['nombre']:<48} {r['tamanio']:>5}  {us:>12.3f} µs/{unidad}"
+
+def comparar(actual, anterior, mostrar=print):
+    previos = {(r["nombre"], r["tamanio"]): r for r in anterior["resultados"]}
+    mostrar(f"\nComparación con {anterior.get('commit') or 'resultado anterior'} (>1 = más rápido ahora):")
+    for r in actual["resultados"]:
+        p = previos.get((r["nombre"], r["tamanio"]))
+        if p is None:
+            continue
+        _, ahora = metrica(r)
+        _, antes = metrica(p)
+        mostrar(f"{r['nombre']:<48} {r['tamanio']:>5}  {antes:>10.3f} -> {ahora:>10.3f}  x{antes / ahora:.2f}")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks del Sistema Dinámico Repulsor.")
+    parser.add_argument("--tamanios", type=int, nargs="+", default=TAMANIOS, help="lados N de tableros NxN")
+    parser.add_argument("--solo", choices=("micro", "macro"), help="correr solo una parte")
+    parser.add_argument("--salida", help="guardar los resultados en este JSON")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    datos = correr(args.tamanios, args.solo)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(datos, json.load(f))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+# Benchmark: latencia por turno de GameWindow (refresco incremental vs. completo).
+#
+# Uso:  python bench_gui.py [tamaño ...]      (por defecto 10 50 200 1000)
+#
+# Necesita un display (en un servidor: xvfb-run python bench_gui.py).
+# Para cada tamaño N×N mide cuánto tarda en crearse la ventana del juego
+# (sin contar el sorteo del tablero), juega `TURNOS` turnos con avanzar_turno
+# (refresco de celdas sucias) y mide lo mismo forzando el repintado de todas
+# las casillas visibles. Los tiempos incluyen update_idletasks(), es decir,
+# lo que tarda Tk en dibujar los cambios.
+
+import statistics
+import sys
+import time
+import tkinter as tk
+
+import repulsor_gui
+from logica import Jugador, Tablero
+
+TURNOS = 200
+
+# no quedarse esperando en el aviso de fin de partida
+repulsor_gui.messagebox.showinfo = lambda *a, **k: None
+APP = None
+
+def nueva_ventana(n, tablero=None):
+    global APP
+    if APP is None:
+        APP = repulsor_gui.Aplicacion()
+    j1, j2 = Jugador("1"), Jugador("2")
+    j1.posicion, j2.posicion = (n // 2, n // 2), (n // 2, n // 2 - 1)
+    return APP.mostrar(repulsor_gui.GameWindow, j1, j2, n, n, tablero or Tablero(n, n))
+
+def medir_creacion(n):
+    tablero = Tablero(n, n)
+    t0 = time.perf_counter()
+    ventana = nueva_ventana(n, tablero)
+    ventana.win.update_idletasks()
+    return time.perf_counter() - t0
+
+def medir(n, completo):
+    ventana = nueva_ventana(n)
+    tiempos = []
+    while len(tiempos) < TURNOS:
+        if ventana.btn_avanzar.cget("state") == "disabled":
+            ventana = nueva_ventana(n)
+        t0 = time.perf_counter()
+        ventana.avanzar_turno()
+        if completo:
+            ventana.actualizar_tablero_visual(completo=True)
+        ventana.win.update_idletasks()
+        tiempos.append(time.perf_counter() - t0)
+    return tiempos
+
+def main(argv):
+    tamanios = [int(a) for a in argv] or [10, 50, 200, 1000]
+    print(f"{'tamaño':>10} {'creación ms':>12}")
+    for n in tamanios:
+        print(f"{n:>5}x{n:<4} {medir_creacion(n) * 1000:>12.1f}")
+    print()
+    print(f"{'tamaño':>10} {'modo':>12} {'media ms':>9} {'p95 ms':>8}")
+    for n in tamanios:
+        for nombre, completo in (("incremental", False), ("completo", True)):
+            tiempos = sorted(medir(n, completo))
+            p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+            print(f"{n:>5}x{n:<4} {nombre:>12} {statistics.mean(tiempos) * 1000:>9.3f} {p95 * 1000:>8.3f}")
+
+if __name__ == "__main__":
+    try:
+        main(sys.argv[1:])
+    except tk.TclError as e:
+        sys.exit(f"No se pudo abrir la ventana ({e}). Probar con: xvfb-run python bench_gui.py")
@@ -0,0 +1,69 @@
+# Benchmark: partidas de a una (Jugador.mover / motor.simular) vs. lotes con NumPy.
+#
+# Uso:  python bench_lotes.py [K] [tamaño]      (por defecto 20000 partidas de 10x10)
+#
+# Juega las mismas K partidas (mismos tableros y posiciones iniciales) por los
+# tres caminos, verifica que los resultados coincidan y muestra pasos/s.
+
+import random
+import sys
+import time
+
+from logica import Tablero, Jugador
+from motor import simular
+from lotes import desde_tableros, simular_lote
+
+def partida_con_jugadores(tablero, pos1, pos2):
+    j1, j2 = Jugador("1"), Jugador("2")
+    j1.posicion, j2.posicion = pos1, pos2
+    actual, otro, turnos = j1, j2, 0
+    while True:
+        sigue, pos_rotada = actual.mover(tablero)
+        turnos += 1
+        if not sigue:
+            return (1 if otro is j1 else 2), turnos, pos_rotada
+        actual, otro = otro, actual
+
+def main(argv):
+    k = int(argv[0]) if argv else 20000
+    n = int(argv[1]) if len(argv) > 1 else 10
+    rnd = random.Random(0)
+    tableros = [Tablero(n, n, [rnd.randrange(4) for _ in range(n * n)]) for _ in range(k)]
+    inicios = []
+    for _ in range(k):
+        p1 = (rnd.randrange(n), rnd.randrange(n))
+        p2 = p1
+        while p2 == p1:
+            p2 = (rnd.randrange(n), rnd.randrange(n))
+        inicios.append((p1, p2))
+
+    copias = [t.copiar() for t in tableros]
+    t0 = time.perf_counter()
+    esperado = [partida_con_jugadores(t, p1, p2) for t, (p1, p2) in zip(copias, inicios)]
+    t_jug = time.perf_counter() - t0
+    pasos = sum(r[1] for r in esperado)
+
+    copias = [t.copiar() for t in tableros]
+    t0 = time.perf_counter()
+    escalar = [simular(t, p1, p2) for t, (p1, p2) in zip(copias, inicios)]
+    t_motor = time.perf_counter() - t0
+
+    lote = desde_tableros(tableros)
+    p1s = [p1 for p1, _ in inicios]
+    p2s = [p2 for _, p2 in inicios]
+    t0 = time.perf_counter()
+    res = simular_lote(lote, p1s, p2s)
+    t_lote = time.perf_counter() - t0
+
+    for idx, (g, tt, s) in enumerate(esperado):
+        assert (escalar[idx].ganador, escalar[idx].turnos, escalar[idx].salida) == (g, tt, s)
+        assert (int(res.ganador[idx]), int(res.turnos[idx]), tuple(res.salida[idx].tolist())) == (g, tt, s)
+    for t, final in zip(copias, lote):
+        assert bytes(t.direcciones) == final.tobytes()
+
+    print(f"{k} partidas {n}x{n}, {pasos} pasos en total (resultados idénticos)")
+    for nombre, seg in (("Jugador.mover", t_jug), ("motor.simular", t_motor), ("simular_lote", t_lote)):
+        print(f"{nombre:>14}: {pasos / seg:>14,.0f} pasos/s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
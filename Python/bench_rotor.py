@@ -0,0 +1,58 @@
+# Benchmark: K caminantes de a uno con Jugador.mover vs. rotor.soltar.
+#
+# Uso:  python bench_rotor.py [K] [tamaño]      (por defecto 5000 caminantes en 30x30)
+#
+# Verifica que las salidas por borde y las flechas finales sean idénticas y
+# después mide rotor.soltar solo, con una cantidad de caminantes 1000 veces mayor.
+
+import random
+import sys
+import time
+
+from logica import Tablero, Jugador
+from rotor import soltar
+
+def secuencial(tablero, pos, cantidad):
+    salidas = {}
+    for _ in range(cantidad):
+        j = Jugador("caminante")
+        j.posicion = pos
+        while True:
+            d = tablero.direccion(j.posicion)
+            sigue, pos_rotada = j.mover(tablero)
+            if not sigue:
+                salidas[(pos_rotada, d)] = salidas.get((pos_rotada, d), 0) + 1
+                break
+    return salidas
+
+def main(argv):
+    k = int(argv[0]) if argv else 5000
+    n = int(argv[1]) if len(argv) > 1 else 30
+    rnd = random.Random(0)
+    original = Tablero(n, n, [rnd.randrange(4) for _ in range(n * n)])
+    centro = (n // 2, n // 2)
+
+    a = original.copiar()
+    t0 = time.perf_counter()
+    esperado = secuencial(a, centro, k)
+    t_sec = time.perf_counter() - t0
+
+    b = original.copiar()
+    t0 = time.perf_counter()
+    res = soltar(b, centro, k)
+    t_rotor = time.perf_counter() - t0
+
+    assert res.salidas == esperado
+    assert a.direcciones == b.direcciones
+    print(f"{k} caminantes en {n}x{n}: {res.pasos} pasos, resultados idénticos")
+    print(f"  Jugador.mover: {t_sec:8.3f} s")
+    print(f"  rotor.soltar : {t_rotor:8.3f} s  ({t_sec / t_rotor:,.0f}x)")
+
+    grande = k * 1000
+    c = original.copiar()
+    t0 = time.perf_counter()
+    res = soltar(c, centro, grande)
+    print(f"{grande} caminantes con rotor.soltar: {time.perf_counter() - t0:.3f} s  {res}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+# Benchmark: sorteo del tablero casilla por casilla vs. en bloque desde una semilla.
+#
+# Uso:  python bench_semilla.py [tamaño ...]      (por defecto 1000 10000)
+#
+# Para cada tamaño N×N mide:
+#   - randint:     una llamada a random.randint(0, 3) por casilla (el sorteo
+#                  anterior; solo hasta LIMITE_RANDINT casillas, tarda minutos
+#                  en 10000x10000)
+#   - desde_semilla: Tablero.desde_semilla (getrandbits + bytes.translate)
+#   - numpy:       Generator.integers de NumPy con la misma cantidad de casillas,
+#                  como referencia (solo si NumPy está instalado)
+# y verifica que la misma semilla reproduzca el mismo tablero.
+
+import random
+import sys
+import time
+
+from logica import Tablero
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LIMITE_RANDINT = 4_000_000
+
+def medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+def main(argv):
+    tamanios = [int(a) for a in argv] or [1000, 10000]
+    print(f"{'tamaño':>12} {'randint s':>10} {'desde_semilla s':>16} {'numpy s':>9}")
+    for n in tamanios:
+        celdas = n * n
+        if celdas <= LIMITE_RANDINT:
+            t_randint, _ = medir(lambda: bytearray(random.randint(0, 3) for _ in range(celdas)))
+            t_randint = f"{t_randint:10.3f}"
+        else:
+            t_randint = f"{'-':>10}"
+        t_semilla, tablero = medir(lambda: Tablero.desde_semilla(n, n, 2024))
+        assert tablero.direcciones == Tablero.desde_semilla(n, n, 2024).direcciones
+        del tablero
+        if np is not None:
+            t_numpy, _ = medir(lambda: np.random.default_rng(2024).integers(0, 4, celdas, dtype=np.uint8))
+            t_numpy = f"{t_numpy:9.3f}"
+        else:
+            t_numpy = f"{'-':>9}"
+        print(f"{n:>6}x{n:<5} {t_randint} {t_semilla:16.3f} {t_numpy}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
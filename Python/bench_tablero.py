@@ -0,0 +1,79 @@
+# Benchmark: tablero compacto (bytearray) vs. la grilla original de objetos Casilla.
+#
+# Uso:  python bench_tablero.py [tamaño ...]      (por defecto 100 500 1000)
+#
+# Para cada tamaño N×N mide:
+#   - memoria por casilla al construir el tablero (tracemalloc)
+#   - pasos por segundo de un caminante que recorre el tablero con mover_desde
+#     (cuando sale, vuelve a entrar por una casilla al azar)
+
+import random
+import sys
+import time
+import tracemalloc
+
+from logica import Tablero
+
+class CasillaOriginal:
+    """La Casilla de antes del tablero compacto: sin __slots__, con un __dict__ por casilla."""
+    def __init__(self):
+        self.direccion = random.randint(0, 3)
+
+    def rotar(self):
+        self.direccion = (self.direccion + 1) % 4
+
+class TableroObjetos:
+    """Implementación original: una lista de listas de Casilla."""
+    DELTAS = Tablero.DELTAS
+
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self.casillas = [[CasillaOriginal() for _ in range(columnas)] for _ in range(filas)]
+
+    def mover_desde(self, pos):
+        i, j = pos
+        casilla = self.casillas[i][j]
+        di, dj = TableroObjetos.DELTAS[casilla.direccion]
+        casilla.rotar()
+        nueva = (i + di, j + dj)
+        if not self.dentro_de_limites(nueva):
+            return None, (i, j)
+        return nueva, (i, j)
+
+    def dentro_de_limites(self, pos):
+        i, j = pos
+        return 0 <= i < self.filas and 0 <= j < self.columnas
+
+def medir_memoria(clase, n):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    tablero = clase(n, n)
+    usada = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return tablero, usada / (n * n)
+
+def medir_pasos(tablero, pasos, semilla=0):
+    rnd = random.Random(semilla)
+    n_f, n_c = tablero.filas, tablero.columnas
+    pos = (rnd.randrange(n_f), rnd.randrange(n_c))
+    mover = tablero.mover_desde
+    t0 = time.perf_counter()
+    for _ in range(pasos):
+        nueva, _ = mover(pos)
+        pos = nueva if nueva is not None else (rnd.randrange(n_f), rnd.randrange(n_c))
+    return pasos / (time.perf_counter() - t0)
+
+def main(argv):
+    tamanios = [int(a) for a in argv] or [100, 500, 1000]
+    pasos = 200_000
+    print(f"{'tamaño':>10} {'backend':>9} {'bytes/casilla':>14} {'pasos/s':>12}")
+    for n in tamanios:
+        for nombre, clase in (("objetos", TableroObjetos), ("compacto", Tablero)):
+            tablero, bytes_casilla = medir_memoria(clase, n)
+            vel = medir_pasos(tablero, pasos)
+            print(f"{n:>5}x{n:<4} {nombre:>9} {bytes_casilla:>14.1f} {vel:>12,.0f}")
+            del tablero
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,454 @@
+# Tablero en memoria compartida: un proceso simula y otros lo miran sin copiarlo.
+#
+# Un bloque de multiprocessing.shared_memory guarda la grilla de direcciones
+# (un byte por casilla, como Tablero.direcciones), la posición de cada jugador
+# y un bitset de casillas pisadas por jugador. Lo escribe un único proceso
+# (Simulador) y lo leen cualquier cantidad de procesos (VisorCompartido en la
+# GUI, un proceso de estadísticas), cada uno a su ritmo.
+#
+# Las lecturas se validan con un seqlock: el escritor incrementa la secuencia
+# (impar = escribiendo), copia los cambios y la vuelve a incrementar (par). Un
+# lector lee la secuencia, lee lo que necesita directamente de la memoria
+# compartida y vuelve a leer la secuencia: si era impar o cambió, repite. El
+# escritor nunca espera a los lectores. Para que las ventanas de escritura
+# sean cortas, el Simulador juega sobre su propio Tablero y cada PERIODO
+# segundos publica solo las casillas que cambiaron desde la vez anterior.
+#
+# Los lectores no toman locks y Python no ofrece barreras de memoria: que
+# una lectura validada por la secuencia sea de una sola publicación depende
+# de que las escrituras se vean en el orden en que se hicieron, como en x86.
+# En procesadores con un modelo de memoria más débil (ARM) un lector podría,
+# muy de vez en cuando, aceptar una lectura mezclada de dos publicaciones. Los
+# lectores de este módulo la toleran (un cuadro o un conteo con una casilla
+# de más o de menos); quien necesite una garantía estricta tiene que usar un
+# lock entre procesos.
+#
+# Estructura del bloque (little-endian):
+#   cabecera (64 bytes): b"RSHM", versión (B), filas (I), columnas (I),
+#       jugadores (I); en el byte 24: secuencia (q), turno (q), ganador (q, -1)
+#   posiciones: jugadores x q (índice plano, -1 si el jugador salió)
+#   grilla:     filas*columnas bytes
+#   visitadas:  un bitset de ceil(filas*columnas / 8) bytes por jugador
+#
+# Uso:  python compartido.py simular --tamanio 5000 --jugadores 2
+#       python compartido.py estadisticas NOMBRE
+#       python compartido.py prueba --tamanio 5000 --lectores 2
+
+import argparse
+import multiprocessing
+import random
+import struct
+import sys
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from logica import Tablero
+from motor import PartidaMultiple
+
+MAGIA = b"RSHM"
+VERSION = 1
+_CABECERA = struct.Struct("<4sB3xIII")
+TAM_CABECERA = 64
+_CONTADORES = 24  # secuencia, turno y ganador: 3 x q desde este byte
+PERIODO = 1 / 30  # segundos entre publicaciones del Simulador
+RONDAS_POR_CONSULTA = 64  # rondas entre consultas al reloj en Simulador.correr
+
+def _alinear(n):
+    return (n + 7) & ~7
+
+_CREADOS = set()  # nombres de los bloques creados por este proceso
+
+def _abrir_memoria(nombre):
+    """Se adjunta a un bloque existente sin que este proceso lo borre al salir."""
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # antes de Python 3.13 el resource_tracker borra al salir todo bloque
+        # abierto por el proceso, aunque lo haya creado otro. Los procesos
+        # hijos de multiprocessing comparten el tracker del padre, y el dueño
+        # puede abrir su propio bloque: ahí no hay que sacar el registro, que
+        # es el del dueño.
+        from multiprocessing import resource_tracker
+        memoria = shared_memory.SharedMemory(name=nombre)
+        if multiprocessing.parent_process() is None and memoria._name not in _CREADOS:
+            resource_tracker.unregister(memoria._name, "shared_memory")
+        return memoria
+
+class TableroCompartido:
+    """
+    Vistas (memoryview) sobre el bloque compartido. Crear con crear() (el
+    dueño, que lo borra al cerrar) o abrir(nombre) desde otro proceso.
+    Los lectores usan leer() o los métodos que se apoyan en él.
+    """
+    def __init__(self, memoria, duenio):
+        self.memoria = memoria
+        self.duenio = duenio
+        self.nombre = memoria.name
+        buf = memoria.buf
+        magia, version, self.filas, self.columnas, self.jugadores = _CABECERA.unpack_from(buf)
+        if magia != MAGIA:
+            raise ValueError("El bloque no es un tablero compartido del Sistema Repulsor.")
+        if version != VERSION:
+            raise ValueError(f"Versión de tablero compartido no soportada: {version}.")
+        celdas = self.filas * self.columnas
+        self.bytes_bitset = _alinear((celdas + 7) // 8)
+        inicio = TAM_CABECERA
+        self._contadores = buf[_CONTADORES:_CONTADORES + 24].cast("q")
+        self.posiciones = buf[inicio:inicio + 8 * self.jugadores].cast("q")
+        inicio += 8 * self.jugadores
+        self.grilla = buf[inicio:inicio + celdas]
+        inicio += _alinear(celdas)
+        self.visitadas = []
+        for _ in range(self.jugadores):
+            self.visitadas.append(buf[inicio:inicio + self.bytes_bitset])
+            inicio += self.bytes_bitset
+
+    @staticmethod
+    def tamanio_para(filas, columnas, jugadores):
+        celdas = filas * columnas
+        return TAM_CABECERA + 8 * jugadores + _alinear(celdas) + jugadores * _alinear((celdas + 7) // 8)
+
+    @classmethod
+    def crear(cls, filas, columnas, jugadores, nombre=None):
+        memoria = shared_memory.SharedMemory(name=nombre, create=True,
+                                             size=cls.tamanio_para(filas, columnas, jugadores))
+        _CREADOS.add(memoria._name)
+        _CABECERA.pack_into(memoria.buf, 0, MAGIA, VERSION, filas, columnas, jugadores)
+        struct.pack_into("<qqq", memoria.buf, _CONTADORES, 0, 0, -1)
+        return cls(memoria, duenio=True)
+
+    @classmethod
+    def abrir(cls, nombre):
+        memoria = _abrir_memoria(nombre)
+        try:
+            return cls(memoria, duenio=False)
+        except Exception:
+            memoria.close()
+            raise
+
+    @property
+    def version(self):
+        """Secuencia del seqlock: cambia con cada publicación (impar mientras se escribe)."""
+        return self._contadores[0]
+
+    # -------- lectura --------
+    def leer(self, funcion, intentos=None):
+        """
+        Llama a funcion(self) hasta que la secuencia sea la misma (y par) antes
+        y después, es decir, sin publicaciones detectadas en el medio (con el
+        límite de la nota sobre el orden de memoria del principio del
+        módulo), y devuelve su resultado. funcion puede leer las vistas sin
+        copiarlas, pero solo debe devolver datos ya copiados (bytes, enteros).
+        Con `intentos` se rinde después de esa cantidad y da RuntimeError.
+        """
+        contadores = self._contadores
+        n = 0
+        while True:
+            antes = contadores[0]
+            if not antes & 1:
+                resultado = funcion(self)
+                if contadores[0] == antes:
+                    return resultado
+            n += 1
+            if intentos is not None and n >= intentos:
+                raise RuntimeError("No se pudo leer sin que el escritor publicara en el medio.")
+            time.sleep(0)  # ceder el procesador al escritor
+
+    def estado(self):
+        """(turno, ganador o None, posiciones) leídos con leer(); posición None si el jugador salió."""
+        def tomar(c):
+            return c._contadores[1], c._contadores[2], c.posiciones.tolist()
+        turno, ganador, planas = self.leer(tomar)
+        columnas = self.columnas
+        return (turno, None if ganador < 0 else ganador,
+                [None if k < 0 else divmod(k, columnas) for k in planas])
+
+    def region(self, i0, i1, j0, j1, jugadores=()):
+        """
+        Copia, tomada con leer(), de las filas [i0, i1) y columnas [j0, j1),
+        con los bitsets de visitadas de los `jugadores` pedidos (ver Region).
+        """
+        columnas = self.columnas
+        k0 = i0 * columnas + j0
+        k1 = max(k0, (i1 - 1) * columnas + j1)
+        jugadores = list(jugadores)
+
+        def tomar(c):
+            filas = [c.grilla[i * columnas + j0:i * columnas + j1].tobytes() for i in range(i0, i1)]
+            bits = [c.visitadas[j][k0 >> 3:(k1 >> 3) + 1].tobytes() for j in jugadores]
+            return c._contadores[1], c._contadores[2], c.posiciones.tolist(), filas, bits
+        turno, ganador, planas, filas, bits = self.leer(tomar)
+        return Region(columnas, i0, j0, turno, None if ganador < 0 else ganador,
+                      [None if k < 0 else divmod(k, columnas) for k in planas],
+                      filas, dict(zip(jugadores, bits)), k0 & ~7)
+
+    def cobertura(self):
+        """(casillas pisadas por cada jugador, casillas pisadas por alguno), copiadas con leer()."""
+        # dentro del seqlock solo se copian los bitsets (memcpy): contar los
+        # bits ahí alargaría la lectura y chocaría más con las publicaciones
+        copias = self.leer(lambda c: [bitset.tobytes() for bitset in c.visitadas])
+        union = 0
+        por_jugador = []
+        for datos in copias:
+            valor = int.from_bytes(datos, "little")
+            por_jugador.append(valor.bit_count())
+            union |= valor
+        return por_jugador, union.bit_count()
+
+    def cerrar(self):
+        """Suelta las vistas y el bloque; el dueño además lo borra."""
+        if self.memoria is None:
+            return
+        for vista in [self._contadores, self.posiciones, self.grilla] + self.visitadas:
+            vista.release()
+        self.memoria.close()
+        if self.duenio:
+            self.memoria.unlink()
+            _CREADOS.discard(self.memoria._name)
+        self.memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+class Region:
+    """Copia de una parte del tablero compartido tomada con TableroCompartido.region()."""
+    __slots__ = ('columnas', 'i0', 'j0', 'turno', 'ganador', 'posiciones', 'filas', 'bits', 'bit0')
+
+    def __init__(self, columnas, i0, j0, turno, ganador, posiciones, filas, bits, bit0):
+        self.columnas = columnas
+        self.i0 = i0
+        self.j0 = j0
+        self.turno = turno
+        self.ganador = ganador
+        self.posiciones = posiciones
+        self.filas = filas  # bytes por fila, desde la columna j0
+        self.bits = bits    # jugador -> bitset de la región, a partir del índice plano bit0
+        self.bit0 = bit0
+
+    def contiene(self, pos):
+        i, j = pos
+        return (self.i0 <= i < self.i0 + len(self.filas)
+                and self.j0 <= j < self.j0 + len(self.filas[0] if self.filas else b""))
+
+    def direccion(self, pos):
+        return self.filas[pos[0] - self.i0][pos[1] - self.j0]
+
+    def visitada(self, jugador, pos):
+        bits = self.bits.get(jugador)
+        if bits is None:
+            return False
+        b = pos[0] * self.columnas + pos[1] - self.bit0
+        return bool(bits[b >> 3] >> (b & 7) & 1)
+
+# -------------------------------
+# Escritor
+# -------------------------------
+class Simulador:
+    """
+    Juega una PartidaMultiple sobre su propio tablero y la publica en un
+    TableroCompartido (lo crea si no se pasa uno). Entre publicaciones anota,
+    por ronda, qué jugadores movieron y desde qué casilla: al publicar copia
+    solo esas casillas, así que el costo no depende del tamaño del tablero.
+    """
+    def __init__(self, tablero, posiciones, compartido=None, periodo=PERIODO):
+        self.tablero = tablero
+        self.partida = PartidaMultiple(tablero, posiciones)
+        self.compartido = compartido or TableroCompartido.crear(tablero.filas, tablero.columnas, len(posiciones))
+        self.periodo = periodo
+        self.publicaciones = 0
+        self._movidos = array('q')
+        self._rotadas = array('q')
+        c = self.compartido
+        contadores = c._contadores
+        contadores[0] += 1
+        c.grilla[:] = tablero.direcciones
+        for bitset in c.visitadas:
+            bitset[:] = bytes(len(bitset))
+        contadores[0] += 1
+        self.publicar()
+
+    def publicar(self):
+        partida = self.partida
+        c = self.compartido
+        datos = self.tablero.direcciones
+        grilla = c.grilla
+        visitadas = c.visitadas
+        contadores = c._contadores
+        contadores[0] += 1
+        for jug, k in zip(self._movidos, self._rotadas):
+            grilla[k] = datos[k]
+            bitset = visitadas[jug]
+            bitset[k >> 3] |= 1 << (k & 7)
+        for jug, k in enumerate(partida.posiciones):
+            c.posiciones[jug] = k
+            if k >= 0:
+                bitset = visitadas[jug]
+                bitset[k >> 3] |= 1 << (k & 7)
+        contadores[1] = partida.turnos
+        ganador = partida.ganador
+        contadores[2] = -1 if ganador is None else ganador
+        contadores[0] += 1
+        del self._movidos[:]
+        del self._rotadas[:]
+        self.publicaciones += 1
+
+    def correr(self, max_turnos=None, hasta=None):
+        """
+        Juega rondas hasta que la partida termina, se pasan max_turnos o el
+        reloj (time.monotonic) llega a `hasta`, publicando cada `periodo`
+        segundos y al final. Devuelve el ganador o None.
+        """
+        partida = self.partida
+        posiciones = partida.posiciones
+        obtener = posiciones.__getitem__
+        movidos = self._movidos
+        rotadas = self._rotadas
+        proxima = time.monotonic() + self.periodo
+        while not partida.terminada:
+            if max_turnos is not None and partida.turnos >= max_turnos:
+                break
+            # el reloj se mira cada RONDAS_POR_CONSULTA rondas
+            for _ in range(RONDAS_POR_CONSULTA):
+                if partida.terminada or (max_turnos is not None and partida.turnos >= max_turnos):
+                    break
+                quienes = partida.vivos[partida.siguiente:]
+                movidos.extend(quienes)
+                rotadas.extend(map(obtener, quienes))
+                partida.ronda()
+            ahora = time.monotonic()
+            if hasta is not None and ahora >= hasta:
+                break
+            if ahora >= proxima:
+                self.publicar()
+                proxima = ahora + self.periodo
+        self.publicar()
+        return partida.ganador
+
+# -------------------------------
+# Procesos de ejemplo
+# -------------------------------
+def estadisticas(nombre, cada=1.0, hasta=None, mostrar=print):
+    """Lector: muestra la cobertura del tablero compartido `nombre` cada `cada` segundos."""
+    with TableroCompartido.abrir(nombre) as c:
+        celdas = c.filas * c.columnas
+        version = None
+        while hasta is None or time.monotonic() < hasta:
+            if c.version != version:
+                version = c.version
+                turno, ganador, _ = c.estado()
+                por_jugador, total = c.cobertura()
+                detalle = "  ".join(f"j{j + 1}: {n}" for j, n in enumerate(por_jugador[:8]))
+                mostrar(f"turno {turno}: {total} casillas pisadas ({total / celdas:.4%})  {detalle}")
+                if ganador is not None:
+                    mostrar(f"Terminó: ganó el jugador {ganador + 1}.")
+                    return
+            time.sleep(cada)
+
+def _lector_de_prueba(nombre, hz, segundos, cola):
+    """Simula un visor: a `hz` lecturas por segundo toma una región, y la cobertura cada segundo."""
+    lecturas = 0
+    with TableroCompartido.abrir(nombre) as c:
+        ahora = time.monotonic()
+        fin = ahora + segundos
+        proxima_cobertura = ahora
+        while ahora < fin:
+            _, _, posiciones = c.estado()
+            i, j = next((p for p in posiciones if p is not None), (0, 0))
+            c.region(max(0, i - 20), min(c.filas, i + 20), max(0, j - 40), min(c.columnas, j + 40),
+                     range(min(2, c.jugadores)))
+            if ahora >= proxima_cobertura:
+                c.cobertura()
+                proxima_cobertura = ahora + 1
+            lecturas += 1
+            time.sleep(1 / hz)
+            ahora = time.monotonic()
+    cola.put(lecturas)
+
+def prueba(tamanio, jugadores, lectores, segundos, hz, mostrar=print):
+    """Turnos por segundo del escritor solo y con `lectores` procesos leyendo."""
+    rnd = random.Random(0)
+    inicios = [(rnd.randrange(tamanio), rnd.randrange(tamanio)) for _ in range(jugadores)]
+    original = Tablero.desde_semilla(tamanio, tamanio, 0)
+    resultados = []
+    for cantidad in (0, lectores):
+        sim = Simulador(original.copiar(), inicios)
+        try:
+            cola = multiprocessing.Queue()
+            procesos = [multiprocessing.Process(target=_lector_de_prueba,
+                                                args=(sim.compartido.nombre, hz, segundos, cola))
+                        for _ in range(cantidad)]
+            for p in procesos:
+                p.start()
+            t0 = time.perf_counter()
+            sim.correr(hasta=time.monotonic() + segundos)
+            seg = time.perf_counter() - t0
+            lecturas = [cola.get() for _ in procesos]
+            for p in procesos:
+                p.join()
+        finally:
+            sim.compartido.cerrar()
+        turnos = sim.partida.turnos
+        resultados.append(turnos / seg)
+        mostrar(f"{cantidad} lectores: {turnos / seg:,.0f} turnos/s, {sim.publicaciones} publicaciones"
+                + (f", lecturas por lector: {lecturas}" if lecturas else ""))
+    return resultados
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tablero compartido del Sistema Dinámico Repulsor.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sim = sub.add_parser("simular", help="simular una partida y publicarla en memoria compartida")
+    sim.add_argument("--tamanio", type=int, default=1000)
+    sim.add_argument("--jugadores", type=int, default=2)
+    sim.add_argument("--semilla", type=int, default=0)
+    sim.add_argument("--nombre", help="nombre del bloque (por defecto, uno al azar)")
+    sim.add_argument("--max-turnos", type=int, default=None)
+    sim.add_argument("--esperar", action="store_true", help="al terminar, mantener el bloque hasta Ctrl+C")
+    est = sub.add_parser("estadisticas", help="mostrar la cobertura de un tablero compartido")
+    est.add_argument("nombre")
+    est.add_argument("--cada", type=float, default=1.0)
+    pru = sub.add_parser("prueba", help="medir al escritor con y sin lectores")
+    pru.add_argument("--tamanio", type=int, default=5000)
+    pru.add_argument("--jugadores", type=int, default=2)
+    pru.add_argument("--lectores", type=int, default=2)
+    pru.add_argument("--segundos", type=float, default=3.0)
+    pru.add_argument("--hz", type=float, default=30.0, help="lecturas por segundo de cada lector")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "simular":
+            n = args.tamanio
+            rnd = random.Random(args.semilla)
+            inicios = [(rnd.randrange(n), rnd.randrange(n)) for _ in range(args.jugadores)]
+            compartido = TableroCompartido.crear(n, n, args.jugadores, args.nombre)
+            print(f"Tablero compartido: {compartido.nombre}", flush=True)
+            try:
+                sim = Simulador(Tablero.desde_semilla(n, n, args.semilla), inicios, compartido)
+                ganador = sim.correr(args.max_turnos)
+                fin = f"ganó el jugador {ganador + 1}" if ganador is not None else "sin terminar"
+                print(f"{sim.partida.turnos} turnos: {fin}")
+                if args.esperar:
+                    print("Ctrl+C para liberar el tablero.")
+                    while True:
+                        time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                compartido.cerrar()
+        elif args.comando == "estadisticas":
+            try:
+                estadisticas(args.nombre, args.cada)
+            except KeyboardInterrupt:
+                pass
+        else:
+            prueba(args.tamanio, args.jugadores, args.lectores, args.segundos, args.hz)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+# Dibujo rápido del tablero en la terminal.
+#
+# Cada cuadro se arma en un único buffer y se escribe con una sola llamada.
+# Las filas salen del bytearray del tablero con bytes.translate (sin recorrer
+# las casillas en Python) y los jugadores se superponen después, solo en sus
+# filas. En modo "ansi" (terminal real) la primera vez se dibuja todo y
+# después solo se reescriben, con movimientos del cursor, las casillas que
+# cambiaron; en modo "texto" (salida redirigida) se imprime el cuadro entero
+# como hacía Tablero.imprimir. Si el tablero no entra en la terminal se
+# muestra una ventana que sigue a los jugadores.
+
+import os
+import shutil
+import sys
+
+from logica import Casilla
+
+_SIMBOLOS = bytes.maketrans(bytes(range(4)), "".join(Casilla.SIMBOLOS).encode())
+LINEAS_LIBRES = 3  # debajo del tablero: línea de estado, la del input() y una de margen
+
+def fila_texto(tablero, i, j0=0, j1=None):
+    """Símbolos de la fila i entre las columnas [j0, j1), separados por espacios (sin jugadores)."""
+    if j1 is None:
+        j1 = tablero.columnas
+    if j1 <= j0:
+        return bytearray()
+    base = i * tablero.columnas
+    linea = bytearray(b" ") * (2 * (j1 - j0) - 1)
+    linea[0::2] = tablero.direcciones[base + j0:base + j1].translate(_SIMBOLOS)
+    return linea
+
+JUGADORES = "123456789ABCDEFGHIJKLMNOPQRSTUVWYZ"  # sin la X, que marca casillas compartidas
+
+def ocupadas(posiciones):
+    """
+    {pos: símbolo} de las casillas con jugadores (las posiciones None son de
+    jugadores que ya salieron): el número del jugador, o 'X' si hay varios.
+    """
+    marcas = {}
+    for n, pos in enumerate(posiciones):
+        if pos is not None:
+            marcas[pos] = "X" if pos in marcas else (JUGADORES[n] if n < len(JUGADORES) else "@")
+    return marcas
+
+def texto_tablero(tablero, posiciones=(), i0=0, i1=None, j0=0, j1=None):
+    """Filas [i0, i1) y columnas [j0, j1) del tablero como un único str, con los jugadores."""
+    if i1 is None:
+        i1 = tablero.filas
+    if j1 is None:
+        j1 = tablero.columnas
+    por_fila = {}
+    for (i, j), simbolo in ocupadas(posiciones).items():
+        if i0 <= i < i1 and j0 <= j < j1:
+            por_fila.setdefault(i, []).append((j, simbolo))
+    lineas = []
+    for i in range(i0, i1):
+        linea = fila_texto(tablero, i, j0, j1)
+        for j, simbolo in por_fila.get(i, ()):
+            linea[2 * (j - j0)] = ord(simbolo)
+        lineas.append(linea)
+    return b"\n".join(lineas).decode("ascii")
+
+class RenderizadorConsola:
+    """
+    Dibuja el tablero en `salida` (sys.stdout por defecto).
+
+    modo: "ansi" (diferencial) o "texto"; por defecto "ansi" si la salida es
+    una terminal. alto/ancho: tamaño de la terminal (por defecto, el real).
+    Entre dos dibujar() cambian las casillas de las que salieron los jugadores
+    y a las que llegaron, que se detectan solas; si un jugador mueve más de
+    una vez por cuadro, hay que avisar las casillas rotadas con marcar().
+    """
+    def __init__(self, tablero, salida=None, modo=None, alto=None, ancho=None):
+        self.tablero = tablero
+        self.salida = salida or sys.stdout
+        if modo is None:
+            terminal = getattr(self.salida, "isatty", lambda: False)()
+            modo = "ansi" if terminal and os.environ.get("TERM") != "dumb" else "texto"
+        self.modo = modo
+        tam = shutil.get_terminal_size()
+        self.vista_filas = max(1, min(tablero.filas, (alto or tam.lines) - LINEAS_LIBRES))
+        self.vista_cols = max(1, min(tablero.columnas, ((ancho or tam.columns) + 1) // 2))
+        self.i0 = 0
+        self.j0 = 0
+        self.mostrado = None  # posiciones de los jugadores en el último cuadro ansi
+        self.sucias = set()
+
+    def marcar(self, pos):
+        self.sucias.add(pos)
+
+    def _en_vista(self, pos):
+        return (self.i0 <= pos[0] < self.i0 + self.vista_filas
+                and self.j0 <= pos[1] < self.j0 + self.vista_cols)
+
+    def _seguir(self, posiciones, foco):
+        """Mueve la vista si algún jugador quedó afuera. Devuelve True si se movió."""
+        vivas = [p for p in posiciones if p is not None]
+        if not vivas:
+            return False
+        fi = [p[0] for p in vivas]
+        fj = [p[1] for p in vivas]
+        a, b = (min(fi), min(fj)), (max(fi), max(fj))
+        if b[0] - a[0] < self.vista_filas and b[1] - a[1] < self.vista_cols:
+            # entran todos: centrar entre ellos
+            if self._en_vista(a) and self._en_vista(b):
+                return False
+        elif foco is not None:
+            if self._en_vista(foco):
+                return False  # no entran juntos y el foco ya se ve
+            a = b = foco
+        else:
+            fuera = [p for p in vivas if not self._en_vista(p)]
+            if not fuera:
+                return False
+            a = b = fuera[0]
+        self.i0 = self._origen(a[0], b[0], self.vista_filas, self.tablero.filas)
+        self.j0 = self._origen(a[1], b[1], self.vista_cols, self.tablero.columnas)
+        return True
+
+    @staticmethod
+    def _origen(a, b, vista, total):
+        """Primera fila (o columna) de una vista de largo `vista` centrada en [a, b]."""
+        lo, hi = min(a, b), max(a, b)
+        return max(0, min(total - vista, lo - (vista - 1 - (hi - lo)) // 2))
+
+    def _cuadro(self, posiciones):
+        return texto_tablero(self.tablero, posiciones, self.i0, self.i0 + self.vista_filas,
+                             self.j0, self.j0 + self.vista_cols)
+
+    def dibujar(self, posiciones, estado="", foco=None):
+        """
+        Dibuja el tablero con los jugadores (lista de posiciones, None si el
+        jugador ya salió) y una línea de estado debajo.
+        foco: posición a seguir si no entran todos en la vista.
+        """
+        movida = self._seguir(posiciones, foco)
+        if self.modo == "texto":
+            partes = [self._cuadro(posiciones), "\n\n"]
+            if estado:
+                partes.append(estado + "\n")
+        elif movida or self.mostrado is None:
+            partes = ["\x1b[H\x1b[2J", self._cuadro(posiciones), "\n", estado, "\x1b[K\n\x1b[K"]
+        else:
+            partes = []
+            marcas = ocupadas(posiciones)
+            # las casillas rotadas son las que dejó algún jugador: su marca
+            # cambió o desapareció; las que siguen con la misma marca no se tocan
+            antes = ocupadas(self.mostrado)
+            cambiadas = self.sucias
+            cambiadas.update(pos for pos, simbolo in antes.items() if marcas.get(pos) != simbolo)
+            cambiadas.update(pos for pos, simbolo in marcas.items() if antes.get(pos) != simbolo)
+            tablero = self.tablero
+            for pos in cambiadas:
+                if not self._en_vista(pos):
+                    continue
+                simbolo = marcas.get(pos) or Casilla.SIMBOLOS[tablero.direccion(pos)]
+                partes.append(f"\x1b[{pos[0] - self.i0 + 1};{2 * (pos[1] - self.j0) + 1}H{simbolo}")
+            # línea de estado y la siguiente (donde escribe input()) limpias
+            partes.append(f"\x1b[{self.vista_filas + 1};1H{estado}\x1b[K\n\x1b[K")
+        if self.modo == "ansi":
+            self.mostrado = list(posiciones)
+        self.sucias = set()
+        self.salida.write("".join(partes))
+        self.salida.flush()
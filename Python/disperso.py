@@ -0,0 +1,143 @@
+# Tablero disperso: tableros de tamaño prácticamente ilimitado (p. ej. 10^6 x 10^6).
+#
+# Un caminante toca muy pocas casillas antes de salir, así que no hace falta
+# guardar la grilla completa. La dirección inicial de cada casilla sale de un
+# hash (splitmix64) de (semilla, índice) y solo se guardan, en un dict
+# {índice plano: dirección}, las casillas que ya se rotaron: la memoria es
+# proporcional a la cantidad de casillas distintas visitadas.
+#
+# TableroDisperso tiene la misma interfaz que usan Jugador, motor.Partida y
+# motor.resolver (mover_desde, deshacer_movimiento, direccion, hash, ...). No
+# tiene `direcciones` ni `casillas`: para motor.simular, lotes, rotor o la GUI
+# hay que convertirlo con materializar() (solo tiene sentido en tableros chicos).
+
+import random
+
+from logica import Tablero, clave_zobrist
+
+_MASCARA64 = (1 << 64) - 1
+
+def direccion_inicial(semilla, k):
+    """Dirección (0-3) de la casilla k antes de rotarla: bits altos de splitmix64(semilla, k)."""
+    z = (semilla * 0xD1B54A32D192ED03 + k * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASCARA64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA64
+    return (z ^ (z >> 31)) >> 62
+
+class TableroDisperso:
+    DELTAS = Tablero.DELTAS
+    hash = None  # Zobrist relativo al tablero inicial; None hasta llamar a activar_hash()
+
+    def __init__(self, filas, columnas, semilla=None):
+        """
+        Crea un tablero de filas x columnas sin reservar memoria por casilla.
+        Con la misma semilla se obtiene el mismo tablero (que no coincide con
+        el de Tablero.desde_semilla: el generador es otro).
+        """
+        self.filas = filas
+        self.columnas = columnas
+        self.semilla = semilla if semilla is not None else random.getrandbits(64)
+        self.rotadas = {}  # índice plano -> dirección actual (solo casillas ya rotadas)
+
+    def copiar(self):
+        copia = TableroDisperso(self.filas, self.columnas, self.semilla)
+        copia.rotadas = dict(self.rotadas)
+        copia.hash = self.hash
+        return copia
+
+    def activar_hash(self):
+        """
+        Hash Zobrist de las casillas que difieren del tablero inicial (O(rotadas)).
+        Dos estados iguales dan el mismo hash, igual que en Tablero.
+        """
+        h = 0
+        for k, d in self.rotadas.items():
+            h ^= clave_zobrist(k, d) ^ clave_zobrist(k, direccion_inicial(self.semilla, k))
+        self.hash = h
+        return h
+
+    def instantanea(self):
+        """Estado comparable de las flechas: solo las casillas que difieren del inicial."""
+        semilla = self.semilla
+        return {k: d for k, d in self.rotadas.items() if d != direccion_inicial(semilla, k)}
+
+    def direccion(self, pos):
+        i, j = pos
+        k = i * self.columnas + j
+        d = self.rotadas.get(k)
+        return d if d is not None else direccion_inicial(self.semilla, k)
+
+    def mover_desde(self, pos):
+        """Igual que Tablero.mover_desde: rota pos y devuelve (nueva_pos o None, pos_rotada)."""
+        i, j = pos
+        k = i * self.columnas + j
+        d = self.rotadas.get(k)
+        if d is None:
+            d = direccion_inicial(self.semilla, k)
+        self.rotadas[k] = (d + 1) & 3
+        if self.hash is not None:
+            self.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, (d + 1) & 3)
+        di, dj = Tablero.DELTAS[d]
+        ni = i + di
+        nj = j + dj
+        if not (0 <= ni < self.filas and 0 <= nj < self.columnas):
+            return None, (i, j)
+        return (ni, nj), (i, j)
+
+    def deshacer_movimiento(self, pos):
+        """Deshace mover_desde(pos): gira la flecha de pos en sentido antihorario."""
+        i, j = pos
+        k = i * self.columnas + j
+        d = self.rotadas.get(k)
+        if d is None:
+            d = direccion_inicial(self.semilla, k)
+        self.rotadas[k] = (d - 1) & 3
+        if self.hash is not None:
+            self.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, (d - 1) & 3)
+
+    def dentro_de_limites(self, pos):
+        i, j = pos
+        return 0 <= i < self.filas and 0 <= j < self.columnas
+
+    def materializar(self):
+        """Devuelve un Tablero denso con las mismas flechas (reserva filas*columnas bytes)."""
+        semilla = self.semilla
+        tablero = Tablero(self.filas, self.columnas,
+                          bytes(direccion_inicial(semilla, k) for k in range(self.filas * self.columnas)))
+        for k, d in self.rotadas.items():
+            tablero.direcciones[k] = d
+        if self.hash is not None:
+            tablero.activar_hash()
+        return tablero
+
+def caminar(tablero, pos, max_pasos=None):
+    """
+    Mueve un caminante desde pos hasta que sale del tablero o da max_pasos
+    pasos. Devuelve (casilla_de_salida, pasos); la casilla es None si no salió.
+    Es el bucle de mover_desde sin llamadas a métodos, para caminatas largas.
+    """
+    rotadas = tablero.rotadas
+    semilla = tablero.semilla
+    filas, columnas = tablero.filas, tablero.columnas
+    dfila = [d[0] for d in Tablero.DELTAS]
+    dcol = [d[1] for d in Tablero.DELTAS]
+    con_hash = tablero.hash is not None
+    i, j = pos
+    limite = -1 if max_pasos is None else max_pasos
+    pasos = 0
+    while pasos != limite:
+        k = i * columnas + j
+        d = rotadas.get(k)
+        if d is None:
+            d = direccion_inicial(semilla, k)
+        nueva_d = (d + 1) & 3
+        rotadas[k] = nueva_d
+        if con_hash:
+            tablero.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, nueva_d)
+        pasos += 1
+        ni = i + dfila[d]
+        nj = j + dcol[d]
+        if ni < 0 or ni >= filas or nj < 0 or nj >= columnas:
+            return (i, j), pasos
+        i, j = ni, nj
+    return None, pasos
@@ -0,0 +1,349 @@
+# Instantáneas de tablero en disco, abiertas con mmap, y checkpoints para caminatas largas.
+#
+# Formato (little-endian):
+#   cabecera (64 bytes): b"RTAB", versión (B), filas (I), columnas (I),
+#       semilla (q, -1 si no hay), turno (Q), fila1, col1, fila2, col2 (4 x i,
+#       -1 si el jugador ya salió), pasos1, pasos2 (2 x Q) y relleno con ceros
+#   grilla: 4 casillas por byte, la casilla k en los bits 2(k%4)..2(k%4)+1 del
+#       byte k//4 (el orden de logica.desempaquetar)
+#
+# Es el mismo orden en que Tablero.desde_semilla saca las direcciones de
+# getrandbits, así que la instantánea inicial de una semilla se escribe sin
+# desempaquetar nada. Al abrir un archivo no se lee la grilla: se mapea con
+# mmap y TableroMapeado lee y rota las casillas directamente sobre el mapa, de
+# modo que abrir un tablero de 20000x20000 (100 MB) es instantáneo y solo se
+# traen de disco las páginas que se tocan.
+#
+# Un checkpoint es una instantánea nueva escrita en un archivo temporal y
+# renombrada sobre la anterior (os.replace): si el proceso muere a mitad de
+# camino queda el checkpoint previo entero. caminar() sigue una partida desde
+# su último checkpoint. El renombrado sobre un archivo mapeado es válido en
+# POSIX; en Windows el archivo abierto no se puede reemplazar.
+#
+# Uso:  python instantaneas.py crear --tamanio 20000 --semilla 1 --pos 0,0 --pos 9999,9999 partida.rtab
+#       python instantaneas.py caminar partida.rtab [--cada 60] [--max-turnos N]
+#       python instantaneas.py info partida.rtab
+
+import argparse
+import mmap
+import os
+import random
+import signal
+import struct
+import sys
+import time
+
+from logica import Tablero, desempaquetar, empaquetadas_al_azar, empaquetar
+
+MAGIA = b"RTAB"
+VERSION = 1
+_CABECERA = struct.Struct("<4sBIIqQ4iQQ")
+TAM_CABECERA = 64
+CADA = 60.0         # segundos entre checkpoints de caminar()
+CHEQUEO = 1 << 16   # turnos entre consultas al reloj
+
+def _cabecera(filas, columnas, semilla, turno, pos1, pos2, pasos1, pasos2):
+    f1, c1 = pos1 if pos1 is not None else (-1, -1)
+    f2, c2 = pos2 if pos2 is not None else (-1, -1)
+    return _CABECERA.pack(MAGIA, VERSION, filas, columnas, -1 if semilla is None else semilla,
+                          turno, f1, c1, f2, c2, pasos1, pasos2).ljust(TAM_CABECERA, b"\0")
+
+def _escribir_atomico(ruta, partes):
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        for parte in partes:
+            f.write(parte)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+
+def crear_desde_semilla(ruta, filas, columnas, semilla, pos1, pos2):
+    """Instantánea inicial de Tablero.desde_semilla(filas, columnas, semilla), sin armar el tablero."""
+    grilla = empaquetadas_al_azar(filas * columnas, random.Random(semilla))
+    _escribir_atomico(ruta, [_cabecera(filas, columnas, semilla, 0, pos1, pos2, 0, 0), grilla])
+
+def guardar(ruta, tablero, pos1, pos2, turno=0, pasos1=0, pasos2=0):
+    """
+    Escribe la instantánea de `tablero` (Tablero o TableroMapeado) con las
+    posiciones (None si el jugador salió) y los pasos de los jugadores.
+    Reemplaza `ruta` de forma atómica.
+    """
+    if isinstance(tablero, TableroMapeado):
+        grilla = tablero.grilla()  # vista del mapa, sin copiar
+    else:
+        grilla = empaquetar(tablero.direcciones)
+    _escribir_atomico(ruta, [_cabecera(tablero.filas, tablero.columnas, tablero.semilla,
+                                       turno, pos1, pos2, pasos1, pasos2), grilla])
+
+def guardar_jugadores(ruta, tablero, jugador1, jugador2, turno):
+    """guardar() tomando posición y pasos de dos Jugador."""
+    guardar(ruta, tablero, jugador1.posicion, jugador2.posicion, turno, jugador1.pasos, jugador2.pasos)
+
+# -------------------------------
+# Lectura con mmap
+# -------------------------------
+class TableroMapeado:
+    """
+    Tablero cuya grilla empaquetada vive en un mmap. Tiene la interfaz que usan
+    Jugador y motor.Partida (direccion, mover_desde, deshacer_movimiento,
+    dentro_de_limites); no tiene `direcciones` ni hash: para motor.simular, la
+    GUI o DetectorCiclos hay que convertirlo con materializar().
+    """
+    DELTAS = Tablero.DELTAS
+    hash = None
+
+    def __init__(self, mapa, filas, columnas, semilla=None, inicio=TAM_CABECERA):
+        self.mapa = mapa
+        self.filas = filas
+        self.columnas = columnas
+        self.semilla = semilla
+        self.inicio = inicio
+
+    def grilla(self):
+        return memoryview(self.mapa)[self.inicio:self.inicio + (self.filas * self.columnas + 3) // 4]
+
+    def instantanea(self):
+        return bytes(self.grilla())
+
+    def direccion(self, pos):
+        k = pos[0] * self.columnas + pos[1]
+        return (self.mapa[self.inicio + (k >> 2)] >> ((k & 3) << 1)) & 3
+
+    def _girar(self, pos, paso):
+        k = pos[0] * self.columnas + pos[1]
+        b = self.inicio + (k >> 2)
+        s = (k & 3) << 1
+        v = self.mapa[b]
+        d = (v >> s) & 3
+        self.mapa[b] = v ^ ((d ^ ((d + paso) & 3)) << s)
+        return d
+
+    def mover_desde(self, pos):
+        """Igual que Tablero.mover_desde: rota pos y devuelve (nueva_pos o None, pos_rotada)."""
+        di, dj = Tablero.DELTAS[self._girar(pos, 1)]
+        ni = pos[0] + di
+        nj = pos[1] + dj
+        if not (0 <= ni < self.filas and 0 <= nj < self.columnas):
+            return None, pos
+        return (ni, nj), pos
+
+    def deshacer_movimiento(self, pos):
+        self._girar(pos, -1)
+
+    def dentro_de_limites(self, pos):
+        i, j = pos
+        return 0 <= i < self.filas and 0 <= j < self.columnas
+
+    def materializar(self):
+        """Tablero denso con las mismas flechas (desempaqueta la grilla entera)."""
+        tablero = Tablero(self.filas, self.columnas,
+                          desempaquetar(self.mapa[self.inicio:self.inicio + (self.filas * self.columnas + 3) // 4],
+                                        self.filas * self.columnas))
+        tablero.semilla = self.semilla
+        return tablero
+
+class Instantanea:
+    """
+    Instantánea abierta con mmap. modo:
+      "copia"      (por defecto) se puede jugar sobre `tablero`, los cambios no llegan al archivo
+      "lectura"    solo lectura
+      "escritura"  los cambios van al archivo (sin la garantía de los checkpoints)
+    Atributos: filas, columnas, semilla, turno, pos1, pos2 (None si salió),
+    pasos1, pasos2 y tablero (TableroMapeado).
+    """
+    ACCESOS = {"copia": mmap.ACCESS_COPY, "lectura": mmap.ACCESS_READ, "escritura": mmap.ACCESS_WRITE}
+
+    def __init__(self, ruta, modo="copia"):
+        if modo not in self.ACCESOS:
+            raise ValueError(f"Modo desconocido: {modo}.")
+        self.archivo = open(ruta, "r+b" if modo == "escritura" else "rb")
+        try:
+            if os.fstat(self.archivo.fileno()).st_size < TAM_CABECERA:
+                raise ValueError("El archivo no es una instantánea del Sistema Repulsor.")
+            self.mapa = mmap.mmap(self.archivo.fileno(), 0, access=self.ACCESOS[modo])
+            self._leer_cabecera()
+        except Exception:
+            self.archivo.close()
+            raise
+        self.tablero = TableroMapeado(self.mapa, self.filas, self.columnas, self.semilla)
+
+    def _leer_cabecera(self):
+        (magia, version, self.filas, self.columnas, semilla, self.turno,
+         f1, c1, f2, c2, self.pasos1, self.pasos2) = _CABECERA.unpack_from(self.mapa)
+        if magia != MAGIA:
+            raise ValueError("El archivo no es una instantánea del Sistema Repulsor.")
+        if version != VERSION:
+            raise ValueError(f"Versión de instantánea no soportada: {version}.")
+        if len(self.mapa) < TAM_CABECERA + (self.filas * self.columnas + 3) // 4:
+            raise ValueError("La instantánea está incompleta.")
+        self.semilla = None if semilla == -1 else semilla
+        self.pos1 = None if f1 < 0 else (f1, c1)
+        self.pos2 = None if f2 < 0 else (f2, c2)
+
+    @property
+    def ganador(self):
+        """1 o 2 si el otro jugador ya salió del tablero, None si la partida sigue."""
+        if self.pos1 is None:
+            return 2
+        if self.pos2 is None:
+            return 1
+        return None
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self.mapa.close()
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+# -------------------------------
+# Caminata con checkpoints
+# -------------------------------
+def caminar(ruta, max_turnos=None, cada=CADA, progreso=None):
+    """
+    Sigue la partida guardada en `ruta` (el jugador 1 mueve en los turnos
+    pares) hasta que un jugador sale o se juegan max_turnos turnos más. Cada
+    `cada` segundos, al terminar y si se interrumpe con Ctrl+C, escribe un
+    checkpoint en `ruta`; `progreso(turno)` se llama después de cada uno.
+    Devuelve (ganador o None, turno).
+
+    Un Ctrl+C no corta el turno por la mitad (la flecha ya rotada y la
+    posición o el turno sin actualizar): mientras se camina, SIGINT solo
+    levanta una marca que se mira cada CHEQUEO turnos, entre un turno y otro,
+    y recién ahí se guarda el checkpoint y se lanza KeyboardInterrupt.
+    """
+    with Instantanea(ruta) as inst:
+        if inst.ganador is not None:
+            return inst.ganador, inst.turno
+        tablero = inst.tablero
+        mapa = inst.mapa
+        inicio = tablero.inicio
+        filas, columnas = tablero.filas, tablero.columnas
+        dfila = [d[0] for d in Tablero.DELTAS]
+        dcol = [d[1] for d in Tablero.DELTAS]
+        fila = [inst.pos1[0], inst.pos2[0]]
+        col = [inst.pos1[1], inst.pos2[1]]
+        pasos = [inst.pasos1, inst.pasos2]
+        turno = inst.turno
+        limite = -1 if max_turnos is None else turno + max_turnos
+        ganador = None
+
+        def checkpoint():
+            posiciones = [(fila[0], col[0]), (fila[1], col[1])]
+            if ganador is not None:
+                posiciones[2 - ganador] = None
+            guardar(ruta, tablero, posiciones[0], posiciones[1], turno, pasos[0], pasos[1])
+            if progreso is not None:
+                progreso(turno)
+
+        interrumpido = []
+
+        def al_interrumpir(signum, frame):
+            interrumpido.append(signum)
+
+        try:
+            anterior = signal.signal(signal.SIGINT, al_interrumpir)
+        except ValueError:
+            anterior = None  # fuera del hilo principal: no llega SIGINT
+
+        proximo = time.monotonic() + cada
+        try:
+            while turno != limite:
+                jug = turno & 1
+                i, j = fila[jug], col[jug]
+                k = i * columnas + j
+                b = inicio + (k >> 2)
+                s = (k & 3) << 1
+                v = mapa[b]
+                d = (v >> s) & 3
+                mapa[b] = v ^ ((d ^ ((d + 1) & 3)) << s)
+                turno += 1
+                i += dfila[d]
+                j += dcol[d]
+                if i < 0 or i >= filas or j < 0 or j >= columnas:
+                    ganador = 2 - jug
+                    break
+                fila[jug], col[jug] = i, j
+                pasos[jug] += 1
+                if not turno & (CHEQUEO - 1):
+                    if interrumpido:
+                        break
+                    if time.monotonic() >= proximo:
+                        checkpoint()
+                        proximo = time.monotonic() + cada
+        finally:
+            if anterior is not None:
+                signal.signal(signal.SIGINT, anterior)
+        checkpoint()
+        if interrumpido and ganador is None:
+            raise KeyboardInterrupt
+        return ganador, turno
+
+# -------------------------------
+# Línea de comandos
+# -------------------------------
+def _leer_pos(texto):
+    try:
+        f, c = (int(x) for x in texto.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"posición inválida '{texto}' (formato: fila,col)")
+    return f, c
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Instantáneas y caminatas largas del Sistema Dinámico Repulsor.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    crear = sub.add_parser("crear", help="instantánea inicial de un tablero por semilla")
+    crear.add_argument("--tamanio", type=int, required=True)
+    crear.add_argument("--semilla", type=int, default=0)
+    crear.add_argument("--pos", type=_leer_pos, action="append", required=True,
+                       help="posición inicial fila,col (una por jugador)")
+    crear.add_argument("archivo")
+    cam = sub.add_parser("caminar", help="seguir la partida desde su último checkpoint")
+    cam.add_argument("--cada", type=float, default=CADA, help="segundos entre checkpoints")
+    cam.add_argument("--max-turnos", type=int, default=None)
+    cam.add_argument("archivo")
+    info = sub.add_parser("info", help="mostrar la cabecera")
+    info.add_argument("archivo")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "crear":
+            n = args.tamanio
+            if len(args.pos) != 2:
+                parser.error("hay que dar exactamente dos --pos")
+            for f, c in args.pos:
+                if not (0 <= f < n and 0 <= c < n):
+                    parser.error(f"la posición ({f}, {c}) está fuera del tablero {n}x{n}")
+            crear_desde_semilla(args.archivo, n, n, args.semilla, *args.pos)
+        elif args.comando == "caminar":
+            t0 = time.perf_counter()
+            with Instantanea(args.archivo, "lectura") as inst:
+                desde = inst.turno
+
+            def progreso(turno):
+                print(f"checkpoint en el turno {turno}", file=sys.stderr, flush=True)
+            try:
+                ganador, turno = caminar(args.archivo, args.max_turnos, args.cada, progreso)
+            except KeyboardInterrupt:
+                print("Interrumpido: se puede seguir desde el último checkpoint.", file=sys.stderr)
+                return 1
+            seg = time.perf_counter() - t0
+            fin = f"gana el jugador {ganador}" if ganador else "la partida sigue"
+            print(f"Turno {turno}: {fin} ({turno - desde} turnos en {seg:.2f} s)")
+        else:
+            with Instantanea(args.archivo, "lectura") as inst:
+                print(f"Tablero {inst.filas}x{inst.columnas}, semilla {inst.semilla}, turno {inst.turno}")
+                print(f"Jugador 1: {inst.pos1} ({inst.pasos1} pasos)  Jugador 2: {inst.pos2} ({inst.pasos2} pasos)")
+                if inst.ganador:
+                    print(f"Terminada: ganó el jugador {inst.ganador}")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
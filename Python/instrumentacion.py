@@ -0,0 +1,162 @@
+# Observadores del bucle de juego y métricas por turno.
+#
+# GameWindow, JuegoRepulsor (consola) y motor.Partida tienen una lista
+# `observadores`; en cada turno llaman, a cada observador de la lista:
+#
+#   inicio_turno(turno, jugador)       jugador: 0 = el que empezó, 1 = el otro
+#   rotacion(turno, jugador, pos)      casilla rotada en ese turno
+#   salida(turno, jugador, pos)        el jugador salió del tablero desde pos
+#   fin_turno(turno, jugador, sigue)
+#   inicio_dibujo() / fin_dibujo()     alrededor del redibujo (GUI o consola)
+#
+# Con la lista vacía el costo es una comprobación `if observadores:` por turno.
+# motor.simular, lotes y rotor no tienen hooks: son los bucles rápidos.
+#
+# Para medir una sesión sin tocar el código alcanza con definir la variable
+# de entorno REPULSOR_METRICAS: con "-" las métricas se imprimen al terminar,
+# con una ruta se guardan ahí en JSON.
+#     REPULSOR_METRICAS=sesion.json python repulsor_gui.py
+
+import json
+import os
+import sys
+import time
+
+VARIABLE_ENTORNO = "REPULSOR_METRICAS"
+CUBETAS = 32  # histograma de latencia: cubeta b = [2^(b-1), 2^b) microsegundos
+
+def notificar(observadores, evento, *args):
+    for observador in observadores:
+        getattr(observador, evento)(*args)
+
+class Observador:
+    """Observador que no hace nada: heredar y redefinir solo los eventos que interesan."""
+    def inicio_turno(self, turno, jugador):
+        pass
+
+    def rotacion(self, turno, jugador, pos):
+        pass
+
+    def salida(self, turno, jugador, pos):
+        pass
+
+    def fin_turno(self, turno, jugador, sigue):
+        pass
+
+    def inicio_dibujo(self):
+        pass
+
+    def fin_dibujo(self):
+        pass
+
+class Metricas(Observador):
+    """
+    Contadores incorporados: turnos, salidas, rotaciones por casilla, tiempo en
+    la lógica (de inicio_turno a fin_turno) y en el dibujo, e histograma de
+    latencia por turno en cubetas de potencias de 2 µs.
+
+    destino: None, "-" (imprimir por consola) o ruta de un JSON; lo usa informar().
+    """
+    def __init__(self, destino=None):
+        self.destino = destino
+        self.turnos = 0
+        self.salidas = 0
+        self.rotaciones = {}  # (fila, columna) -> veces que se rotó
+        self.tiempo_logica = 0.0
+        self.tiempo_dibujo = 0.0
+        self.dibujos = 0
+        self.histograma = [0] * CUBETAS
+        self.latencia_max = 0.0
+        self._t_turno = None
+        self._t_dibujo = None
+
+    def inicio_turno(self, turno, jugador):
+        self._t_turno = time.perf_counter()
+
+    def rotacion(self, turno, jugador, pos):
+        self.rotaciones[pos] = self.rotaciones.get(pos, 0) + 1
+
+    def salida(self, turno, jugador, pos):
+        self.salidas += 1
+
+    def fin_turno(self, turno, jugador, sigue):
+        dt = time.perf_counter() - self._t_turno
+        self.turnos += 1
+        self.tiempo_logica += dt
+        self.histograma[min(CUBETAS - 1, int(dt * 1e6).bit_length())] += 1
+        if dt > self.latencia_max:
+            self.latencia_max = dt
+
+    def inicio_dibujo(self):
+        self._t_dibujo = time.perf_counter()
+
+    def fin_dibujo(self):
+        self.tiempo_dibujo += time.perf_counter() - self._t_dibujo
+        self.dibujos += 1
+
+    def percentil(self, p):
+        """Cota superior (µs) del percentil p de latencia, según el histograma."""
+        if not self.turnos:
+            return None
+        objetivo = p / 100 * self.turnos
+        acumulado = 0
+        for b, n in enumerate(self.histograma):
+            acumulado += n
+            if acumulado >= objetivo:
+                return float(1 << b)
+        return float(1 << (CUBETAS - 1))
+
+    def como_dict(self, max_casillas=20):
+        cubetas = {}
+        for b, n in enumerate(self.histograma):
+            if n:
+                cubetas["<1" if b == 0 else f"{1 << (b - 1)}-{1 << b}"] = n
+        mas_rotadas = sorted(self.rotaciones.items(), key=lambda x: -x[1])[:max_casillas]
+        return {
+            "turnos": self.turnos,
+            "salidas": self.salidas,
+            "tiempo_logica_s": self.tiempo_logica,
+            "tiempo_dibujo_s": self.tiempo_dibujo,
+            "dibujos": self.dibujos,
+            "latencia_turno_us": {
+                "histograma": cubetas,
+                "p50": self.percentil(50),
+                "p95": self.percentil(95),
+                "p99": self.percentil(99),
+                "max": self.latencia_max * 1e6,
+            },
+            "casillas_rotadas": len(self.rotaciones),
+            "rotaciones_por_casilla": [[i, j, n] for (i, j), n in mas_rotadas],
+        }
+
+    def guardar_json(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.como_dict(), f, indent=2, ensure_ascii=False)
+
+    def imprimir(self, archivo=None):
+        archivo = archivo or sys.stdout
+        d = self.como_dict(max_casillas=5)
+        lat = d["latencia_turno_us"]
+        print(f"Turnos: {d['turnos']}  salidas: {d['salidas']}  casillas rotadas: {d['casillas_rotadas']}", file=archivo)
+        print(f"Tiempo en lógica: {d['tiempo_logica_s'] * 1000:.1f} ms  "
+              f"en dibujo: {d['tiempo_dibujo_s'] * 1000:.1f} ms ({d['dibujos']} redibujos)", file=archivo)
+        if self.turnos:
+            print(f"Latencia por turno (µs): p50 <= {lat['p50']:.0f}  p95 <= {lat['p95']:.0f}  "
+                  f"p99 <= {lat['p99']:.0f}  máx {lat['max']:.1f}", file=archivo)
+            for rango, n in lat["histograma"].items():
+                print(f"  {rango:>12} µs  {n}", file=archivo)
+        if d["rotaciones_por_casilla"]:
+            mas = ", ".join(f"({i}, {j}): {n}" for i, j, n in d["rotaciones_por_casilla"])
+            print(f"Casillas más rotadas: {mas}", file=archivo)
+
+    def informar(self):
+        """Imprime o guarda las métricas según `destino` (no hace nada si es None)."""
+        if self.destino == "-":
+            self.imprimir()
+        elif self.destino:
+            self.guardar_json(self.destino)
+
+def metricas_del_entorno():
+    """Metricas configuradas por REPULSOR_METRICAS, o None si la variable no está definida."""
+    destino = os.environ.get(VARIABLE_ENTORNO)
+    return Metricas(destino) if destino else None
@@ -0,0 +1,436 @@
+# Lógica del juego Sistema Dinámico Repulsor (sin dependencias de GUI).
+#
+# El tablero guarda las direcciones de todas las flechas en un único
+# bytearray plano (una casilla = un byte, índice i*columnas+j) en lugar de
+# un objeto Casilla por celda. Para no romper el código existente,
+# `tablero.casillas[i][j]` sigue devolviendo algo que se comporta como una
+# Casilla (vista liviana sobre el bytearray).
+
+import random
+from array import array
+
+# -------------------------------
+# Clase Casilla
+# -------------------------------
+class Casilla:
+    SIMBOLOS = ['^', '>', 'v', '<']  # 0=arriba,1=derecha,2=abajo,3=izquierda
+    # sin __slots__ acá, las CasillaVista tendrían igual un __dict__ cada una
+    __slots__ = ('direccion',)
+
+    def __init__(self, direccion=None):
+        self.direccion = direccion if direccion is not None else random.randint(0, 3)
+
+    def rotar(self):
+        """Rota la flecha 90° en sentido horario."""
+        self.direccion = (self.direccion + 1) % 4
+
+    def obtener_simbolo(self):
+        return Casilla.SIMBOLOS[self.direccion]
+
+class CasillaVista(Casilla):
+    """Casilla que no guarda estado propio: lee y escribe en el bytearray del tablero."""
+    __slots__ = ('_datos', '_k')
+
+    def __init__(self, datos, k):
+        self._datos = datos
+        self._k = k
+
+    @property
+    def direccion(self):
+        return self._datos[self._k]
+
+    @direccion.setter
+    def direccion(self, valor):
+        self._datos[self._k] = valor & 3
+
+class FilaVista:
+    """Fila del tablero indexable con [j]; crea las CasillaVista bajo demanda."""
+    __slots__ = ('_datos', '_base', '_columnas')
+
+    def __init__(self, datos, base, columnas):
+        self._datos = datos
+        self._base = base
+        self._columnas = columnas
+
+    def __len__(self):
+        return self._columnas
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self._columnas
+        if not 0 <= j < self._columnas:
+            raise IndexError("columna fuera del tablero")
+        return CasillaVista(self._datos, self._base + j)
+
+class CasillasVista:
+    """Reemplazo de la antigua lista de listas `casillas`: casillas[i][j]."""
+    __slots__ = ('_tablero',)
+
+    def __init__(self, tablero):
+        self._tablero = tablero
+
+    def __len__(self):
+        return self._tablero.filas
+
+    def __getitem__(self, i):
+        t = self._tablero
+        if i < 0:
+            i += t.filas
+        if not 0 <= i < t.filas:
+            raise IndexError("fila fuera del tablero")
+        return FilaVista(t.direcciones, i * t.columnas, t.columnas)
+
+# -------------------------------
+# Hash Zobrist del tablero
+# -------------------------------
+_MASCARA64 = (1 << 64) - 1
+
+def clave_zobrist(k, d):
+    """
+    Clave pseudoaleatoria de 64 bits para "la casilla k apunta en dirección d".
+    Se calcula con splitmix64 en vez de guardarla en una tabla, así no ocupa
+    memoria extra en tableros grandes.
+    """
+    z = ((k << 2 | d) * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASCARA64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA64
+    return z ^ (z >> 31)
+
+# -------------------------------
+# Sorteo de direcciones
+# -------------------------------
+# _EXTRAER[s][b] = dirección guardada en los bits 2s..2s+1 del byte b
+_EXTRAER = [bytes((b >> (2 * s)) & 3 for b in range(256)) for s in range(4)]
+# _UBICAR[s][d] = dirección d (0-3) corrida a los bits 2s..2s+1
+_UBICAR = [bytes(((b & 3) << (2 * s)) for b in range(256)) for s in range(4)]
+
+def empaquetadas_al_azar(cantidad, generador=random):
+    """Bytes con `cantidad` direcciones al azar empaquetadas de a 4 (ver desempaquetar)."""
+    return generador.getrandbits(2 * cantidad).to_bytes((cantidad + 3) // 4, "little")
+
+def desempaquetar(empaquetadas, cantidad):
+    """
+    Direcciones (bytearray de valores 0-3) guardadas de a 4 por byte: la
+    casilla k en los bits 2(k%4)..2(k%4)+1 del byte k//4. Usa bytes.translate
+    (sin un bucle de Python por casilla).
+    """
+    n_bytes = (cantidad + 3) // 4
+    if len(empaquetadas) != n_bytes:
+        empaquetadas = empaquetadas[:n_bytes]
+    direcciones = bytearray(4 * n_bytes)
+    for s in range(4):
+        direcciones[s::4] = empaquetadas.translate(_EXTRAER[s])
+    del direcciones[cantidad:]
+    return direcciones
+
+def empaquetar(direcciones):
+    """Inversa de desempaquetar: 4 direcciones por byte."""
+    n_bytes = (len(direcciones) + 3) // 4
+    relleno = bytes(direcciones) + bytes(4 * n_bytes - len(direcciones))
+    total = 0
+    for s in range(4):
+        total |= int.from_bytes(relleno[s::4].translate(_UBICAR[s]), "little")
+    return total.to_bytes(n_bytes, "little")
+
+def direcciones_al_azar(cantidad, generador=random):
+    """
+    Sortea `cantidad` direcciones (0-3) con una única llamada a
+    generador.getrandbits(2 * cantidad) y las desempaqueta, 4 por byte.
+    """
+    if cantidad == 0:
+        return bytearray()
+    return desempaquetar(empaquetadas_al_azar(cantidad, generador), cantidad)
+
+# -------------------------------
+# Clase Tablero
+# -------------------------------
+class Tablero:
+    DELTAS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # ↑ → ↓ ←
+    hash = None  # hash Zobrist de las flechas; None hasta llamar a activar_hash()
+    semilla = None  # semilla de las flechas iniciales si se creó con desde_semilla()
+
+    def __init__(self, filas, columnas, direcciones=None):
+        """
+        Crea un tablero de filas x columnas. Si no se pasan `direcciones`
+        (secuencia de filas*columnas valores 0-3, fila por fila) se sortean al azar.
+        """
+        self.filas = filas
+        self.columnas = columnas
+        if direcciones is None:
+            self.direcciones = direcciones_al_azar(filas * columnas)
+        else:
+            self.direcciones = bytearray(direcciones)
+            if len(self.direcciones) != filas * columnas:
+                raise ValueError("La cantidad de direcciones no coincide con el tamaño del tablero.")
+        self.casillas = CasillasVista(self)
+
+    @classmethod
+    def desde_semilla(cls, filas, columnas, semilla):
+        """
+        Crea un tablero cuyas flechas dependen solo de (filas, columnas, semilla):
+        alcanza con compartir la semilla para reproducir el mismo tablero.
+        """
+        tablero = cls(filas, columnas, direcciones_al_azar(filas * columnas, random.Random(semilla)))
+        tablero.semilla = semilla
+        return tablero
+
+    def copiar(self):
+        """Devuelve un tablero independiente con las mismas flechas."""
+        copia = type(self)(self.filas, self.columnas, self.direcciones)
+        copia.hash = self.hash
+        return copia
+
+    def activar_hash(self):
+        """
+        Calcula el hash Zobrist de todas las flechas (una única pasada O(filas·columnas)).
+        A partir de ahí mover_desde lo mantiene actualizado en O(1) por rotación.
+        """
+        h = 0
+        for k, d in enumerate(self.direcciones):
+            h ^= clave_zobrist(k, d)
+        self.hash = h
+        return h
+
+    def instantanea(self):
+        """Copia inmutable de las flechas, comparable con la de otro momento de la partida."""
+        return bytes(self.direcciones)
+
+    def direccion(self, pos):
+        i, j = pos
+        return self.direcciones[i * self.columnas + j]
+
+    def mover_desde(self, pos):
+        """
+        Rota la casilla en pos y devuelve (nueva_pos, pos_rotada).
+        Si el movimiento sale del tablero, devuelve (None, pos_rotada).
+        """
+        i, j = pos
+        k = i * self.columnas + j
+        d = self.direcciones[k]
+        self.direcciones[k] = (d + 1) & 3
+        if self.hash is not None:
+            self.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, (d + 1) & 3)
+        di, dj = Tablero.DELTAS[d]
+        ni = i + di
+        nj = j + dj
+        if not (0 <= ni < self.filas and 0 <= nj < self.columnas):
+            return None, (i, j)
+        return (ni, nj), (i, j)
+
+    def deshacer_movimiento(self, pos):
+        """
+        Deshace mover_desde(pos): gira la flecha de pos en sentido antihorario.
+        El jugador que se había movido tiene que volver a pos.
+        """
+        i, j = pos
+        k = i * self.columnas + j
+        d = self.direcciones[k]
+        self.direcciones[k] = (d - 1) & 3
+        if self.hash is not None:
+            self.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, (d - 1) & 3)
+
+    def dentro_de_limites(self, pos):
+        i, j = pos
+        return 0 <= i < self.filas and 0 <= j < self.columnas
+
+# -------------------------------
+# Casillas visitadas
+# -------------------------------
+MAX_BITS = 1 << 24  # rango de casillas más ancho que esto (2 MB de bits + 128 MB de turnos): dict
+
+class Visitadas:
+    """
+    Casillas visitadas por un jugador, con la interfaz de un set de (i, j).
+
+    Un bit por casilla (índice i*columnas+j) dice si se visitó y un array('q')
+    sobre el mismo rango guarda el turno de la primera visita: consultar,
+    contar, primer_turno y discard son O(1) sin un objeto por casilla. Los
+    dos se crean vacíos y crecen solo sobre el rango de casillas visitadas
+    (a partir del byte `base` del bitset). Si ese rango pasa de MAX_BITS
+    casillas (p. ej. en un TableroDisperso enorme) se pasan a un dict
+    {índice plano: turno}. Se recorren en el orden del tablero.
+    """
+    __slots__ = ('filas', 'columnas', 'total', 'bits', 'turnos', 'base', 'cantidad', 'primeras')
+
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self.total = filas * columnas
+        self.bits = bytearray()
+        self.turnos = array('q')  # turno de la casilla 8*base + n en turnos[n]
+        self.base = 0       # byte del tablero donde empieza self.bits
+        self.cantidad = 0
+        self.primeras = None  # {índice plano: turno} cuando el rango es demasiado ancho
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        columnas = self.columnas
+        if self.bits is None:
+            for k in sorted(self.primeras):
+                yield divmod(k, columnas)
+            return
+        inicio = self.base << 3
+        for b, byte in enumerate(self.bits):
+            while byte:
+                bajo = byte & -byte
+                yield divmod(inicio + (b << 3) + bajo.bit_length() - 1, columnas)
+                byte ^= bajo
+
+    def _indice(self, pos):
+        """Índice plano de pos, o None si está fuera del tablero."""
+        if pos is None:
+            return None
+        i, j = pos
+        if not (0 <= i < self.filas and 0 <= j < self.columnas):
+            return None
+        return i * self.columnas + j
+
+    def _marcada(self, k):
+        """True si la casilla k está en el bitset (que no debe ser None)."""
+        b = (k >> 3) - self.base
+        return 0 <= b < len(self.bits) and (self.bits[b] >> (k & 7)) & 1 == 1
+
+    def __contains__(self, pos):
+        k = self._indice(pos)
+        if k is None:
+            return False
+        if self.bits is None:
+            return k in self.primeras
+        return self._marcada(k)
+
+    def _agrandar(self, b):
+        """Extiende bits y turnos hasta cubrir el byte b del tablero (al menos al doble, para amortizar)."""
+        bits = self.bits
+        n = len(bits)
+        if n:
+            lo, hi = min(b, self.base), max(b + 1, self.base + n)
+        else:
+            lo, hi = b, b + 1
+        ancho = max(hi - lo, 2 * n, 64)
+        if ancho * 8 > MAX_BITS:
+            inicio = self.base << 3
+            self.primeras = {k: self.turnos[k - inicio] for k in (i * self.columnas + j for i, j in self)}
+            self.bits = None
+            self.turnos = None
+            return
+        if b < self.base:
+            lo = max(0, hi - ancho)
+        else:
+            hi = min((self.total + 7) // 8, lo + ancho)
+        nuevos = bytearray(hi - lo)
+        turnos = array('q', bytes(64 * (hi - lo)))
+        if n:
+            desde = self.base - lo
+            nuevos[desde:desde + n] = bits
+            turnos[8 * desde:8 * (desde + n)] = self.turnos
+        self.bits = nuevos
+        self.turnos = turnos
+        self.base = lo
+
+    def add(self, pos, turno=0):
+        """Marca pos como visitada. Devuelve True si era la primera visita."""
+        i, j = pos
+        k = i * self.columnas + j
+        bits = self.bits
+        if bits is None:
+            if k in self.primeras:
+                return False
+            self.primeras[k] = turno
+        else:
+            b = (k >> 3) - self.base
+            if not 0 <= b < len(bits):
+                self._agrandar(k >> 3)
+                return self.add(pos, turno)
+            mascara = 1 << (k & 7)
+            if bits[b] & mascara:
+                return False
+            bits[b] |= mascara
+            self.turnos[k - (self.base << 3)] = turno
+        self.cantidad += 1
+        return True
+
+    def discard(self, pos):
+        """Desmarca pos (para deshacer turnos)."""
+        k = self._indice(pos)
+        if k is None:
+            return
+        if self.bits is None:
+            if self.primeras.pop(k, None) is None:
+                return
+        else:
+            if not self._marcada(k):
+                return
+            self.bits[(k >> 3) - self.base] &= ~(1 << (k & 7)) & 0xFF
+        self.cantidad -= 1
+
+    def primer_turno(self, pos):
+        """Turno de la primera visita a pos, o None si no se visitó."""
+        k = self._indice(pos)
+        if k is None:
+            return None
+        if self.bits is None:
+            return self.primeras.get(k)
+        return self.turnos[k - (self.base << 3)] if self._marcada(k) else None
+
+    def cobertura(self):
+        """Fracción del tablero visitada."""
+        return self.cantidad / self.total if self.total else 0.0
+
+    def compartidas(self, otra):
+        """Cantidad de casillas visitadas por los dos (AND de los bitsets donde se superponen)."""
+        if self.bits is None or otra.bits is None:
+            chica, grande = sorted((self, otra), key=len)
+            return sum(1 for pos in chica if pos in grande)
+        lo = max(self.base, otra.base)
+        hi = min(self.base + len(self.bits), otra.base + len(otra.bits))
+        if hi <= lo:
+            return 0
+        a = int.from_bytes(self.bits[lo - self.base:hi - self.base], "little")
+        b = int.from_bytes(otra.bits[lo - otra.base:hi - otra.base], "little")
+        return (a & b).bit_count()
+
+# -------------------------------
+# Clase Jugador
+# -------------------------------
+class Jugador:
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.posicion = None
+        self.pasos = 0
+        self.visitadas = None  # Visitadas: casillas por las que pasó (para color permanente)
+
+    def preparar(self, tablero, turno=0):
+        """Empieza a registrar las casillas visitadas en `tablero`, contando la posición actual."""
+        self.visitadas = Visitadas(tablero.filas, tablero.columnas)
+        if self.posicion is not None:
+            self.visitadas.add(self.posicion, turno)
+
+    def mover(self, tablero, turno=None):
+        """
+        Mueve al jugador un paso. `turno` es el número de turno de la partida
+        que se registra como primera visita (por defecto, los pasos del jugador).
+        """
+        if self.visitadas is None:
+            self.preparar(tablero)
+        nueva_pos, pos_rotada = tablero.mover_desde(self.posicion)
+        # marcar la casilla rotada como visitada (aunque salga)
+        self.visitadas.add(pos_rotada, self.pasos if turno is None else turno)
+        if nueva_pos is None:
+            return False, pos_rotada
+        self.posicion = nueva_pos
+        self.pasos += 1
+        return True, pos_rotada
+
+    def deshacer(self, tablero, pos_anterior, primera_visita):
+        """
+        Deshace un mover() que partió de pos_anterior. primera_visita indica si
+        esa casilla no estaba en visitadas antes del movimiento.
+        """
+        tablero.deshacer_movimiento(pos_anterior)
+        if self.posicion != pos_anterior:  # si había salido, no cambió de casilla
+            self.posicion = pos_anterior
+            self.pasos -= 1
+        if primera_visita:
+            self.visitadas.discard(pos_anterior)
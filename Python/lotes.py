@@ -0,0 +1,99 @@
+# Simulación por lotes con NumPy: K partidas independientes avanzan juntas.
+#
+# Los K tableros se guardan en un arreglo (K, filas, columnas) de uint8 y las
+# posiciones de los 2K jugadores en arreglos de índices. Cada turno es un
+# único paso vectorizado para todas las partidas que siguen en curso:
+# leer la dirección, calcular la nueva posición, rotar con (d+1)&3, sacar las
+# partidas terminadas y seguir con el resto. Las reglas son las mismas que
+# Tablero.mover_desde / motor.simular, por lo que los resultados coinciden
+# partida a partida con el camino escalar.
+
+import numpy as np
+
+DFILA = np.array([-1, 0, 1, 0], dtype=np.int64)
+DCOL = np.array([0, 1, 0, -1], dtype=np.int64)
+
+class ResultadoLote:
+    """Resultados de un lote de K partidas (arreglos de largo K).
+
+    ganador: 1 o 2, 0 si la partida llegó a max_turnos sin terminar.
+    turnos:  movimientos jugados en cada partida.
+    salida:  (K, 2) casilla desde la que salió el perdedor, (-1, -1) si no hubo.
+    """
+    __slots__ = ('ganador', 'turnos', 'salida')
+
+    def __init__(self, ganador, turnos, salida):
+        self.ganador = ganador
+        self.turnos = turnos
+        self.salida = salida
+
+    def __len__(self):
+        return len(self.ganador)
+
+def desde_tableros(tableros):
+    """Apila una lista de Tablero del mismo tamaño en un arreglo (K, filas, columnas)."""
+    filas, columnas = tableros[0].filas, tableros[0].columnas
+    for t in tableros:
+        if (t.filas, t.columnas) != (filas, columnas):
+            raise ValueError("Todos los tableros del lote deben tener el mismo tamaño.")
+    datos = np.frombuffer(b"".join(bytes(t.direcciones) for t in tableros), dtype=np.uint8)
+    return datos.reshape(len(tableros), filas, columnas).copy()
+
+def simular_lote(tableros, pos1, pos2, max_turnos=None):
+    """
+    Juega K partidas en paralelo. `tableros` es un arreglo (K, filas, columnas)
+    de uint8 (se modifica en el lugar, como en motor.simular); pos1 y pos2 son
+    arreglos (K, 2) o un único par (fila, columna) para todas las partidas.
+    El jugador 1 mueve primero.
+    """
+    tableros = np.asarray(tableros)
+    if tableros.dtype != np.uint8 or tableros.ndim != 3:
+        raise ValueError("tableros debe ser un arreglo uint8 de forma (K, filas, columnas).")
+    if not tableros.flags.c_contiguous:
+        # reshape(-1) copiaría y las rotaciones no llegarían a `tableros`
+        raise ValueError("tableros debe ser contiguo (usar np.ascontiguousarray).")
+    k, filas, columnas = tableros.shape
+    celdas = filas * columnas
+    plano = tableros.reshape(-1)  # vista: las rotaciones se escriben en `tableros`
+
+    # posiciones: [jugador][partida]
+    pos = np.empty((2, 2, k), dtype=np.int64)
+    pos[0] = np.broadcast_to(np.asarray(pos1, dtype=np.int64), (k, 2)).T
+    pos[1] = np.broadcast_to(np.asarray(pos2, dtype=np.int64), (k, 2)).T
+    filas_j, cols_j = pos[:, 0], pos[:, 1]
+
+    ganador = np.zeros(k, dtype=np.int8)
+    turnos = np.zeros(k, dtype=np.int64)
+    salida = np.full((k, 2), -1, dtype=np.int64)
+
+    activos = np.arange(k, dtype=np.int64)
+    base = activos * celdas
+    turno = 0
+    while activos.size and turno != max_turnos:
+        jug = turno & 1
+        i = filas_j[jug, activos]
+        j = cols_j[jug, activos]
+        g = base + i * columnas + j
+        d = plano[g]
+        plano[g] = (d + 1) & 3
+        ni = i + DFILA[d]
+        nj = j + DCOL[d]
+        turno += 1
+
+        sale = (ni < 0) | (ni >= filas) | (nj < 0) | (nj >= columnas)
+        if sale.any():
+            fin = activos[sale]
+            ganador[fin] = 2 - jug
+            turnos[fin] = turno
+            salida[fin, 0] = i[sale]
+            salida[fin, 1] = j[sale]
+            sigue = ~sale
+            activos = activos[sigue]
+            base = base[sigue]
+            ni = ni[sigue]
+            nj = nj[sigue]
+        filas_j[jug, activos] = ni
+        cols_j[jug, activos] = nj
+
+    turnos[activos] = turno
+    return ResultadoLote(ganador, turnos, salida)
@@ -0,0 +1,366 @@
+# Motor de simulación sin interfaz (no importa tkinter ni hace I/O).
+#
+# Juega una partida completa sobre un Tablero a partir de las posiciones
+# iniciales de los dos jugadores. El jugador 1 es el que mueve primero
+# (el ganador del mini-juego 2 en la versión interactiva). PartidaMultiple
+# juega con N jugadores, por rondas y con eliminación.
+
+from array import array
+
+from instrumentacion import notificar
+from logica import clave_zobrist
+
+class ResultadoPartida:
+    """Resultado de una partida simulada.
+
+    ganador: 1 o 2, o None si se alcanzó max_turnos sin que nadie saliera.
+    turnos:  movimientos jugados (incluye el movimiento con el que se sale).
+    salida:  casilla desde la que el perdedor abandonó el tablero (o None).
+    ciclo:   largo del ciclo si resolver() encontró un estado repetido (empate real).
+    """
+    __slots__ = ('ganador', 'turnos', 'salida', 'ciclo')
+
+    def __init__(self, ganador, turnos, salida, ciclo=None):
+        self.ganador = ganador
+        self.turnos = turnos
+        self.salida = salida
+        self.ciclo = ciclo
+
+    def __repr__(self):
+        extra = f", ciclo={self.ciclo}" if self.ciclo is not None else ""
+        return f"ResultadoPartida(ganador={self.ganador}, turnos={self.turnos}, salida={self.salida}{extra})"
+
+    def __eq__(self, otro):
+        return (isinstance(otro, ResultadoPartida)
+                and (self.ganador, self.turnos, self.salida, self.ciclo)
+                == (otro.ganador, otro.turnos, otro.salida, otro.ciclo))
+
+def simular(tablero, pos1, pos2, max_turnos=None, pisadas=None):
+    """
+    Simula la partida hasta que un jugador sale del tablero o se juegan
+    max_turnos movimientos (None = sin límite; en un tablero finito la
+    partida siempre termina). Modifica las flechas de `tablero`: usar
+    tablero.copiar() si se quiere conservar el original.
+
+    pisadas: bytearray opcional de filas*columnas bytes; se pone en 1 el de
+    cada casilla en la que estuvo algún jugador (las iniciales incluidas).
+    """
+    datos = tablero.direcciones
+    filas = tablero.filas
+    columnas = tablero.columnas
+    # desplazamiento en el índice plano y en fila/columna por dirección
+    saltos = [-columnas, 1, columnas, -1]
+    dfila = [-1, 0, 1, 0]
+    dcol = [0, 1, 0, -1]
+
+    i1, j1 = pos1
+    i2, j2 = pos2
+    k1 = i1 * columnas + j1
+    k2 = i2 * columnas + j2
+    marcar = pisadas is not None
+    if marcar:
+        pisadas[k1] = pisadas[k2] = 1
+    limite = -1 if max_turnos is None else max_turnos
+    turnos = 0
+
+    while turnos != limite:
+        # turno del jugador 1
+        d = datos[k1]
+        datos[k1] = (d + 1) & 3
+        turnos += 1
+        ni = i1 + dfila[d]
+        nj = j1 + dcol[d]
+        if ni < 0 or ni >= filas or nj < 0 or nj >= columnas:
+            return ResultadoPartida(2, turnos, (i1, j1))
+        i1, j1 = ni, nj
+        k1 += saltos[d]
+        if marcar:
+            pisadas[k1] = 1
+        if turnos == limite:
+            break
+
+        # turno del jugador 2
+        d = datos[k2]
+        datos[k2] = (d + 1) & 3
+        turnos += 1
+        ni = i2 + dfila[d]
+        nj = j2 + dcol[d]
+        if ni < 0 or ni >= filas or nj < 0 or nj >= columnas:
+            return ResultadoPartida(1, turnos, (i2, j2))
+        i2, j2 = ni, nj
+        k2 += saltos[d]
+        if marcar:
+            pisadas[k2] = 1
+
+    return ResultadoPartida(None, turnos, None)
+
+class Partida:
+    """
+    Partida que se juega de a un turno y se puede deshacer con retroceder().
+
+    Un movimiento se revierte girando en sentido antihorario la flecha de la
+    casilla de la que salió el jugador y devolviéndolo a ella, así que por
+    turno solo se guarda esa casilla (un entero) y nunca una copia del tablero.
+    Rehacer es volver a llamar a avanzar(): la partida es determinista.
+
+    observadores: lista de instrumentacion.Observador que reciben los eventos
+    de cada turno jugado con avanzar().
+    """
+    __slots__ = ('tablero', 'posiciones', 'turnos', 'ganador', 'observadores', '_anteriores')
+
+    def __init__(self, tablero, pos1, pos2):
+        self.tablero = tablero
+        self.posiciones = [pos1, pos2]
+        self.turnos = 0
+        self.ganador = None  # 1 o 2 cuando el otro jugador salió del tablero
+        self.observadores = []
+        self._anteriores = array('q')  # índice plano de la casilla dejada en cada turno
+
+    def avanzar(self):
+        """Juega el turno siguiente. Devuelve False si el jugador salió del tablero."""
+        if self.ganador is not None:
+            raise ValueError("La partida ya terminó.")
+        jug = self.turnos & 1
+        pos = self.posiciones[jug]
+        obs = self.observadores
+        if obs:
+            notificar(obs, "inicio_turno", self.turnos + 1, jug)
+        nueva, _ = self.tablero.mover_desde(pos)
+        self._anteriores.append(pos[0] * self.tablero.columnas + pos[1])
+        self.turnos += 1
+        if nueva is None:
+            self.ganador = 2 - jug
+        else:
+            self.posiciones[jug] = nueva
+        if obs:
+            notificar(obs, "rotacion", self.turnos, jug, pos)
+            if nueva is None:
+                notificar(obs, "salida", self.turnos, jug, pos)
+            notificar(obs, "fin_turno", self.turnos, jug, nueva is not None)
+        return nueva is not None
+
+    def retroceder(self):
+        """Deshace el último turno jugado (también el de salida)."""
+        if not self.turnos:
+            raise ValueError("No hay turnos para deshacer.")
+        pos = divmod(self._anteriores.pop(), self.tablero.columnas)
+        self.turnos -= 1
+        self.tablero.deshacer_movimiento(pos)
+        self.posiciones[self.turnos & 1] = pos
+        self.ganador = None
+
+class PartidaMultiple:
+    """
+    Partida de N jugadores (0..N-1) que mueven siempre en el mismo orden; el
+    que sale del tablero queda eliminado y los demás siguen. Gana el último
+    que queda. En un tablero finito la partida siempre termina: una casilla
+    pisada infinitas veces manda caminantes a sus cuatro vecinas, y así hasta
+    el borde, por donde alguno terminaría saliendo.
+
+    posiciones: array('q') con el índice plano de cada jugador (-1 si salió)
+    vivos:      array('q') con los jugadores que siguen, en orden de turno
+    eliminados: lista de (jugador, turno, casilla de salida), en orden
+
+    avanzar() juega un turno; ronda() juega de una vez los turnos que faltan
+    para completar la vuelta, recorriendo solo los jugadores vivos. Los
+    movimientos se aplican en orden aunque dos jugadores compartan casilla (el
+    orden de las rotaciones cambia el resultado). Si el tablero tiene el hash
+    Zobrist activo (Tablero.activar_hash), ronda() lo mantiene como
+    mover_desde.
+
+    observadores: como en Partida; si hay alguno, ronda() juega de a un turno
+    para notificar cada uno.
+    """
+    __slots__ = ('tablero', 'posiciones', 'vivos', 'siguiente', 'turnos', 'rondas', 'eliminados', 'observadores')
+
+    def __init__(self, tablero, posiciones):
+        if not posiciones:
+            raise ValueError("Hace falta al menos un jugador.")
+        columnas = tablero.columnas
+        self.tablero = tablero
+        self.posiciones = array('q', (i * columnas + j for i, j in posiciones))
+        self.vivos = array('q', range(len(posiciones)))
+        self.siguiente = 0  # índice en `vivos` del jugador que mueve ahora
+        self.turnos = 0
+        self.rondas = 0
+        self.eliminados = []
+        self.observadores = []
+
+    @property
+    def terminada(self):
+        if len(self.posiciones) == 1:
+            return not self.vivos  # un solo caminante: hasta que sale
+        return len(self.vivos) <= 1
+
+    @property
+    def ganador(self):
+        """Número del último jugador en pie, o None si la partida sigue."""
+        return self.vivos[0] if len(self.vivos) == 1 and self.terminada else None
+
+    @property
+    def proximo(self):
+        """Jugador al que le toca mover."""
+        return self.vivos[self.siguiente]
+
+    def posicion(self, jugador):
+        """(fila, columna) del jugador, o None si ya salió."""
+        k = self.posiciones[jugador]
+        return None if k < 0 else divmod(k, self.tablero.columnas)
+
+    def posiciones_actuales(self):
+        columnas = self.tablero.columnas
+        return [None if k < 0 else divmod(k, columnas) for k in self.posiciones]
+
+    def avanzar(self):
+        """Juega el turno siguiente. Devuelve (jugador, salio, casilla_rotada)."""
+        if self.terminada:
+            raise ValueError("La partida ya terminó.")
+        jug = self.vivos[self.siguiente]
+        pos = self.posicion(jug)
+        obs = self.observadores
+        if obs:
+            notificar(obs, "inicio_turno", self.turnos + 1, jug)
+        nueva, _ = self.tablero.mover_desde(pos)
+        self.turnos += 1
+        if nueva is None:
+            self.posiciones[jug] = -1
+            self.eliminados.append((jug, self.turnos, pos))
+            del self.vivos[self.siguiente]
+        else:
+            self.posiciones[jug] = nueva[0] * self.tablero.columnas + nueva[1]
+            self.siguiente += 1
+        if self.siguiente >= len(self.vivos):
+            self.siguiente = 0
+            self.rondas += 1
+        if obs:
+            notificar(obs, "rotacion", self.turnos, jug, pos)
+            if nueva is None:
+                notificar(obs, "salida", self.turnos, jug, pos)
+            notificar(obs, "fin_turno", self.turnos, jug, nueva is not None)
+        return jug, nueva is None, pos
+
+    def ronda(self):
+        """
+        Juega los turnos que faltan de la vuelta actual (una vuelta entera si
+        se llama al principio de una). Devuelve la cantidad de eliminados.
+        """
+        if self.terminada:
+            raise ValueError("La partida ya terminó.")
+        antes = len(self.eliminados)
+        datos = getattr(self.tablero, "direcciones", None)
+        if self.observadores or datos is None:
+            # tableros sin grilla densa (disperso, mapeado) o con hooks: de a un
+            # turno (siguiente no alcanza para ver el fin de la vuelta: vuelve a
+            # 0 también si sale el primero)
+            rondas = self.rondas
+            while True:
+                self.avanzar()
+                if self.rondas != rondas or self.terminada:
+                    return len(self.eliminados) - antes
+
+        columnas = self.tablero.columnas
+        ultima_fila = (self.tablero.filas - 1) * columnas
+        saltos = [-columnas, 1, columnas, -1]
+        posiciones = self.posiciones
+        eliminados = self.eliminados
+        vivos = self.vivos
+        quedan = vivos[:self.siguiente]
+        restantes = len(vivos)
+        final = 1 if len(posiciones) > 1 else 0  # vivos con los que termina la partida
+        turnos = self.turnos
+        h = getattr(self.tablero, "hash", None)
+        for x in range(self.siguiente, len(vivos)):
+            jug = vivos[x]
+            k = posiciones[jug]
+            d = datos[k]
+            datos[k] = (d + 1) & 3
+            if h is not None:
+                h ^= clave_zobrist(k, d) ^ clave_zobrist(k, (d + 1) & 3)
+            turnos += 1
+            # ¿la flecha apunta afuera del tablero?
+            if ((d == 0 and k < columnas) or (d == 2 and k >= ultima_fila)
+                    or (d == 1 and k % columnas == columnas - 1) or (d == 3 and k % columnas == 0)):
+                posiciones[jug] = -1
+                eliminados.append((jug, turnos, divmod(k, columnas)))
+                restantes -= 1
+                if restantes == final:
+                    quedan.extend(vivos[x + 1:])
+                    break
+            else:
+                posiciones[jug] = k + saltos[d]
+                quedan.append(jug)
+        if h is not None:
+            self.tablero.hash = h
+        self.vivos = quedan
+        self.turnos = turnos
+        self.siguiente = 0
+        self.rondas += 1
+        return len(eliminados) - antes
+
+    def jugar(self, max_rondas=None):
+        """Juega rondas hasta que queda un jugador (o max_rondas). Devuelve el ganador o None."""
+        rondas = 0
+        while not self.terminada and rondas != max_rondas:
+            self.ronda()
+            rondas += 1
+        return self.ganador
+
+class DetectorCiclos:
+    """
+    Detecta si la partida vuelve a un estado ya visto (mismas flechas, mismas
+    posiciones y mismo jugador por mover), lo que implicaría un ciclo infinito.
+
+    Usa el algoritmo de Brent sobre el hash Zobrist que mantiene
+    Tablero.mover_desde: cada turno cuesta O(1) (comparar con un único estado
+    guardado) y la memoria no crece con la cantidad de turnos. El estado de
+    referencia se renueva en las potencias de dos (O(log T) copias de la grilla
+    en total) y la grilla solo se compara completa cuando coinciden los hashes,
+    para descartar colisiones.
+    """
+    def __init__(self, tablero, pos1, pos2):
+        if tablero.hash is None:
+            tablero.activar_hash()
+        self.tablero = tablero
+        self._potencia = 1
+        self._guardar(0, (tablero.hash, pos1, pos2, 0))
+
+    def _guardar(self, turno, clave):
+        self._turno = turno
+        self._clave = clave
+        self._grilla = self.tablero.instantanea()
+
+    def registrar(self, turno, pos1, pos2):
+        """
+        Registra el estado después de `turno` movimientos. Devuelve el largo del
+        ciclo si el estado ya se había visto, o None.
+        """
+        clave = (self.tablero.hash, pos1, pos2, turno & 1)
+        largo = turno - self._turno
+        if clave == self._clave and self._grilla == self.tablero.instantanea():
+            return largo
+        if largo == self._potencia:
+            self._potencia *= 2
+            self._guardar(turno, clave)
+        return None
+
+def resolver(tablero, pos1, pos2):
+    """
+    Juega la partida hasta el final sin límite de turnos. Devuelve el turno
+    real de salida o, si el estado se repite, un empate (ganador None) con el
+    largo del ciclo en `ciclo`. En un tablero finito cada caminante termina
+    saliendo, así que el ciclo es una garantía de corte y no un caso esperado.
+    """
+    posiciones = [pos1, pos2]
+    detector = DetectorCiclos(tablero, pos1, pos2)
+    mover = tablero.mover_desde
+    turnos = 0
+    while True:
+        jug = turnos & 1
+        nueva, rotada = mover(posiciones[jug])
+        turnos += 1
+        if nueva is None:
+            return ResultadoPartida(2 - jug, turnos, rotada)
+        posiciones[jug] = nueva
+        ciclo = detector.registrar(turnos, posiciones[0], posiciones[1])
+        if ciclo is not None:
+            return ResultadoPartida(None, turnos, None, ciclo)
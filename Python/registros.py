@@ -0,0 +1,405 @@
+# Registros de partidas en lote: un generador de resultados y archivos columnares.
+#
+# partidas() juega un barrido de semillas x parejas de posiciones iniciales y
+# va devolviendo una tupla por partida, sin acumularlas. EscritorColumnar las
+# junta en bloques de TAM_BLOQUE filas (un array por columna) y agrega cada
+# bloque lleno al final del archivo; LectorColumnar lee de a un bloque. Así un
+# barrido de 10^8 partidas ocupa en memoria un bloque, no el barrido entero, y
+# resumir() recorre el archivo de a bloques con operaciones por columna.
+#
+# Campos de cada registro (en este orden, ver CAMPOS):
+#   semilla, filas, columnas       tablero de Tablero.desde_semilla
+#   fila1, col1, fila2, col2       posiciones iniciales de los jugadores 1 y 2
+#   primero                        jugador que mueve primero (1 o 2)
+#   ganador                        1, 2 o 0 si se llegó a max_turnos
+#   turnos                         movimientos jugados
+#   salida_fila, salida_col        casilla desde la que salió el perdedor (-1 si no hubo)
+#   cobertura                      casillas distintas que pisó algún jugador
+#
+# Formato binario (little-endian), solo se escribe agregando al final:
+#   cabecera: b"RCOL", versión (B), cantidad de columnas (H) y, por columna,
+#             largo del nombre (B), nombre y typecode de array (1 byte)
+#   bloques:  cantidad de filas (I) y después cada columna entera, una detrás de otra
+# Con formato "csv" se escribe una fila de encabezados y los bloques como filas.
+#
+# Uso:  python registros.py generar --tamanio 8 --semillas 0:1000 --salida partidas.rcol
+#       python registros.py resumir partidas.rcol
+
+import argparse
+import csv
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from logica import Tablero
+from motor import simular
+from torneo import bloques, leer_par, leer_rango, todas_las_parejas
+
+CAMPOS = (
+    ("semilla", "q"), ("filas", "i"), ("columnas", "i"),
+    ("fila1", "i"), ("col1", "i"), ("fila2", "i"), ("col2", "i"),
+    ("primero", "b"), ("ganador", "b"), ("turnos", "q"),
+    ("salida_fila", "i"), ("salida_col", "i"), ("cobertura", "q"),
+)
+NOMBRES = tuple(nombre for nombre, _ in CAMPOS)
+MAGIA = b"RCOL"
+VERSION = 1
+TAM_BLOQUE = 65536  # filas por bloque
+_VERSION_COLUMNAS = struct.Struct("<BH")
+_FILAS = struct.Struct("<I")
+_INVERTIR = sys.byteorder == "big"  # el archivo siempre es little-endian
+
+# -------------------------------
+# Generación
+# -------------------------------
+def jugar(tablero, pos1, pos2, primero=1, max_turnos=None):
+    """
+    Juega con motor.simular y además cuenta las casillas distintas que
+    pisaron los jugadores. Modifica `tablero`. Devuelve
+    (ganador o None, turnos, casilla de salida o None, cobertura).
+    """
+    pisadas = bytearray(tablero.filas * tablero.columnas)
+    if primero == 2:
+        r = simular(tablero, pos2, pos1, max_turnos, pisadas)
+        ganador = 3 - r.ganador if r.ganador else None
+    else:
+        r = simular(tablero, pos1, pos2, max_turnos, pisadas)
+        ganador = r.ganador
+    return ganador, r.turnos, r.salida, pisadas.count(1)
+
+def partidas(filas, columnas, semillas, pares, primero=1, max_turnos=None):
+    """Genera un registro (tupla en el orden de CAMPOS) por cada semilla y pareja."""
+    for semilla in semillas:
+        original = Tablero.desde_semilla(filas, columnas, semilla)
+        for (f1, c1), (f2, c2) in pares:
+            ganador, turnos, salida, cobertura = jugar(original.copiar(), (f1, c1), (f2, c2), primero, max_turnos)
+            sf, sc = salida if salida is not None else (-1, -1)
+            yield (semilla, filas, columnas, f1, c1, f2, c2, primero, ganador or 0, turnos, sf, sc, cobertura)
+
+def columnas_vacias():
+    return [array(tc) for _, tc in CAMPOS]
+
+def _jugar_bloque(filas, columnas, inicio, fin, pares, primero, max_turnos):
+    """Semillas [inicio, fin) como columnas. Se ejecuta en el trabajador."""
+    cols = columnas_vacias()
+    agregar = [c.append for c in cols]
+    for registro in partidas(filas, columnas, range(inicio, fin), pares, primero, max_turnos):
+        for a, valor in zip(agregar, registro):
+            a(valor)
+    return cols
+
+def bloques_en_paralelo(filas, columnas, semillas, pares, primero=1, max_turnos=None,
+                        trabajadores=None, semillas_por_bloque=None):
+    """
+    Como partidas(), pero repartido en procesos: genera los resultados como
+    columnas (listas de arrays), un bloque de semillas por vez y en orden. Hay
+    a lo sumo 2 bloques por trabajador en vuelo, así que la memoria no crece
+    con el barrido.
+    """
+    if not isinstance(semillas, range):
+        semillas = range(*semillas)
+    pares = [(tuple(p1), tuple(p2)) for p1, p2 in pares]
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if semillas_por_bloque is None:
+        semillas_por_bloque = max(1, TAM_BLOQUE // max(1, len(pares)))
+    pendientes = deque()
+    with ProcessPoolExecutor(max_workers=trabajadores) as ex:
+        for ini, fin in bloques(semillas, semillas_por_bloque):
+            if len(pendientes) >= 2 * trabajadores:
+                yield pendientes.popleft().result()
+            pendientes.append(ex.submit(_jugar_bloque, filas, columnas, ini, fin, pares, primero, max_turnos))
+        while pendientes:
+            yield pendientes.popleft().result()
+
+# -------------------------------
+# Archivos columnares
+# -------------------------------
+def _cabecera():
+    partes = [MAGIA, _VERSION_COLUMNAS.pack(VERSION, len(CAMPOS))]
+    for nombre, tc in CAMPOS:
+        partes.append(bytes([len(nombre)]) + nombre.encode("ascii") + tc.encode("ascii"))
+    return b"".join(partes)
+
+def _leer_cabecera(f):
+    """Lee la cabecera binaria y devuelve la lista de (nombre, typecode)."""
+    try:
+        if f.read(4) != MAGIA:
+            raise ValueError("El archivo no es un registro columnar del Sistema Repulsor.")
+        version, cantidad = _VERSION_COLUMNAS.unpack(f.read(_VERSION_COLUMNAS.size))
+        if version != VERSION:
+            raise ValueError(f"Versión de registro no soportada: {version}.")
+        campos = []
+        for _ in range(cantidad):
+            largo = f.read(1)[0]
+            texto = f.read(largo + 1).decode("ascii")
+            campos.append((texto[:-1], texto[-1]))
+    except (struct.error, IndexError, UnicodeDecodeError):
+        raise ValueError("La cabecera del registro está incompleta.") from None
+    return campos
+
+def formato_de(ruta):
+    return "csv" if ruta.lower().endswith(".csv") else "binario"
+
+class EscritorColumnar:
+    """
+    Agrega registros al final de `ruta` en bloques de tam_bloque filas.
+    formato: "binario" o "csv" (por defecto, según la extensión). Si el archivo
+    ya existe se siguen agregando bloques, siempre que tenga las mismas columnas.
+    Usar como context manager o llamar a cerrar() para escribir el último bloque.
+    """
+    def __init__(self, ruta, formato=None, tam_bloque=TAM_BLOQUE):
+        self.formato = formato or formato_de(ruta)
+        if self.formato not in ("binario", "csv"):
+            raise ValueError(f"Formato desconocido: {self.formato}.")
+        self.tam_bloque = tam_bloque
+        self.escritas = 0  # filas ya escritas en el archivo por este escritor
+        self.columnas = columnas_vacias()
+        self._agregar = [c.append for c in self.columnas]
+        existe = os.path.exists(ruta) and os.path.getsize(ruta) > 0
+        if existe:
+            self._verificar(ruta)
+        if self.formato == "csv":
+            self.archivo = open(ruta, "a", newline="", encoding="ascii")
+            self._csv = csv.writer(self.archivo)
+            if not existe:
+                self._csv.writerow(NOMBRES)
+        else:
+            self.archivo = open(ruta, "ab")
+            if not existe:
+                self.archivo.write(_cabecera())
+
+    def _verificar(self, ruta):
+        if self.formato == "csv":
+            with open(ruta, newline="", encoding="ascii") as f:
+                encabezado = next(csv.reader(f), None)
+            iguales = tuple(encabezado or ()) == NOMBRES
+        else:
+            with open(ruta, "rb") as f:
+                iguales = _leer_cabecera(f) == list(CAMPOS)
+        if not iguales:
+            raise ValueError(f"{ruta} tiene otras columnas: no se le pueden agregar registros.")
+
+    def escribir(self, registro):
+        for agregar, valor in zip(self._agregar, registro):
+            agregar(valor)
+        if len(self.columnas[0]) >= self.tam_bloque:
+            self._volcar()
+
+    def escribir_todos(self, registros):
+        for registro in registros:
+            self.escribir(registro)
+
+    def escribir_columnas(self, columnas):
+        """Agrega un bloque ya armado en columnas (p. ej. de bloques_en_paralelo)."""
+        for propia, nueva in zip(self.columnas, columnas):
+            propia.extend(nueva)
+        while len(self.columnas[0]) >= self.tam_bloque:
+            self._volcar()
+
+    def _volcar(self):
+        filas = min(len(self.columnas[0]), self.tam_bloque)
+        if not filas:
+            return
+        bloque = [c[:filas] for c in self.columnas]
+        for c in self.columnas:
+            del c[:filas]
+        if self.formato == "csv":
+            self._csv.writerows(zip(*bloque))
+        else:
+            self.archivo.write(_FILAS.pack(filas))
+            for c in bloque:
+                if _INVERTIR:
+                    c.byteswap()
+                self.archivo.write(c.tobytes())
+        self.escritas += filas
+
+    def cerrar(self):
+        if self.archivo.closed:
+            return
+        while len(self.columnas[0]):
+            self._volcar()
+        self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+class LectorColumnar:
+    """
+    Lee un archivo de EscritorColumnar (binario o csv, se detecta solo) de a un
+    bloque: bloques() genera listas de arrays en el orden de CAMPOS y
+    registros() las tuplas de a una. Un archivo truncado da ValueError.
+    """
+    def __init__(self, ruta, tam_bloque=TAM_BLOQUE):
+        self.ruta = ruta
+        self.tam_bloque = tam_bloque  # filas por bloque al leer un csv
+        with open(ruta, "rb") as f:
+            self.formato = "binario" if f.read(4) == MAGIA else "csv"
+
+    def bloques(self):
+        if self.formato == "csv":
+            yield from self._bloques_csv()
+            return
+        with open(self.ruta, "rb") as f:
+            campos = _leer_cabecera(f)
+            if campos != list(CAMPOS):
+                raise ValueError("El registro tiene columnas distintas de las esperadas.")
+            while True:
+                dato = f.read(_FILAS.size)
+                if not dato:
+                    return
+                if len(dato) < _FILAS.size:
+                    raise ValueError("El registro está incompleto.")
+                (filas,) = _FILAS.unpack(dato)
+                cols = columnas_vacias()
+                for c in cols:
+                    try:
+                        c.fromfile(f, filas)
+                    except (EOFError, ValueError):  # ValueError: cortado a mitad de un valor
+                        raise ValueError("El registro está incompleto.") from None
+                    if _INVERTIR:
+                        c.byteswap()
+                yield cols
+
+    def _bloques_csv(self):
+        with open(self.ruta, newline="", encoding="ascii") as f:
+            lector = csv.reader(f)
+            if tuple(next(lector, ())) != NOMBRES:
+                raise ValueError("El CSV no tiene las columnas de un registro de partidas.")
+            cols = columnas_vacias()
+            agregar = [c.append for c in cols]
+            for fila in lector:
+                if len(fila) != len(CAMPOS):
+                    raise ValueError(f"Fila incompleta en la línea {lector.line_num} del CSV.")
+                for a, valor in zip(agregar, fila):
+                    a(int(valor))
+                if len(cols[0]) == self.tam_bloque:
+                    yield cols
+                    cols = columnas_vacias()
+                    agregar = [c.append for c in cols]
+            if len(cols[0]):
+                yield cols
+
+    def registros(self):
+        for cols in self.bloques():
+            yield from zip(*cols)
+
+    def __iter__(self):
+        return self.registros()
+
+# -------------------------------
+# Resúmenes
+# -------------------------------
+class Resumen:
+    """Acumulados de un registro de partidas, sumados bloque a bloque."""
+    __slots__ = ('partidas', 'victorias1', 'victorias2', 'turnos', 'turnos_max', 'cobertura', 'casillas')
+
+    def __init__(self):
+        self.partidas = 0
+        self.victorias1 = 0
+        self.victorias2 = 0
+        self.turnos = 0
+        self.turnos_max = 0
+        self.cobertura = 0
+        self.casillas = 0  # suma de filas*columnas, para la cobertura relativa
+
+    def sumar_bloque(self, cols):
+        col = dict(zip(NOMBRES, cols))
+        n = len(col["turnos"])
+        if not n:
+            return
+        self.partidas += n
+        self.victorias1 += col["ganador"].count(1)
+        self.victorias2 += col["ganador"].count(2)
+        self.turnos += sum(col["turnos"])
+        self.turnos_max = max(self.turnos_max, max(col["turnos"]))
+        self.cobertura += sum(col["cobertura"])
+        self.casillas += sum(map(int.__mul__, col["filas"], col["columnas"]))
+
+    @property
+    def empates(self):
+        return self.partidas - self.victorias1 - self.victorias2
+
+    @property
+    def turnos_promedio(self):
+        return self.turnos / self.partidas if self.partidas else 0.0
+
+    @property
+    def cobertura_promedio(self):
+        """Fracción promedio del tablero que pisaron los jugadores."""
+        return self.cobertura / self.casillas if self.casillas else 0.0
+
+def resumir(bloques_de_columnas):
+    resumen = Resumen()
+    for cols in bloques_de_columnas:
+        resumen.sumar_bloque(cols)
+    return resumen
+
+# -------------------------------
+# Línea de comandos
+# -------------------------------
+def _generar(args, parser):
+    n = args.tamanio
+    pares = args.pares or todas_las_parejas(n, n)
+    for p1, p2 in pares:
+        for f, c in (p1, p2):
+            if not (0 <= f < n and 0 <= c < n):
+                parser.error(f"la posición ({f}, {c}) está fuera del tablero {n}x{n}")
+    t0 = time.perf_counter()
+    with EscritorColumnar(args.salida, "csv" if args.csv else None) as escritor:
+        if args.trabajadores == 1:
+            escritor.escribir_todos(partidas(n, n, args.semillas, pares, args.primero, args.max_turnos))
+        else:
+            for cols in bloques_en_paralelo(n, n, args.semillas, pares, args.primero, args.max_turnos,
+                                            args.trabajadores):
+                escritor.escribir_columnas(cols)
+    total = escritor.escritas
+    seg = time.perf_counter() - t0
+    print(f"{total} partidas escritas en {args.salida} en {seg:.2f} s ({total / seg:,.0f} partidas/s)")
+
+def _resumir(args):
+    r = resumir(LectorColumnar(args.archivo).bloques())
+    if not r.partidas:
+        print("El registro no tiene partidas.")
+        return
+    print(f"Partidas: {r.partidas}")
+    print(f"Gana 1: {r.victorias1 / r.partidas:.3f}  gana 2: {r.victorias2 / r.partidas:.3f}  "
+          f"sin ganador: {r.empates / r.partidas:.3f}")
+    print(f"Turnos: promedio {r.turnos_promedio:.2f}, máximo {r.turnos_max}")
+    print(f"Cobertura promedio del tablero: {r.cobertura_promedio:.3f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Registros de partidas del Sistema Dinámico Repulsor.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    gen = sub.add_parser("generar", help="jugar un barrido y agregar los resultados a un archivo")
+    gen.add_argument("--tamanio", type=int, default=8)
+    gen.add_argument("--semillas", type=leer_rango, default=range(0, 1000), help="rango inicio:fin")
+    gen.add_argument("--par", type=leer_par, action="append", dest="pares",
+                     help="posiciones iniciales fila,col:fila,col (se puede repetir)")
+    gen.add_argument("--primero", type=int, choices=(1, 2), default=1, help="jugador que mueve primero")
+    gen.add_argument("--max-turnos", type=int, default=None)
+    gen.add_argument("--trabajadores", type=int, default=None, help="1 = sin procesos extra")
+    gen.add_argument("--csv", action="store_true", help="escribir CSV aunque la extensión no sea .csv")
+    gen.add_argument("--salida", required=True)
+    res = sub.add_parser("resumir", help="resumir un archivo leyéndolo de a bloques")
+    res.add_argument("archivo")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.comando == "generar":
+            _generar(args, parser)
+        else:
+            _resumir(args)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# Grabación compacta de partidas con keyframes para poder saltar a cualquier turno.
+#
+# Formato (binario, se escribe solo agregando al final, little-endian):
+#
+#   cabecera:  b"RPLY", versión (B), filas (I), columnas (I), semilla (q, -1 si no hay),
+#              intervalo entre keyframes (I)
+#   registros: uno detrás de otro, cada uno empieza con un byte de tipo
+#     b"K"  keyframe: turno (Q), fila1, col1, fila2, col2 (4 x i), largo (I),
+#           grilla de direcciones comprimida con zlib (largo 0 en el keyframe
+#           inicial si hay semilla: la grilla sale de Tablero.desde_semilla)
+#     b"E"  eventos: cantidad (I) y los eventos empaquetados de a 4 por byte,
+#           2 bits cada uno: bit 0 = jugador que movió (0 = el que empieza), bit 1 = salió
+#
+# Como cada movimiento se deduce del estado del tablero, los eventos alcanzan
+# para reconstruir la partida; los keyframes (cada `intervalo` turnos) solo
+# sirven para no tener que re-simular desde el principio al buscar un turno.
+# El intervalo crece con el tablero (una grilla de 1000x1000 comprimida pesa
+# ~300 KB) para que el costo por turno se mantenga en unos pocos bytes.
+
+import struct
+import zlib
+from bisect import bisect_right
+
+from logica import Tablero
+
+MAGIA = b"RPLY"
+VERSION = 1
+_CABECERA = struct.Struct("<4sBIIqI")
+_KEYFRAME = struct.Struct("<Q4iI")
+_EVENTOS = struct.Struct("<I")
+INTERVALO = 4096  # turnos entre keyframes como mínimo
+NIVEL_ZLIB = 1    # los niveles altos tardan ~10 veces más y comprimen apenas un 10% mejor
+
+def semilla_guardable(semilla):
+    """True si la semilla entra en la cabecera (q, con -1 reservado para "sin semilla")."""
+    return isinstance(semilla, int) and not isinstance(semilla, bool) and 0 <= semilla < 1 << 63
+
+def intervalo_para(filas, columnas):
+    """Turnos entre keyframes: la grilla comprimida se reparte en ~4 bytes por turno."""
+    return max(INTERVALO, filas * columnas // 16)
+
+class GrabadorPartida:
+    """
+    Graba una partida en `archivo` (abierto en modo binario). Después de cada
+    turno hay que llamar a registrar(); al terminar, a cerrar().
+
+    Si el tablero se creó con Tablero.desde_semilla y todavía no se movió,
+    pasar su `semilla` evita guardar la grilla inicial. Las semillas que no
+    entran en la cabecera (ver semilla_guardable) se ignoran y se guarda la
+    grilla.
+    """
+    def __init__(self, archivo, tablero, pos1, pos2, semilla=None, intervalo=None):
+        if not semilla_guardable(semilla):
+            semilla = None
+        self.archivo = archivo
+        self.tablero = tablero
+        self.intervalo = intervalo or intervalo_para(tablero.filas, tablero.columnas)
+        self.turno = 0
+        self._pendientes = bytearray()  # eventos empaquetados aún no escritos
+        self._en_byte = 0               # eventos ya puestos en el último byte
+        archivo.write(_CABECERA.pack(MAGIA, VERSION, tablero.filas, tablero.columnas,
+                                     -1 if semilla is None else semilla, self.intervalo))
+        self._keyframe(pos1, pos2, semilla is not None)
+
+    def _keyframe(self, pos1, pos2, por_semilla=False):
+        grilla = b"" if por_semilla else zlib.compress(self.tablero.direcciones, NIVEL_ZLIB)
+        self.archivo.write(b"K" + _KEYFRAME.pack(self.turno, pos1[0], pos1[1], pos2[0], pos2[1], len(grilla)))
+        self.archivo.write(grilla)
+
+    def _volcar_eventos(self):
+        if not self._pendientes:
+            return
+        cantidad = (len(self._pendientes) - 1) * 4 + (self._en_byte or 4)
+        self.archivo.write(b"E" + _EVENTOS.pack(cantidad))
+        self.archivo.write(self._pendientes)
+        self._pendientes = bytearray()
+        self._en_byte = 0
+
+    def registrar(self, jugador, salio, pos1, pos2):
+        """Registra el turno recién jugado. pos1/pos2: posiciones después del movimiento."""
+        codigo = jugador | (2 if salio else 0)
+        if self._en_byte == 0:
+            self._pendientes.append(codigo)
+        else:
+            self._pendientes[-1] |= codigo << (2 * self._en_byte)
+        self._en_byte = (self._en_byte + 1) & 3
+        self.turno += 1
+        if self.turno % self.intervalo == 0 and not salio:
+            self._volcar_eventos()
+            self._keyframe(pos1, pos2)
+
+    def cerrar(self):
+        self._volcar_eventos()
+        self.archivo.flush()
+
+class Keyframe:
+    __slots__ = ('turno', 'pos1', 'pos2', 'offset', 'largo')
+
+    def __init__(self, turno, pos1, pos2, offset, largo):
+        self.turno = turno
+        self.pos1 = pos1
+        self.pos2 = pos2
+        self.offset = offset  # posición de la grilla comprimida en el archivo
+        self.largo = largo
+
+class LectorRepeticion:
+    """
+    Lee una repetición desde `archivo` (binario, con seek). Al abrir solo se
+    recorren las cabeceras de los registros para indexar los keyframes; los
+    eventos se leen bajo demanda con eventos().
+    """
+    def __init__(self, archivo):
+        self.archivo = archivo
+        datos = archivo.read(_CABECERA.size)
+        if len(datos) < _CABECERA.size or datos[:4] != MAGIA:
+            raise ValueError("El archivo no es una repetición del Sistema Repulsor.")
+        magia, version, filas, columnas, semilla, intervalo = _CABECERA.unpack(datos)
+        if version != VERSION:
+            raise ValueError(f"Versión de repetición no soportada: {version}.")
+        self.filas = filas
+        self.columnas = columnas
+        self.semilla = None if semilla == -1 else semilla
+        self.intervalo = intervalo
+        self.keyframes = []
+        self._turnos_keyframes = []  # para buscar con bisect
+        self._bloques = []  # (turno_inicial, cantidad, offset) de cada registro de eventos
+        self.total_turnos = 0
+        try:
+            self._indexar()
+        except struct.error:
+            raise ValueError("La repetición está incompleta.") from None
+
+    def _indexar(self):
+        f = self.archivo
+        while True:
+            tipo = f.read(1)
+            if not tipo:
+                break
+            if tipo == b"K":
+                turno, f1, c1, f2, c2, largo = _KEYFRAME.unpack(f.read(_KEYFRAME.size))
+                self.keyframes.append(Keyframe(turno, (f1, c1), (f2, c2), f.tell(), largo))
+                self._turnos_keyframes.append(turno)
+                f.seek(largo, 1)
+            elif tipo == b"E":
+                (cantidad,) = _EVENTOS.unpack(f.read(_EVENTOS.size))
+                self._bloques.append((self.total_turnos, cantidad, f.tell()))
+                self.total_turnos += cantidad
+                f.seek((cantidad + 3) // 4, 1)
+            else:
+                raise ValueError("Registro desconocido en la repetición.")
+        if not self.keyframes:
+            raise ValueError("La repetición no tiene estado inicial.")
+
+    def eventos(self, desde=0):
+        """Genera (turno, jugador, salio) desde el turno `desde`, leyendo de a un bloque."""
+        for inicio, cantidad, offset in self._bloques:
+            if inicio + cantidad <= desde:
+                continue
+            self.archivo.seek(offset)
+            datos = self.archivo.read((cantidad + 3) // 4)
+            for n in range(max(0, desde - inicio), cantidad):
+                codigo = (datos[n >> 2] >> (2 * (n & 3))) & 3
+                yield inicio + n + 1, codigo & 1, bool(codigo & 2)
+
+    def estado_en(self, turno):
+        """
+        Devuelve (tablero, pos1, pos2) tal como quedaron después de `turno`
+        movimientos: parte del keyframe anterior y re-simula a lo sumo
+        `intervalo` turnos. pos es None para el jugador que ya salió.
+        """
+        if not 0 <= turno <= self.total_turnos:
+            raise ValueError(f"El turno debe estar entre 0 y {self.total_turnos}.")
+        kf = self.keyframes[bisect_right(self._turnos_keyframes, turno) - 1]  # el primero es el del turno 0
+        if kf.largo == 0:
+            tablero = Tablero.desde_semilla(self.filas, self.columnas, self.semilla)
+        else:
+            self.archivo.seek(kf.offset)
+            tablero = Tablero(self.filas, self.columnas, zlib.decompress(self.archivo.read(kf.largo)))
+        posiciones = [kf.pos1, kf.pos2]
+        for t in range(kf.turno, turno):
+            jug = t & 1
+            nueva, _ = tablero.mover_desde(posiciones[jug])
+            posiciones[jug] = nueva
+        return tablero, posiciones[0], posiciones[1]
@@ -1,66 +1,19 @@
 # Requisitos: Python 3 (tkinter incluido)
 
+import io
 import random
+from array import array
+import time
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox, simpledialog
 
-# -------------------------------
-# Lógica del juego (POO)
-# -------------------------------
-class Casilla:
-    SIMBOLOS = ['^', '>', 'v', '<']  # 0=arriba,1=derecha,2=abajo,3=izquierda
-
-    def __init__(self, direccion=None):
-        self.direccion = direccion if direccion is not None else random.randint(0, 3)
-
-    def rotar(self):
-        self.direccion = (self.direccion + 1) % 4
-
-    def obtener_simbolo(self):
-        return Casilla.SIMBOLOS[self.direccion]
-
-class Tablero:
-    DELTAS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # ↑ → ↓ ←
-
-    def __init__(self, filas, columnas):
-        self.filas = filas
-        self.columnas = columnas
-        self.casillas = [[Casilla() for _ in range(columnas)] for _ in range(filas)]
-
-    def mover_desde(self, pos):
-        """
-        Rota la casilla en pos y devuelve (nueva_pos, pos_rotada).
-        Si el movimiento sale del tablero, devuelve (None, pos_rotada).
-        """
-        i, j = pos
-        casilla = self.casillas[i][j]
-        di, dj = Tablero.DELTAS[casilla.direccion]
-        casilla.rotar()
-        nueva = (i + di, j + dj)
-        if not self.dentro_de_limites(nueva):
-            return None, (i, j)
-        return nueva, (i, j)
-
-    def dentro_de_limites(self, pos):
-        i, j = pos
-        return 0 <= i < self.filas and 0 <= j < self.columnas
-
-class Jugador:
-    def __init__(self, nombre):
-        self.nombre = nombre
-        self.posicion = None
-        self.pasos = 0
-        self.visitadas = set()  # casillas por las que pasó (para color permanente)
-
-    def mover(self, tablero):
-        nueva_pos, pos_rotada = tablero.mover_desde(self.posicion)
-        # marcar la casilla rotada como visitada (aunque salga)
-        self.visitadas.add(pos_rotada)
-        if nueva_pos is None:
-            return False, pos_rotada
-        self.posicion = nueva_pos
-        self.pasos += 1
-        return True, pos_rotada
+from logica import Casilla, Tablero, Jugador
+from analisis import analizar
+from repeticion import GrabadorPartida, LectorRepeticion
+from instrumentacion import metricas_del_entorno, notificar
+from compartido import TableroCompartido
+from consola import ocupadas
+from vista_tablero import VistaTablero
 
 # -------------------------------
 # Utilidades GUI
@@ -73,53 +26,173 @@ def centrar_ventana(ventana, ancho, alto):
     y = int((pantalla_alto / 2) - (alto / 2))
     ventana.geometry(f"{ancho}x{alto}+{x}+{y}")
 
-def destruir_y_abrir(prev_window, new_window_creator):
-    """Destruye la ventana anterior (si existe) y crea la nueva ventana usando new_window_creator()."""
-    if prev_window is not None:
-        try:
-            prev_window.destroy()
-        except:
-            pass
-    return new_window_creator()
+class Aplicacion:
+    """
+    Única ventana raíz de la aplicación. Cada pantalla (MenuWindow, NameWindow1,
+    GameWindow, ...) es un Frame que se construye la primera vez que se muestra
+    y se intercambia con pack/pack_forget, sin crear un tk.Tk() nuevo por paso.
+
+    Las pantallas con `reutilizable = True` no reciben argumentos y se guardan
+    para volver a mostrarlas (llamando a su al_mostrar(), si existe); el resto
+    se destruye al salir de ellas (después de llamar a su al_ocultar()).
+    """
+    def __init__(self):
+        self.root = tk.Tk()
+        self.actual = None
+        self.pantallas = {}  # pantallas reutilizables ya construidas
+        # observadores de todas las partidas de la sesión (ver instrumentacion.py)
+        self.observadores = []
+        self.metricas = metricas_del_entorno()
+        if self.metricas is not None:
+            self.observadores.append(self.metricas)
+
+    def mostrar(self, clase, *args):
+        anterior = self.actual
+        if anterior is not None:
+            anterior.win.pack_forget()
+            if hasattr(anterior, "al_ocultar"):
+                anterior.al_ocultar()
+            if not getattr(anterior, "reutilizable", False):
+                anterior.win.destroy()
+        # los atajos de teclado son de la raíz: cada pantalla pone los suyos
+        self.root.unbind("<Return>")
+
+        pantalla = self.pantallas.get(clase)
+        if pantalla is None:
+            pantalla = clase(self, *args)
+            if getattr(pantalla, "reutilizable", False):
+                self.pantallas[clase] = pantalla
+        elif hasattr(pantalla, "al_mostrar"):
+            pantalla.al_mostrar()
+
+        self.root.title(pantalla.titulo)
+        centrar_ventana(self.root, *pantalla.tamanio)
+        pantalla.win.pack(fill="both", expand=True)
+        self.actual = pantalla
+        return pantalla
+
+    def iniciar(self):
+        self.mostrar(MenuWindow)
+        self.root.mainloop()
+        if self.metricas is not None:
+            self.metricas.informar()
+
+def color_probabilidad(p):
+    """Rojo (0) -> amarillo (0.5) -> verde (1)."""
+    if p < 0.5:
+        r, g = 255, int(510 * p)
+    else:
+        r, g = int(510 * (1 - p)), 255
+    return f"#{r:02x}{g:02x}60"
+
+def mostrar_mapa_probabilidades(parent, matriz, titulo):
+    """Abre una ventana con la matriz de probabilidades (None = casilla no disponible)."""
+    top = tk.Toplevel(parent)
+    top.title(titulo)
+    tk.Label(top, text=titulo, font=("Arial", 11, "bold")).pack(pady=6)
+    frame = tk.Frame(top)
+    frame.pack(padx=10, pady=6)
+    for i, fila in enumerate(matriz):
+        tk.Label(frame, text=str(i), width=3).grid(row=i + 1, column=0)
+        for j, p in enumerate(fila):
+            if i == 0:
+                tk.Label(frame, text=str(j), width=5).grid(row=0, column=j + 1)
+            if p is None:
+                lbl = tk.Label(frame, text="--", width=5, relief="ridge", bg="gray")
+            else:
+                lbl = tk.Label(frame, text=f"{p * 100:.0f}%", width=5, relief="ridge", bg=color_probabilidad(p))
+            lbl.grid(row=i + 1, column=j + 1, padx=1, pady=1)
+    tk.Button(top, text="Cerrar", command=top.destroy).pack(pady=6)
 
 # Colores
 COLOR_J1 = "#FFA500"  # naranja
 COLOR_J2 = "#87CEFA"  # azul claro
 CELL_BG_DEFAULT = "white"
 
+# Juego automático: turnos por segundo de cada velocidad (None = lo más rápido posible)
+VELOCIDADES = {
+    "1 turno/s": 1,
+    "5 turnos/s": 5,
+    "50 turnos/s": 50,
+    "1000 turnos/s": 1000,
+    "Máxima": None,
+}
+FRAME_MS = 33             # ~30 cuadros por segundo como máximo
+PRESUPUESTO_FRAME = 0.02  # segundos de lógica por cuadro a velocidad máxima
+LIMITE_ANIMACION = 5      # por encima de estos turnos/s no se hace el parpadeo
+REFRESCO_COMPARTIDO_MS = 100  # cada cuánto el visor mira si hubo una publicación nueva
+
 # -------------------------------
 # Ventanas separadas
 # -------------------------------
 class MenuWindow:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Repulsor - Menú")
-        centrar_ventana(self.root, 420, 260)
+    reutilizable = True
+
+    def __init__(self, app):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Repulsor - Menú"
+        self.tamanio = (420, 340)
 
-        lbl = tk.Label(self.root, text="SISTEMA DINÁMICO REPULSOR", font=("Arial", 14, "bold"))
+        lbl = tk.Label(self.win, text="SISTEMA DINÁMICO REPULSOR", font=("Arial", 14, "bold"))
         lbl.pack(pady=12)
 
-        btn_inicio = tk.Button(self.root, text="Iniciar juego", width=22, command=self.abrir_nombre1)
-        btn_explic = tk.Button(self.root, text="Ver explicación", width=22, command=self.abrir_explicacion)
-        btn_cerrar = tk.Button(self.root, text="Cerrar aplicación", width=22, command=self.root.destroy)
+        btn_inicio = tk.Button(self.win, text="Iniciar juego", width=22, command=self.abrir_nombre1)
+        btn_explic = tk.Button(self.win, text="Ver explicación", width=22, command=self.abrir_explicacion)
+        btn_repet = tk.Button(self.win, text="Ver repetición", width=22, command=self.abrir_repeticion)
+        btn_compartido = tk.Button(self.win, text="Ver simulación compartida", width=22, command=self.abrir_compartido)
+        btn_cerrar = tk.Button(self.win, text="Cerrar aplicación", width=22, command=self.app.root.destroy)
 
         btn_inicio.pack(pady=6)
         btn_explic.pack(pady=6)
+        btn_repet.pack(pady=6)
+        btn_compartido.pack(pady=6)
         btn_cerrar.pack(pady=6)
 
-        self.root.mainloop()
-
     def abrir_explicacion(self):
-        destruir_y_abrir(self.root, ExplanationWindow)
+        self.app.mostrar(ExplanationWindow)
 
     def abrir_nombre1(self):
-        destruir_y_abrir(self.root, NameWindow1)
+        self.app.mostrar(NameWindow1)
+
+    def abrir_repeticion(self):
+        ruta = filedialog.askopenfilename(title="Abrir repetición", filetypes=[("Repeticiones", "*.rpl"), ("Todos", "*")])
+        if not ruta:
+            return
+        try:
+            archivo = open(ruta, "rb")
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo abrir la repetición:\n{e}")
+            return
+        try:
+            lector = LectorRepeticion(archivo)
+        except ValueError as e:
+            archivo.close()
+            messagebox.showerror("Error", f"No se pudo abrir la repetición:\n{e}")
+            return
+        self.app.mostrar(ReplayWindow, lector)
+
+    def abrir_compartido(self):
+        nombre = simpledialog.askstring("Simulación compartida",
+                                        "Nombre del tablero (lo muestra «python compartido.py simular»):",
+                                        parent=self.app.root)
+        if not nombre:
+            return
+        try:
+            compartido = TableroCompartido.abrir(nombre.strip())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"No se pudo abrir el tablero compartido:\n{e}")
+            return
+        self.app.mostrar(VisorCompartido, compartido)
 
 class ExplanationWindow:
-    def __init__(self):
-        self.win = tk.Tk()
-        self.win.title("Explicación - Repulsor")
-        centrar_ventana(self.win, 640, 420)
+    reutilizable = True
+
+    def __init__(self, app):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Explicación - Repulsor"
+        self.tamanio = (640, 420)
 
         txt = (
             "Reglas del Sistema Dinámico Repulsor:\n\n"
@@ -136,16 +209,17 @@ class ExplanationWindow:
         lbl = tk.Label(self.win, text=txt, justify="left", padx=12, pady=12)
         lbl.pack(fill="both", expand=True)
 
-        btn_volver = tk.Button(self.win, text="Volver al menú", command=lambda: destruir_y_abrir(self.win, MenuWindow))
+        btn_volver = tk.Button(self.win, text="Volver al menú", command=lambda: self.app.mostrar(MenuWindow))
         btn_volver.pack(pady=10)
 
-        self.win.mainloop()
-
 class NameWindow1:
-    def __init__(self):
-        self.win = tk.Tk()
-        self.win.title("Jugador 1 - Ingresar nombre")
-        centrar_ventana(self.win, 420, 180)
+    reutilizable = True
+
+    def __init__(self, app):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Jugador 1 - Ingresar nombre"
+        self.tamanio = (420, 180)
 
         tk.Label(self.win, text="Ingrese el nombre del Jugador 1:", font=("Arial", 11)).pack(pady=8)
         self.entry = tk.Entry(self.win)
@@ -154,26 +228,29 @@ class NameWindow1:
         btn = tk.Button(self.win, text="Siguiente", command=self.siguiente)
         btn.pack(pady=8)
 
-        btn_volver = tk.Button(self.win, text="Cancelar y volver al menú", command=lambda: destruir_y_abrir(self.win, MenuWindow))
+        btn_volver = tk.Button(self.win, text="Cancelar y volver al menú", command=lambda: self.app.mostrar(MenuWindow))
         btn_volver.pack(pady=6)
 
         self.entry.bind("<Return>", lambda event: self.siguiente())
 
-        self.win.mainloop()
+    def al_mostrar(self):
+        # la pantalla se reutiliza: empezar con el campo vacío
+        self.entry.delete(0, tk.END)
 
     def siguiente(self):
         nombre = self.entry.get().strip()
         if not nombre:
             messagebox.showwarning("Error", "Ingrese un nombre válido.")
             return
-        destruir_y_abrir(self.win, lambda: NameWindow2(nombre))
+        self.app.mostrar(NameWindow2, nombre)
 
 class NameWindow2:
-    def __init__(self, nombre1):
+    def __init__(self, app, nombre1):
         self.nombre1 = nombre1
-        self.win = tk.Tk()
-        self.win.title("Jugador 2 - Ingresar nombre")
-        centrar_ventana(self.win, 420, 180)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Jugador 2 - Ingresar nombre"
+        self.tamanio = (420, 180)
 
         tk.Label(self.win, text="Ingrese el nombre del Jugador 2:", font=("Arial", 11)).pack(pady=8)
         self.entry = tk.Entry(self.win)
@@ -182,29 +259,28 @@ class NameWindow2:
         btn = tk.Button(self.win, text="Siguiente", command=self.siguiente)
         btn.pack(pady=8)
 
-        btn_volver = tk.Button(self.win, text="Volver atrás", command=lambda: destruir_y_abrir(self.win, NameWindow1))
+        btn_volver = tk.Button(self.win, text="Volver atrás", command=lambda: self.app.mostrar(NameWindow1))
         btn_volver.pack(pady=6)
 
         self.entry.bind("<Return>", lambda event: self.siguiente())
 
-        self.win.mainloop()
-
     def siguiente(self):
         nombre2 = self.entry.get().strip()
         if not nombre2:
             messagebox.showwarning("Error", "Ingrese un nombre válido.")
             return
-        destruir_y_abrir(self.win, lambda: MiniGame1Window(self.nombre1, nombre2))
+        self.app.mostrar(MiniGame1Window, self.nombre1, nombre2)
 
 class MiniGame1Window:
     """Mini-juego 1: decidir quién elige el tablero (8x8 o 10x10).
        Después de mostrar ganador, espera ENTER para permitir elegir tamaño."""
-    def __init__(self, name1, name2):
+    def __init__(self, app, name1, name2):
         self.name1 = name1
         self.name2 = name2
-        self.win = tk.Tk()
-        self.win.title("Mini-juego 1 - Elegir tablero")
-        centrar_ventana(self.win, 560, 380)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Mini-juego 1 - Elegir tablero"
+        self.tamanio = (560, 380)
 
         tk.Label(self.win, text="Mini-juego 1: Elegir tablero", font=("Arial", 12, "bold")).pack(pady=8)
 
@@ -226,7 +302,6 @@ class MiniGame1Window:
         self.result_label.pack(pady=6)
 
         # no back button here
-        self.win.mainloop()
 
     def jugar(self):
         n1 = self.num1_var.get().strip()
@@ -263,40 +338,42 @@ class MiniGame1Window:
         # bind Enter to proceed to board selection, ensure only once
         def proceed(event=None):
             # unbind to avoid doble llamadas
-            self.win.unbind("<Return>")
-            destruir_y_abrir(self.win, lambda: BoardSelectionWindow(self.name1, self.name2, ganador_nombre))
-        self.win.bind("<Return>", proceed)
+            self.app.root.unbind("<Return>")
+            self.app.mostrar(BoardSelectionWindow, self.name1, self.name2, ganador_nombre)
+        self.app.root.bind("<Return>", proceed)
 
 class BoardSelectionWindow:
     """Después de mini1 y presionar Enter, elegir entre 8x8 y 10x10."""
-    def __init__(self, name1, name2, ganador_tablero):
+    def __init__(self, app, name1, name2, ganador_tablero):
         self.name1 = name1
         self.name2 = name2
         self.ganador_tablero = ganador_tablero
 
-        self.win = tk.Tk()
-        self.win.title("Seleccionar tamaño de tablero")
-        centrar_ventana(self.win, 420, 200)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Seleccionar tamaño de tablero"
+        self.tamanio = (420, 200)
 
         tk.Label(self.win, text=f"{ganador_tablero} - elegí el tamaño del tablero", font=("Arial", 12)).pack(pady=10)
 
-        btn8 = tk.Button(self.win, text="8 x 8", width=12, command=lambda: destruir_y_abrir(self.win, lambda: MiniGame2Window(self.name1, self.name2, 8, 8, self.ganador_tablero)))
-        btn10 = tk.Button(self.win, text="10 x 10", width=12, command=lambda: destruir_y_abrir(self.win, lambda: MiniGame2Window(self.name1, self.name2, 10, 10, self.ganador_tablero)))
+        btn8 = tk.Button(self.win, text="8 x 8", width=12, command=lambda: self.app.mostrar(MiniGame2Window, self.name1, self.name2, 8, 8, self.ganador_tablero))
+        btn10 = tk.Button(self.win, text="10 x 10", width=12, command=lambda: self.app.mostrar(MiniGame2Window, self.name1, self.name2, 10, 10, self.ganador_tablero))
         btn8.pack(pady=6)
         btn10.pack(pady=6)
 
 class MiniGame2Window:
     """Mini-juego 2: decidir quién empieza; espera ENTER para continuar a elección de posiciones."""
-    def __init__(self, name1, name2, filas_tab, cols_tab, ganador_tablero_nombre):
+    def __init__(self, app, name1, name2, filas_tab, cols_tab, ganador_tablero_nombre):
         self.name1 = name1
         self.name2 = name2
         self.filas_tab = filas_tab
         self.cols_tab = cols_tab
         self.ganador_tablero_nombre = ganador_tablero_nombre
 
-        self.win = tk.Tk()
-        self.win.title("Mini-juego 2 - Quién empieza")
-        centrar_ventana(self.win, 580, 460)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Mini-juego 2 - Quién empieza"
+        self.tamanio = (580, 460)
 
         tk.Label(self.win, text="Mini-juego 2: Decidir quién empieza", font=("Arial", 12, "bold")).pack(pady=8)
 
@@ -318,7 +395,6 @@ class MiniGame2Window:
         self.result_label.pack(pady=6)
 
         # no back button here
-        self.win.mainloop()
 
     def jugar(self):
         n1 = self.num1_var.get().strip()
@@ -354,23 +430,28 @@ class MiniGame2Window:
 
         # bind Enter to proceed to winner choose pos (only once)
         def proceed(event=None):
-            self.win.unbind("<Return>")
-            destruir_y_abrir(self.win, lambda: WinnerChoosePosWindow(self.name1, self.name2, self.filas_tab, self.cols_tab, ganador_nombre, self.ganador_tablero_nombre))
-        self.win.bind("<Return>", proceed)
+            self.app.root.unbind("<Return>")
+            self.app.mostrar(WinnerChoosePosWindow, self.name1, self.name2, self.filas_tab, self.cols_tab, ganador_nombre, self.ganador_tablero_nombre)
+        self.app.root.bind("<Return>", proceed)
 
 class WinnerChoosePosWindow:
     """Ventana donde el ganador del mini-juego 2 elige su posición primero."""
-    def __init__(self, name1, name2, filas_tab, cols_tab, ganador_nombre, ganador_tablero_nombre):
+    def __init__(self, app, name1, name2, filas_tab, cols_tab, ganador_nombre, ganador_tablero_nombre):
         self.name1 = name1
         self.name2 = name2
         self.filas_tab = filas_tab
         self.cols_tab = cols_tab
         self.ganador_nombre = ganador_nombre
         self.ganador_tablero_nombre = ganador_tablero_nombre
+        # el tablero se sortea antes de elegir posiciones para poder analizarlo;
+        # con la semilla alcanza para reproducirlo (la repetición no guarda la grilla)
+        self.tablero = Tablero.desde_semilla(filas_tab, cols_tab, random.getrandbits(32))
+        self.tabla = None
 
-        self.win = tk.Tk()
-        self.win.title(f"{ganador_nombre} - Elegir posición inicial")
-        centrar_ventana(self.win, 520, 260)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = f"{ganador_nombre} - Elegir posición inicial"
+        self.tamanio = (520, 260)
 
         tk.Label(self.win, text=f"{ganador_nombre}, elegí tu posición (fila y columna, 0-index)", font=("Arial", 11)).pack(pady=8)
 
@@ -387,11 +468,17 @@ class WinnerChoosePosWindow:
 
         btn_confirm = tk.Button(self.win, text="Confirmar posición (Enter)", command=self.confirmar)
         btn_confirm.pack(pady=8)
+        btn_mapa = tk.Button(self.win, text="Ver probabilidad de ganar por casilla", command=self.ver_mapa)
+        btn_mapa.pack(pady=4)
 
         e1.bind("<Return>", lambda ev: self.confirmar())
         e2.bind("<Return>", lambda ev: self.confirmar())
 
-        self.win.mainloop()
+    def ver_mapa(self):
+        if self.tabla is None:
+            self.tabla = analizar(self.tablero)
+        mostrar_mapa_probabilidades(self.win, self.tabla.probabilidad_inicio(),
+                                    f"{self.ganador_nombre}: % de posiciones rivales a las que le gana")
 
     def confirmar(self):
         try:
@@ -404,25 +491,28 @@ class WinnerChoosePosWindow:
             return
         jugador_inicio = Jugador(self.ganador_nombre)
         jugador_inicio.posicion = (f, c)
-        destruir_y_abrir(self.win, lambda: OtherChoosePosWindow(self.name1, self.name2, self.filas_tab, self.cols_tab, jugador_inicio, self.ganador_tablero_nombre))
+        self.app.mostrar(OtherChoosePosWindow, self.name1, self.name2, self.filas_tab, self.cols_tab, jugador_inicio, self.ganador_tablero_nombre, self.tablero, self.tabla)
 
 class OtherChoosePosWindow:
     """Ventana para que el otro jugador elija su posición (evitar solapamiento)."""
-    def __init__(self, name1, name2, filas_tab, cols_tab, jugador_inicio, ganador_tablero_nombre):
+    def __init__(self, app, name1, name2, filas_tab, cols_tab, jugador_inicio, ganador_tablero_nombre, tablero=None, tabla=None):
         self.name1 = name1
         self.name2 = name2
         self.filas_tab = filas_tab
         self.cols_tab = cols_tab
         self.jugador_inicio = jugador_inicio
         self.ganador_tablero_nombre = ganador_tablero_nombre
+        self.tablero = tablero if tablero is not None else Tablero(filas_tab, cols_tab)
+        self.tabla = tabla
 
         # determinar el otro jugador
         otro_nombre = self.name2 if self.jugador_inicio.nombre == self.name1 else self.name1
         self.otro_nombre = otro_nombre
 
-        self.win = tk.Tk()
-        self.win.title(f"{otro_nombre} - Elegir posición inicial")
-        centrar_ventana(self.win, 520, 260)
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = f"{otro_nombre} - Elegir posición inicial"
+        self.tamanio = (520, 260)
 
         tk.Label(self.win, text=f"{otro_nombre}, elegí tu posición (fila y columna, 0-index)", font=("Arial", 11)).pack(pady=8)
 
@@ -439,11 +529,17 @@ class OtherChoosePosWindow:
 
         btn_confirm = tk.Button(self.win, text="Confirmar posición (Enter)", command=self.confirmar)
         btn_confirm.pack(pady=8)
+        btn_mapa = tk.Button(self.win, text="Ver probabilidad de ganar por casilla", command=self.ver_mapa)
+        btn_mapa.pack(pady=4)
 
         e1.bind("<Return>", lambda ev: self.confirmar())
         e2.bind("<Return>", lambda ev: self.confirmar())
 
-        self.win.mainloop()
+    def ver_mapa(self):
+        if self.tabla is None:
+            self.tabla = analizar(self.tablero)
+        mostrar_mapa_probabilidades(self.win, self.tabla.respuestas(self.jugador_inicio.posicion),
+                                    f"{self.otro_nombre}: casillas desde las que gana (100%) o pierde (0%)")
 
     def confirmar(self):
         try:
@@ -460,16 +556,25 @@ class OtherChoosePosWindow:
             return
         otro_jugador = Jugador(self.otro_nombre)
         otro_jugador.posicion = (f, c)
-        destruir_y_abrir(self.win, lambda: GameWindow(self.jugador_inicio, otro_jugador, self.filas_tab, self.cols_tab))
+        self.app.mostrar(GameWindow, self.jugador_inicio, otro_jugador, self.filas_tab, self.cols_tab, self.tablero)
 
 class GameWindow:
-    """Ventana donde se muestra el tablero y se juega paso a paso."""
-    def __init__(self, jugador_inicio, otro_jugador, filas, cols):
-        self.win = tk.Tk()
-        self.win.title("Juego - Sistema Dinámico Repulsor")
-        centrar_ventana(self.win, 920, 700)
-
-        self.tablero = Tablero(filas, cols)
+    """
+    Ventana donde se muestra el tablero y se juega paso a paso.
+
+    Es de dos jugadores, como toda la secuencia de pantallas que lleva hasta
+    acá (nombres, mini-juegos, elección de posiciones con el mapa de
+    analisis), la grabación (repeticion.py) y deshacer/rehacer. Las partidas
+    de N jugadores (motor.PartidaMultiple) se juegan en la versión de consola
+    y se pueden mirar con VisorCompartido.
+    """
+    def __init__(self, app, jugador_inicio, otro_jugador, filas, cols, tablero=None):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Juego - Sistema Dinámico Repulsor"
+        self.tamanio = (920, 700)
+
+        self.tablero = tablero if tablero is not None else Tablero(filas, cols)
         # mantener jugadores en orden; jugador_inicio comienza
         self.jugador1 = jugador_inicio  # inicia el que ganó mini-juego 2
         self.jugador2 = otro_jugador
@@ -483,25 +588,29 @@ class GameWindow:
         self.lbl_info = tk.Label(info_frame, text=f"{self.jugador1.nombre} (naranja)  vs  {self.jugador2.nombre} (azul)", font=("Arial", 11))
         self.lbl_info.grid(row=0, column=1, padx=10)
 
-        # Frame tablero visual
-        self.frame_tab = tk.Frame(self.win)
-        self.frame_tab.pack(pady=6)
-
-        # crear widgets de celdas
-        self.cell_widgets = [[None for _ in range(cols)] for _ in range(filas)]
-        self.cell_bg = {}  # bg por celda (permanece)
-        for i in range(filas):
-            for j in range(cols):
-                simbol = self.tablero.casillas[i][j].obtener_simbolo()
-                lbl = tk.Label(self.frame_tab, text=simbol, width=4, height=2, relief="ridge", font=("Consolas", 14), bg=CELL_BG_DEFAULT)
-                lbl.grid(row=i, column=j, padx=1, pady=1)
-                self.cell_widgets[i][j] = lbl
-                self.cell_bg[(i,j)] = CELL_BG_DEFAULT
-
-        # aplicar color a posiciones iniciales y marcar visitadas
-        self.jugador1.visitadas.add(self.jugador1.posicion)
-        self.jugador2.visitadas.add(self.jugador2.posicion)
-        self.actualizar_tablero_visual()
+        # Tablero visual: un único Canvas que solo dibuja las casillas visibles
+        self.cell_bg = {}  # bg permanente por celda (solo las que se colorearon)
+        self.sucias = set()  # celdas que cambiaron desde el último refresco
+        self.vista = VistaTablero(self.win, filas, cols, self.estado_casilla)
+        self.vista.pack(fill="both", expand=True, padx=6, pady=6)
+
+        # aplicar color a posiciones iniciales y marcar visitadas (un bit por casilla)
+        self.jugador1.preparar(self.tablero)
+        self.jugador2.preparar(self.tablero)
+        self.vista.centrar_en(self.jugador1.posicion)
+
+        # grabación de la partida en memoria (se puede guardar al terminar)
+        self.grabacion = io.BytesIO()
+        self.grabador = GrabadorPartida(self.grabacion, self.tablero, self.jugador1.posicion, self.jugador2.posicion,
+                                        semilla=self.tablero.semilla)
+
+        # deshacer/rehacer: por turno solo se guarda la casilla que dejó el
+        # jugador (índice plano * 2 + 1 si era la primera vez que la dejaba);
+        # el movimiento se revierte con Jugador.deshacer, sin copiar el tablero
+        self.historial = array('q')
+        self.rehacibles = 0  # turnos deshechos que se pueden volver a jugar
+        self.observadores = app.observadores
+        self.actualizar_tablero_visual(completo=True)
 
         # Botones
         btn_frame = tk.Frame(self.win)
@@ -510,106 +619,521 @@ class GameWindow:
         self.btn_avanzar.grid(row=0, column=0, padx=6)
         btn_reiniciar = tk.Button(btn_frame, text="Volver al menú", command=self.volver_al_menu_confirm)
         btn_reiniciar.grid(row=0, column=1, padx=6)
-        btn_salir = tk.Button(btn_frame, text="Salir", command=self.win.destroy)
+        btn_salir = tk.Button(btn_frame, text="Salir", command=self.app.root.destroy)
         btn_salir.grid(row=0, column=2, padx=6)
 
+        # Juego automático: varios turnos por cuadro con after(), sin bloquear la ventana
+        self.btn_auto = tk.Button(btn_frame, text="Auto ▶", width=8, command=self.alternar_auto)
+        self.btn_auto.grid(row=1, column=0, padx=6, pady=4)
+        self.velocidad_var = tk.StringVar(value="5 turnos/s")
+        tk.OptionMenu(btn_frame, self.velocidad_var, *VELOCIDADES).grid(row=1, column=1, padx=6, pady=4)
+        self.btn_deshacer = tk.Button(btn_frame, text="↶ Deshacer", command=self.deshacer_turno)
+        self.btn_deshacer.grid(row=1, column=2, padx=6, pady=4)
+        self.btn_rehacer = tk.Button(btn_frame, text="Rehacer ↷", command=self.rehacer_turno)
+        self.btn_rehacer.grid(row=1, column=3, padx=6, pady=4)
+        self.auto_activo = False
+        self.terminada = False
+        self.activa = True  # False cuando la aplicación pasa a otra pantalla
+        self.actualizar_botones_historial()
+
         # Bind Enter to avanzar_turno
-        self.win.bind("<Return>", lambda event: self.avanzar_turno())
+        self.app.root.bind("<Return>", lambda event: self.avanzar_turno())
+        self.app.root.bind("<Control-z>", lambda event: self.deshacer_turno())
+        self.app.root.bind("<Control-y>", lambda event: self.rehacer_turno())
 
         # Area final (aparece al terminar)
         self.final_frame = tk.Frame(self.win)
         self.final_label = tk.Label(self.final_frame, text="", font=("Arial", 12, "bold"))
-        self.btn_final_menu = tk.Button(self.final_frame, text="Volver al menú", command=lambda: destruir_y_abrir(self.win, MenuWindow))
-        self.btn_final_quit = tk.Button(self.final_frame, text="Salir", command=self.win.destroy)
-
-        self.win.mainloop()
-
-    def actualizar_tablero_visual(self):
-        # Actualiza símbolos y marcas de jugadores, y bg permanente por visitadas
-        for i in range(self.tablero.filas):
-            for j in range(self.tablero.columnas):
-                simbolo = self.tablero.casillas[i][j].obtener_simbolo()
-                texto = simbolo
-                if self.jugador1.posicion == (i, j) and self.jugador2.posicion == (i, j):
-                    texto = "X"
-                elif self.jugador1.posicion == (i, j):
-                    texto = "1"
-                elif self.jugador2.posicion == (i, j):
-                    texto = "2"
-                self.cell_widgets[i][j].config(text=texto)
-                # establecer bg según si fue visitada por j1 o j2 (j1 tiene prioridad visual aquí)
-                if (i,j) in self.jugador1.visitadas:
-                    self.cell_widgets[i][j].config(bg=COLOR_J1)
-                    self.cell_bg[(i,j)] = COLOR_J1
-                elif (i,j) in self.jugador2.visitadas:
-                    self.cell_widgets[i][j].config(bg=COLOR_J2)
-                    self.cell_bg[(i,j)] = COLOR_J2
-                else:
-                    self.cell_widgets[i][j].config(bg=self.cell_bg[(i,j)])
+        self.lbl_cobertura = tk.Label(self.final_frame, text="", font=("Arial", 10), justify="left")
+        self.btn_final_menu = tk.Button(self.final_frame, text="Volver al menú", command=lambda: self.app.mostrar(MenuWindow))
+        self.btn_final_guardar = tk.Button(self.final_frame, text="Guardar repetición", command=self.guardar_repeticion)
+        self.btn_final_quit = tk.Button(self.final_frame, text="Salir", command=self.app.root.destroy)
+
+    def al_ocultar(self):
+        self.activa = False
+        self.detener_auto()
+        self.app.root.unbind("<Control-z>")
+        self.app.root.unbind("<Control-y>")
+
+    def despues(self, ms, funcion):
+        """after() que no hace nada si para entonces ya se salió de esta pantalla."""
+        return self.win.after(ms, lambda: self.activa and funcion())
+
+    def actualizar_tablero_visual(self, completo=False):
+        """
+        Refresca en pantalla las celdas marcadas en self.sucias (o todas las
+        visibles si completo=True). Por turno solo cambian la casilla rotada y
+        la nueva posición del jugador, así que no hace falta recorrer el tablero.
+        """
+        obs = self.observadores
+        if obs:
+            notificar(obs, "inicio_dibujo")
+        if completo:
+            self.vista.refrescar_todo()
+        else:
+            for pos in self.sucias:
+                self.vista.refrescar(pos)
+        self.sucias = set()
         self.lbl_turno.config(text=f"Turno: {self.turno_actual.nombre}")
+        if obs:
+            notificar(obs, "fin_dibujo")
+
+    def estado_casilla(self, pos):
+        """Texto y color de fondo de la casilla pos (lo usa la vista al dibujarla)."""
+        if self.jugador1.posicion == pos and self.jugador2.posicion == pos:
+            texto = "X"
+        elif self.jugador1.posicion == pos:
+            texto = "1"
+        elif self.jugador2.posicion == pos:
+            texto = "2"
+        else:
+            texto = Casilla.SIMBOLOS[self.tablero.direccion(pos)]
+        # bg según si fue visitada por j1 o j2 (j1 tiene prioridad visual aquí)
+        if pos in self.jugador1.visitadas:
+            bg = COLOR_J1
+        elif pos in self.jugador2.visitadas:
+            bg = COLOR_J2
+        else:
+            bg = self.cell_bg.get(pos, CELL_BG_DEFAULT)
+        return texto, bg
 
     def destacar_casilla_permanente(self, pos, jugador):
         """Marca permanentemente la casilla pos con el color del jugador."""
-        i,j = pos
-        if jugador == self.jugador1:
-            color = COLOR_J1
-            self.jugador1.visitadas.add(pos)
-        else:
-            color = COLOR_J2
-            self.jugador2.visitadas.add(pos)
-        self.cell_widgets[i][j].config(bg=color)
-        self.cell_bg[(i,j)] = color
+        if pos not in jugador.visitadas:
+            # el turno se deshizo antes de que terminara el parpadeo
+            self.vista.refrescar(pos)
+            return
+        color = COLOR_J1 if jugador == self.jugador1 else COLOR_J2
+        self.vista.pintar_fondo(pos, color)
+        self.cell_bg[pos] = color
+        # en el próximo refresco se vuelve a aplicar la prioridad de colores
+        self.sucias.add(pos)
 
     def destacar_casilla_temp_then_permanente(self, pos, jugador):
         """
         Primero parpadea la casilla (breve), luego la mantiene en color del jugador.
         """
-        i,j = pos
-        widget = self.cell_widgets[i][j]
-        orig = self.cell_bg[(i,j)]
+        orig = self.cell_bg.get(pos, CELL_BG_DEFAULT)
         highlight = COLOR_J1 if jugador == self.jugador1 else COLOR_J2
         try:
-            widget.config(bg=highlight)
-            widget.after(300, lambda: widget.config(bg=orig))
-            widget.after(600, lambda: self.destacar_casilla_permanente(pos, jugador))
+            self.vista.pintar_fondo(pos, highlight)
+            self.despues(300, lambda: self.vista.pintar_fondo(pos, orig))
+            self.despues(600, lambda: self.destacar_casilla_permanente(pos, jugador))
         except:
             self.destacar_casilla_permanente(pos, jugador)
 
-    def avanzar_turno(self):
+    def jugar_turno(self, animar=True):
+        """
+        Mueve al jugador de turno sin redibujar (solo marca las celdas sucias).
+        Devuelve False si el jugador salió del tablero.
+        """
         jugador = self.turno_actual
-        sigue, pos_rotada = jugador.mover(self.tablero)
+        i, j = jugador.posicion
+        primera = jugador.posicion not in jugador.visitadas
+        turno = len(self.historial) + 1
+        obs = self.observadores
+        if obs:
+            indice = 0 if jugador == self.jugador1 else 1
+            notificar(obs, "inicio_turno", turno, indice)
+        sigue, pos_rotada = jugador.mover(self.tablero, turno)
+        self.historial.append((i * self.tablero.columnas + j) * 2 + primera)
+        if self.rehacibles:
+            self.rehacibles -= 1
+        # al rehacer se repiten los mismos turnos: solo se graban los nuevos
+        if len(self.historial) > self.grabador.turno:
+            self.grabador.registrar(0 if jugador == self.jugador1 else 1, not sigue,
+                                    self.jugador1.posicion, self.jugador2.posicion)
+        self.sucias.add(pos_rotada)
+        self.sucias.add(jugador.posicion)
         # resaltar (parpadeo y luego permanente) la casilla rotada con color del jugador
-        if pos_rotada is not None:
+        if animar and pos_rotada is not None:
             self.destacar_casilla_temp_then_permanente(pos_rotada, jugador)
-        if not sigue:
-            ganador = self.jugador1 if jugador == self.jugador2 else self.jugador2
-            # actualizar visual antes de mostrar
-            self.actualizar_tablero_visual()
-            message = f"{jugador.nombre} salió del tablero.\n¡{ganador.nombre} gana!"
-            messagebox.showinfo("Partida finalizada", message)
-            self.mostrar_final(message)
+        if sigue:
+            # alternar turno
+            self.turno_actual = self.jugador1 if self.turno_actual == self.jugador2 else self.jugador2
+        if obs:
+            notificar(obs, "rotacion", turno, indice, pos_rotada)
+            if not sigue:
+                notificar(obs, "salida", turno, indice, pos_rotada)
+            notificar(obs, "fin_turno", turno, indice, sigue)
+        return sigue
+
+    def terminar_partida(self):
+        jugador = self.turno_actual  # el que acaba de salir
+        ganador = self.jugador1 if jugador == self.jugador2 else self.jugador2
+        self.terminada = True
+        self.detener_auto()
+        self.grabador.cerrar()
+        # actualizar visual antes de mostrar
+        self.actualizar_tablero_visual()
+        self.actualizar_botones_historial()
+        message = f"{jugador.nombre} salió del tablero.\n¡{ganador.nombre} gana!"
+        messagebox.showinfo("Partida finalizada", message)
+        self.mostrar_final(message)
+
+    def avanzar_turno(self):
+        if self.terminada:
+            return
+        if not self.jugar_turno():
+            self.terminar_partida()
             return
         # actualizar visual
         self.actualizar_tablero_visual()
-        # alternar turno
-        self.turno_actual = self.jugador1 if self.turno_actual == self.jugador2 else self.jugador2
-        self.lbl_turno.config(text=f"Turno: {self.turno_actual.nombre}")
+        self.actualizar_botones_historial()
+
+    def deshacer_turno(self):
+        """Vuelve atrás el último turno jugado (también el que terminó la partida)."""
+        if not self.historial or self.auto_activo:
+            return
+        k, primera = divmod(self.historial.pop(), 2)
+        pos = divmod(k, self.tablero.columnas)
+        if self.terminada:
+            # al terminar no se alterna el turno: el que salió sigue siendo turno_actual
+            self.terminada = False
+            self.final_frame.pack_forget()
+            self.btn_avanzar.config(state="normal")
+        else:
+            self.turno_actual = self.jugador1 if self.turno_actual == self.jugador2 else self.jugador2
+        jugador = self.turno_actual
+        self.sucias.add(jugador.posicion)
+        jugador.deshacer(self.tablero, pos, primera)
+        if pos not in self.jugador1.visitadas and pos not in self.jugador2.visitadas:
+            self.cell_bg.pop(pos, None)
+        self.sucias.add(pos)
+        self.rehacibles += 1
+        self.actualizar_tablero_visual()
+        self.actualizar_botones_historial()
+
+    def rehacer_turno(self):
+        """El juego es determinista: rehacer es volver a jugar el turno deshecho."""
+        if self.rehacibles and not self.auto_activo:
+            self.avanzar_turno()
+
+    def actualizar_botones_historial(self):
+        libre = not self.auto_activo
+        self.btn_deshacer.config(state="normal" if libre and self.historial else "disabled")
+        self.btn_rehacer.config(state="normal" if libre and self.rehacibles else "disabled")
+
+    def alternar_auto(self):
+        if self.auto_activo:
+            self.detener_auto()
+        elif not self.terminada:
+            self.auto_activo = True
+            self.btn_auto.config(text="Pausa ⏸")
+            self.btn_avanzar.config(state="disabled")
+            self.actualizar_botones_historial()
+            self._auto_ultimo = time.perf_counter()
+            self._auto_acumulado = 0.0
+            self._auto_id = self.win.after(0, self._auto_cuadro)
+
+    def detener_auto(self):
+        if not self.auto_activo:
+            return
+        self.auto_activo = False
+        self.win.after_cancel(self._auto_id)
+        self.btn_auto.config(text="Auto ▶")
+        if not self.terminada:
+            self.btn_avanzar.config(state="normal")
+        self.actualizar_botones_historial()
+
+    def _auto_cuadro(self):
+        """
+        Un cuadro del juego automático: juega los turnos que correspondan a la
+        velocidad elegida (o los que entren en PRESUPUESTO_FRAME a velocidad
+        máxima) y redibuja una sola vez.
+        """
+        velocidad = VELOCIDADES[self.velocidad_var.get()]
+        animar = velocidad is not None and velocidad <= LIMITE_ANIMACION
+        ahora = time.perf_counter()
+        if velocidad is None:
+            limite = ahora + PRESUPUESTO_FRAME
+            terminada = False
+            while not terminada and time.perf_counter() < limite:
+                for _ in range(256):
+                    if not self.jugar_turno(animar=False):
+                        terminada = True
+                        break
+        else:
+            self._auto_acumulado += velocidad * (ahora - self._auto_ultimo)
+            n = int(self._auto_acumulado)
+            self._auto_acumulado -= n
+            terminada = False
+            for _ in range(n):
+                if not self.jugar_turno(animar=animar):
+                    terminada = True
+                    break
+        self._auto_ultimo = ahora
+        if terminada:
+            self.terminar_partida()
+            return
+        self.actualizar_tablero_visual()
+        self._auto_id = self.win.after(FRAME_MS, self._auto_cuadro)
 
     def mostrar_final(self, mensaje):
         # desactivar boton avanzar y mostrar opciones
         self.btn_avanzar.config(state="disabled")
         self.final_label.config(text=mensaje)
         self.final_label.pack(pady=6)
+        self.lbl_cobertura.config(text=self.resumen_cobertura())
+        self.lbl_cobertura.pack(pady=4)
         self.btn_final_menu.pack(side="left", padx=8)
+        self.btn_final_guardar.pack(side="left", padx=8)
         self.btn_final_quit.pack(side="left", padx=8)
         self.final_frame.pack(pady=12)
 
+    def resumen_cobertura(self):
+        """Casillas recorridas por cada jugador y por ambos, a partir de los bitsets."""
+        v1, v2 = self.jugador1.visitadas, self.jugador2.visitadas
+        compartidas = v1.compartidas(v2)
+        total = self.tablero.filas * self.tablero.columnas
+        lineas = [f"{j.nombre}: {len(j.visitadas)} casillas ({j.visitadas.cobertura() * 100:.1f}%) en {j.pasos} pasos"
+                  for j in (self.jugador1, self.jugador2)]
+        lineas.append(f"Recorridas por ambos: {compartidas}  ·  "
+                      f"por alguno: {len(v1) + len(v2) - compartidas} de {total}")
+        return "\n".join(lineas)
+
+    def guardar_repeticion(self):
+        ruta = filedialog.asksaveasfilename(title="Guardar repetición", defaultextension=".rpl",
+                                            filetypes=[("Repeticiones", "*.rpl")])
+        if not ruta:
+            return
+        try:
+            with open(ruta, "wb") as f:
+                f.write(self.grabacion.getvalue())
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar la repetición:\n{e}")
+
     def volver_al_menu_confirm(self):
         if messagebox.askyesno("Confirmar", "¿Volver al menú principal? Se perderá la partida actual."):
-            destruir_y_abrir(self.win, MenuWindow)
+            self.app.mostrar(MenuWindow)
+
+class ReplayWindow:
+    """
+    Reproduce una partida grabada. Avanzar re-juega un turno sobre el tablero;
+    retroceder y la barra de turnos saltan con LectorRepeticion.estado_en, que
+    parte del keyframe más cercano.
+    """
+    def __init__(self, app, lector):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Repetición - Sistema Dinámico Repulsor"
+        self.tamanio = (920, 700)
+
+        self.lector = lector
+        self.turno = 0
+        self.tablero, self.pos1, self.pos2 = lector.estado_en(0)
+
+        self.lbl_turno = tk.Label(self.win, font=("Arial", 12, "bold"))
+        self.lbl_turno.pack(pady=6)
+        self.vista = VistaTablero(self.win, lector.filas, lector.columnas, self.estado_casilla)
+        self.vista.pack(fill="both", expand=True, padx=6, pady=6)
+        self.vista.centrar_en(self.pos1)
+
+        self.escala = tk.Scale(self.win, from_=0, to=lector.total_turnos, orient="horizontal",
+                               showvalue=False, command=lambda v: self.ir_a(int(float(v))))
+        self.escala.pack(fill="x", padx=10)
+
+        btn_frame = tk.Frame(self.win)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame, text="◀", width=4, command=lambda: self.ir_a(self.turno - 1)).grid(row=0, column=0, padx=4)
+        self.btn_auto = tk.Button(btn_frame, text="Reproducir ▶", width=12, command=self.alternar_auto)
+        self.btn_auto.grid(row=0, column=1, padx=4)
+        tk.Button(btn_frame, text="▶", width=4, command=self.avanzar).grid(row=0, column=2, padx=4)
+        self.velocidad_var = tk.StringVar(value="5 turnos/s")
+        tk.OptionMenu(btn_frame, self.velocidad_var, *VELOCIDADES).grid(row=0, column=3, padx=6)
+        tk.Button(btn_frame, text="Volver al menú", command=lambda: self.app.mostrar(MenuWindow)).grid(row=0, column=4, padx=6)
+        self.auto_activo = False
+        self.app.root.bind("<Return>", lambda event: self.avanzar())
+        self.actualizar()
+
+    def al_ocultar(self):
+        self.detener_auto()
+        self.lector.archivo.close()
+
+    def estado_casilla(self, pos):
+        if pos == self.pos1 and pos == self.pos2:
+            return "X", COLOR_J1
+        if pos == self.pos1:
+            return "1", COLOR_J1
+        if pos == self.pos2:
+            return "2", COLOR_J2
+        return Casilla.SIMBOLOS[self.tablero.direccion(pos)], CELL_BG_DEFAULT
+
+    def actualizar(self, sucias=None):
+        if sucias is None:
+            self.vista.refrescar_todo()
+        else:
+            for pos in sucias:
+                self.vista.refrescar(pos)
+        self.lbl_turno.config(text=f"Turno {self.turno} de {self.lector.total_turnos}")
+        self.escala.set(self.turno)
+
+    def _paso(self):
+        """Re-juega un turno y devuelve las casillas que cambiaron."""
+        if self.turno % 2 == 0:
+            anterior = self.pos1
+            self.pos1, pos_rotada = self.tablero.mover_desde(anterior)
+        else:
+            anterior = self.pos2
+            self.pos2, pos_rotada = self.tablero.mover_desde(anterior)
+        self.turno += 1
+        return (anterior, pos_rotada, self.pos1, self.pos2)
+
+    def avanzar(self):
+        if self.turno < self.lector.total_turnos:
+            self.actualizar(self._paso())
+
+    def ir_a(self, turno):
+        turno = max(0, min(self.lector.total_turnos, turno))
+        if turno == self.turno:
+            return
+        self.tablero, self.pos1, self.pos2 = self.lector.estado_en(turno)
+        self.turno = turno
+        self.actualizar()
+
+    def alternar_auto(self):
+        if self.auto_activo:
+            self.detener_auto()
+        else:
+            self.auto_activo = True
+            self.btn_auto.config(text="Pausa ⏸")
+            self._auto_ultimo = time.perf_counter()
+            self._auto_acumulado = 0.0
+            self._auto_id = self.win.after(0, self._auto_cuadro)
+
+    def detener_auto(self):
+        if not self.auto_activo:
+            return
+        self.auto_activo = False
+        self.win.after_cancel(self._auto_id)
+        self.btn_auto.config(text="Reproducir ▶")
+
+    def _auto_cuadro(self):
+        velocidad = VELOCIDADES[self.velocidad_var.get()]
+        ahora = time.perf_counter()
+        if velocidad is None:
+            # a velocidad máxima se salta directo al turno de este cuadro
+            n = int(PRESUPUESTO_FRAME * 1_000_000)
+        else:
+            self._auto_acumulado += velocidad * (ahora - self._auto_ultimo)
+            n = int(self._auto_acumulado)
+            self._auto_acumulado -= n
+        self._auto_ultimo = ahora
+        n = min(n, self.lector.total_turnos - self.turno)
+        if n >= self.lector.intervalo:
+            # saltar desde un keyframe cuesta menos que re-jugar todos los turnos
+            self.ir_a(self.turno + n)
+        else:
+            sucias = set()
+            for _ in range(n):
+                sucias.update(self._paso())
+            self.actualizar(sucias)
+        if self.turno >= self.lector.total_turnos:
+            self.detener_auto()
+            return
+        self._auto_id = self.win.after(FRAME_MS, self._auto_cuadro)
+
+class VisorCompartido:
+    """
+    Muestra una partida que simula otro proceso (compartido.Simulador) sobre
+    un TableroCompartido. Cada REFRESCO_COMPARTIDO_MS mira la versión del
+    seqlock y, si hubo una publicación nueva, copia solo la región visible;
+    nunca frena al proceso que simula.
+    """
+    def __init__(self, app, compartido):
+        self.app = app
+        self.win = tk.Frame(app.root)
+        self.titulo = "Simulación compartida - Sistema Dinámico Repulsor"
+        self.tamanio = (920, 700)
+
+        self.compartido = compartido
+        self.jugadores = range(min(2, compartido.jugadores))  # los que tienen color
+        self.region = None
+        self.marcas = {}
+        self.version = None
+        self.proxima_cobertura = 0.0
+
+        self.lbl_turno = tk.Label(self.win, font=("Arial", 12, "bold"))
+        self.lbl_turno.pack(pady=6)
+        self.vista = VistaTablero(self.win, compartido.filas, compartido.columnas, self.estado_casilla)
+        self.vista.pack(fill="both", expand=True, padx=6, pady=6)
+        self.lbl_cobertura = tk.Label(self.win, font=("Arial", 10))
+        self.lbl_cobertura.pack()
+
+        btn_frame = tk.Frame(self.win)
+        btn_frame.pack(pady=10)
+        self.seguir_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(btn_frame, text="Seguir al jugador 1", variable=self.seguir_var).grid(row=0, column=0, padx=6)
+        tk.Button(btn_frame, text="Volver al menú", command=lambda: self.app.mostrar(MenuWindow)).grid(row=0, column=1, padx=6)
+
+        _, _, posiciones = compartido.estado()
+        vivas = [p for p in posiciones if p is not None]
+        if vivas:
+            self.vista.centrar_en(vivas[0])
+        self._id = self.win.after(0, self._actualizar)
+
+    def al_ocultar(self):
+        self.win.after_cancel(self._id)
+        self.compartido.cerrar()
+
+    def _leer(self):
+        """Copia de lo que se ve (ver TableroCompartido.region)."""
+        self.region = self.compartido.region(*self.vista.rango_visible(), self.jugadores)
+        self.marcas = ocupadas(self.region.posiciones)
+
+    def estado_casilla(self, pos):
+        region = self.region
+        if region is None or not region.contiene(pos):
+            # la vista se movió desde la última lectura
+            self._leer()
+            region = self.region
+            if not region.contiene(pos):
+                # casilla de un rango que la vista todavía no reacomodó
+                region = self.compartido.region(pos[0], pos[0] + 1, pos[1], pos[1] + 1, self.jugadores)
+        texto = self.marcas.get(pos) or Casilla.SIMBOLOS[region.direccion(pos)]
+        if region.visitada(0, pos):
+            bg = COLOR_J1
+        elif region.visitada(1, pos):
+            bg = COLOR_J2
+        else:
+            bg = CELL_BG_DEFAULT
+        return texto, bg
+
+    def _actualizar(self):
+        compartido = self.compartido
+        version = compartido.version
+        if version != self.version and not version & 1:
+            self.version = version
+            self._leer()
+            region = self.region
+            posiciones = region.posiciones
+            if self.seguir_var.get() and posiciones[0] is not None:
+                i0, i1, j0, j1 = self.vista.rango_visible()
+                i, j = posiciones[0]
+                if not (i0 <= i < i1 and j0 <= j < j1):
+                    self.vista.centrar_en(posiciones[0])
+                    self.vista.sincronizar()
+                    self._leer()
+                    region = self.region
+            self.vista.refrescar_todo()
+            if region.ganador is not None:
+                estado = f"Terminó en el turno {region.turno}: ganó el jugador {region.ganador + 1}"
+            else:
+                vivos = sum(p is not None for p in posiciones)
+                estado = f"Turno {region.turno} - {vivos} de {len(posiciones)} jugadores en juego"
+            self.lbl_turno.config(text=estado)
+            ahora = time.monotonic()
+            if ahora >= self.proxima_cobertura or region.ganador is not None:
+                # contar todos los bitsets es lo más caro: a lo sumo una vez por segundo
+                por_jugador, total = compartido.cobertura()
+                celdas = compartido.filas * compartido.columnas
+                detalle = "  ".join(f"J{j + 1}: {n}" for j, n in enumerate(por_jugador[:4]))
+                self.lbl_cobertura.config(text=f"Casillas pisadas: {total} ({total / celdas:.2%})  {detalle}")
+                self.proxima_cobertura = ahora + 1
+        self._id = self.win.after(REFRESCO_COMPARTIDO_MS, self._actualizar)
 
 # -------------------------------
 # Programa principal
 # -------------------------------
 if __name__ == "__main__":
-    MenuWindow()
+    Aplicacion().iniciar()
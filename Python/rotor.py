@@ -0,0 +1,97 @@
+# Modo rotor masivo: muchos caminantes atraviesan, uno detrás de otro, el mismo tablero.
+#
+# La regla de Tablero.mover_desde (avanzar según la flecha y después rotarla
+# en sentido horario) es un rotor-router. El rotor-router es abeliano: la
+# configuración final de flechas y la cantidad de caminantes que sale por
+# cada borde no dependen del orden en que se muevan los caminantes. Por eso,
+# en vez de mover K caminantes de a un paso, se acumulan en cada casilla y se
+# "disparan" todos juntos: c caminantes sobre una flecha d mandan c//4 a cada
+# vecino, uno más a los primeros c%4 en orden horario desde d, y la flecha
+# queda en (d + c) & 3. El resultado es exactamente el de la simulación
+# secuencial.
+
+from collections import deque
+
+from logica import Tablero, clave_zobrist
+
+LADOS = ('arriba', 'derecha', 'abajo', 'izquierda')
+
+class ResultadoRotor:
+    """Resultado de soltar caminantes sobre el tablero.
+
+    salidas: dict {((fila, columna), direccion): cantidad} con la casilla de
+             borde y la dirección por la que salieron.
+    por_lado: lista [arriba, derecha, abajo, izquierda] con los totales por borde.
+    pasos:   movimientos totales (lo que costaría la simulación de a uno).
+    """
+    __slots__ = ('salidas', 'por_lado', 'pasos')
+
+    def __init__(self, salidas, por_lado, pasos):
+        self.salidas = salidas
+        self.por_lado = por_lado
+        self.pasos = pasos
+
+    def __repr__(self):
+        lados = ", ".join(f"{l}={n}" for l, n in zip(LADOS, self.por_lado))
+        return f"ResultadoRotor({lados}, pasos={self.pasos})"
+
+def soltar_varios(tablero, inicios):
+    """
+    Suelta sobre `tablero` los caminantes indicados en `inicios`
+    ({(fila, columna): cantidad}) y los mueve hasta que salen todos.
+    Modifica las flechas del tablero (queda la configuración final).
+    """
+    datos = tablero.direcciones
+    filas, columnas = tablero.filas, tablero.columnas
+    dfila = [d[0] for d in Tablero.DELTAS]
+    dcol = [d[1] for d in Tablero.DELTAS]
+    con_hash = tablero.hash is not None
+
+    pendientes = {}
+    for (i, j), cant in inicios.items():
+        if not tablero.dentro_de_limites((i, j)):
+            raise ValueError(f"La posición ({i}, {j}) está fuera del tablero.")
+        if cant > 0:
+            k = i * columnas + j
+            pendientes[k] = pendientes.get(k, 0) + cant
+    # cola FIFO: una casilla espera su turno mientras sus vecinas le siguen
+    # sumando caminantes, así cada disparo mueve muchos de una vez
+    cola = deque(pendientes)
+    salidas = {}
+    pasos = 0
+
+    while cola:
+        k = cola.popleft()
+        c = pendientes.pop(k)
+        d = datos[k]
+        nueva_d = (d + c) & 3
+        datos[k] = nueva_d
+        if con_hash and nueva_d != d:
+            tablero.hash ^= clave_zobrist(k, d) ^ clave_zobrist(k, nueva_d)
+        pasos += c
+        q, r = divmod(c, 4)
+        i, j = divmod(k, columnas)
+        for t in range(4 if q else r):
+            n = q + 1 if t < r else q
+            dd = (d + t) & 3
+            ni = i + dfila[dd]
+            nj = j + dcol[dd]
+            if 0 <= ni < filas and 0 <= nj < columnas:
+                nk = ni * columnas + nj
+                if nk in pendientes:
+                    pendientes[nk] += n
+                else:
+                    pendientes[nk] = n
+                    cola.append(nk)
+            else:
+                clave = ((i, j), dd)
+                salidas[clave] = salidas.get(clave, 0) + n
+
+    por_lado = [0, 0, 0, 0]
+    for (_, dd), n in salidas.items():
+        por_lado[dd] += n
+    return ResultadoRotor(salidas, por_lado, pasos)
+
+def soltar(tablero, pos, cantidad):
+    """Suelta `cantidad` caminantes, uno detrás de otro, desde la casilla pos."""
+    return soltar_varios(tablero, {tuple(pos): cantidad})
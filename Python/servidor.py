@@ -0,0 +1,431 @@
+# Servidor asyncio de partidas: muchas partidas simultáneas en un solo proceso.
+#
+# Protocolo: JSON por líneas (un objeto por línea, UTF-8) sobre TCP o un
+# socket Unix. Cada conexión es un jugador en a lo sumo una partida.
+#
+# Cliente -> servidor ("op"):
+#   {"op": "nueva", "nombre": "Ana"}                 -> {"ok": true, "partida": id, "jugador": 0}
+#   {"op": "unirse", "partida": id, "nombre": "Beto"} -> {"ok": true, "partida": id, "jugador": 1}
+#   {"op": "numero", "valor": 1..100}                 mini-juegos (los dos jugadores)
+#   {"op": "tablero", "filas": 8, "columnas": 8}      el ganador del mini-juego 1
+#   {"op": "posicion", "fila": f, "columna": c}       primero el que empieza, después el otro
+#   {"op": "mover"}                                   el jugador de turno juega un turno
+# Un pedido inválido se responde con {"ok": false, "error": "..."}.
+#
+# Servidor -> clientes ("evento"), a los dos jugadores de la partida:
+#   inicio, mini_juego, tablero, posicion, turno, fin
+# Todos los eventos llevan "etapa" (numero_tablero, elegir_tablero, numero_turno,
+# posiciones, jugando, terminada) y "siguiente" (índice del jugador que tiene
+# que actuar, o null si actúan los dos o ninguno). El tablero se comunica por
+# su semilla: los clientes lo reconstruyen con Tablero.desde_semilla.
+#
+# Uso:  python servidor.py [--host 127.0.0.1] [--puerto 8765] [--unix ruta]
+#       python servidor.py --prueba 1000     (1000 partidas con clientes automáticos en localhost)
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from logica import Tablero
+
+TAMANIOS = ((8, 8), (10, 10))  # los mismos que ofrecen la consola y la GUI
+BACKLOG = 4096  # conexiones pendientes de aceptar (el valor por defecto, 100, se llena enseguida)
+ESPERA = 10.0   # segundos que se espera a que un jugador lea los eventos antes de desconectarlo
+
+def linea(mensaje):
+    return (json.dumps(mensaje, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+
+def leer_entero(mensaje, clave):
+    valor = mensaje.get(clave)
+    if not isinstance(valor, int) or isinstance(valor, bool):
+        raise ValueError(f"Falta el entero '{clave}'.")
+    return valor
+
+class Conexion:
+    """Un jugador conectado."""
+    __slots__ = ('writer', 'nombre', 'sala', 'indice')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.nombre = None
+        self.sala = None
+        self.indice = None
+
+    def enviar(self, mensaje):
+        self.escribir(linea(mensaje))
+
+    def escribir(self, datos):
+        if not self.writer.is_closing():
+            self.writer.write(datos)
+
+    async def vaciar(self, espera=None):
+        """
+        Espera a que el cliente lea lo pendiente, a lo sumo `espera` segundos:
+        si no, se corta la conexión. De un cliente desconectado (por esto o
+        por su cuenta) se encarga su atender(), que cierra la partida.
+        """
+        if self.writer.is_closing():
+            return
+        try:
+            await asyncio.wait_for(self.writer.drain(), espera)
+        except asyncio.TimeoutError:
+            self.writer.transport.abort()  # close() esperaría a mandar lo pendiente
+        except ConnectionError:
+            pass
+
+class Sala:
+    """
+    Estado de una partida: lo mínimo para seguir jugando (el tablero es un
+    bytearray de filas*columnas bytes). Cada pedido avanza la máquina de
+    estados sin bloquear; no hay un bucle de juego por partida.
+    """
+    __slots__ = ('id', 'conexiones', 'etapa', 'numeros', 'elige', 'empieza',
+                 'tablero', 'posiciones', 'turno_de', 'turnos', 'rnd')
+
+    def __init__(self, id, creador, rnd):
+        self.id = id
+        self.conexiones = [creador, None]
+        self.etapa = "esperando"
+        self.numeros = [None, None]
+        self.elige = None     # ganador del mini-juego 1 (elige el tablero)
+        self.empieza = None   # ganador del mini-juego 2 (mueve primero)
+        self.tablero = None
+        self.posiciones = [None, None]
+        self.turno_de = None
+        self.turnos = 0
+        self.rnd = rnd
+
+    def difundir(self, evento, **datos):
+        mensaje = {"evento": evento, "partida": self.id, "etapa": self.etapa,
+                   "siguiente": self.siguiente()}
+        mensaje.update(datos)
+        codificado = linea(mensaje)  # se codifica una sola vez para los dos
+        for c in self.conexiones:
+            if c is not None:
+                c.escribir(codificado)
+
+    def siguiente(self):
+        if self.etapa == "elegir_tablero":
+            return self.elige
+        if self.etapa in ("posiciones", "jugando"):
+            return self.turno_de
+        return None
+
+    # -------- etapas --------
+    def empezar(self):
+        self.etapa = "numero_tablero"
+        self.difundir("inicio", jugadores=[c.nombre for c in self.conexiones])
+
+    def numero(self, indice, valor):
+        if self.etapa not in ("numero_tablero", "numero_turno"):
+            raise ValueError("No es momento de elegir un número.")
+        if not 1 <= valor <= 100:
+            raise ValueError("El número debe estar entre 1 y 100.")
+        if self.numeros[indice] is not None:
+            raise ValueError("Ya elegiste tu número.")
+        self.numeros[indice] = valor
+        if None in self.numeros:
+            return
+        # mismas reglas que JuegoRepulsor.mini_juego_numero
+        secreto = self.rnd.randint(1, 100)
+        dif0 = abs(self.numeros[0] - secreto)
+        dif1 = abs(self.numeros[1] - secreto)
+        ganador = 0 if dif0 < dif1 else 1 if dif1 < dif0 else self.rnd.randrange(2)
+        numeros = self.numeros
+        self.numeros = [None, None]
+        if self.etapa == "numero_tablero":
+            self.elige = ganador
+            self.etapa = "elegir_tablero"
+        else:
+            self.empieza = self.turno_de = ganador
+            self.etapa = "posiciones"
+        self.difundir("mini_juego", numeros=numeros, secreto=secreto, ganador=ganador)
+
+    def elegir_tablero(self, indice, filas, columnas):
+        if self.etapa != "elegir_tablero" or indice != self.elige:
+            raise ValueError("No te toca elegir el tablero.")
+        if (filas, columnas) not in TAMANIOS:
+            raise ValueError(f"Tamaños posibles: {', '.join(f'{f}x{c}' for f, c in TAMANIOS)}.")
+        semilla = self.rnd.getrandbits(32)
+        self.tablero = Tablero.desde_semilla(filas, columnas, semilla)
+        self.etapa = "numero_turno"
+        self.difundir("tablero", filas=filas, columnas=columnas, semilla=semilla)
+
+    def elegir_posicion(self, indice, fila, columna):
+        if self.etapa != "posiciones" or indice != self.turno_de:
+            raise ValueError("No te toca elegir la posición.")
+        if not self.tablero.dentro_de_limites((fila, columna)):
+            raise ValueError("Posición fuera del tablero.")
+        if (fila, columna) == self.posiciones[1 - indice]:
+            raise ValueError("Esa posición ya está ocupada por el otro jugador.")
+        self.posiciones[indice] = (fila, columna)
+        if self.posiciones[1 - indice] is None:
+            self.turno_de = 1 - indice
+        else:
+            self.turno_de = self.empieza
+            self.etapa = "jugando"
+        self.difundir("posicion", jugador=indice, fila=fila, columna=columna)
+
+    def mover(self, indice):
+        if self.etapa != "jugando" or indice != self.turno_de:
+            raise ValueError("No es tu turno.")
+        nueva, rotada = self.tablero.mover_desde(self.posiciones[indice])
+        self.turnos += 1
+        if nueva is None:
+            self.etapa = "terminada"
+            self.turno_de = None
+            self.difundir("turno", turno=self.turnos, jugador=indice, rotada=rotada, posicion=None)
+            self.difundir("fin", ganador=1 - indice, motivo="salida", turnos=self.turnos)
+            return
+        self.posiciones[indice] = nueva
+        self.turno_de = 1 - indice
+        self.difundir("turno", turno=self.turnos, jugador=indice, rotada=rotada, posicion=nueva)
+
+class Servidor:
+    def __init__(self, semilla=None, espera=ESPERA):
+        self.salas = {}
+        self.espera = espera
+        self.proximo_id = 1
+        self.rnd = random.Random(semilla)
+        self.partidas_terminadas = 0
+
+    def procesar(self, conexion, mensaje):
+        """Aplica un pedido. Devuelve la respuesta directa (o None) y lanza ValueError si es inválido."""
+        if not isinstance(mensaje, dict):
+            raise ValueError("Cada línea debe ser un objeto JSON.")
+        op = mensaje.get("op")
+        if op in ("nueva", "unirse"):
+            if conexion.sala is not None:
+                raise ValueError("Ya estás en una partida.")
+            nombre = str(mensaje.get("nombre") or f"Jugador {2 if op == 'unirse' else 1}")
+            if op == "nueva":
+                conexion.nombre = nombre
+                sala = Sala(self.proximo_id, conexion, self.rnd)
+                self.salas[sala.id] = sala
+                self.proximo_id += 1
+                conexion.sala, conexion.indice = sala, 0
+                return {"ok": True, "partida": sala.id, "jugador": 0}
+            sala = self.salas.get(leer_entero(mensaje, "partida"))
+            if sala is None or sala.conexiones[1] is not None:
+                raise ValueError("La partida no existe o ya tiene dos jugadores.")
+            conexion.nombre = nombre
+            sala.conexiones[1] = conexion
+            conexion.sala, conexion.indice = sala, 1
+            conexion.enviar({"ok": True, "partida": sala.id, "jugador": 1})
+            sala.empezar()
+            return None
+
+        sala = conexion.sala
+        if sala is None:
+            raise ValueError("Primero hay que crear una partida o unirse a una.")
+        if op == "numero":
+            sala.numero(conexion.indice, leer_entero(mensaje, "valor"))
+        elif op == "tablero":
+            sala.elegir_tablero(conexion.indice, leer_entero(mensaje, "filas"), leer_entero(mensaje, "columnas"))
+        elif op == "posicion":
+            sala.elegir_posicion(conexion.indice, leer_entero(mensaje, "fila"), leer_entero(mensaje, "columna"))
+        elif op == "mover":
+            sala.mover(conexion.indice)
+            if sala.etapa == "terminada":
+                self.cerrar_sala(sala)
+        else:
+            raise ValueError(f"Operación desconocida: {op!r}.")
+        return None
+
+    def cerrar_sala(self, sala):
+        if self.salas.pop(sala.id, None) is not None and sala.etapa == "terminada":
+            self.partidas_terminadas += 1
+        for c in sala.conexiones:
+            if c is not None:
+                c.sala = c.indice = None
+
+    def desconectar(self, conexion):
+        sala = conexion.sala
+        if sala is None:
+            return
+        if sala.etapa not in ("esperando", "terminada"):
+            sala.etapa = "terminada"
+            sala.turno_de = None
+            sala.difundir("fin", ganador=1 - conexion.indice, motivo="abandono", turnos=sala.turnos)
+        self.cerrar_sala(sala)
+
+    async def atender(self, reader, writer):
+        conexion = Conexion(writer)
+        try:
+            while True:
+                try:
+                    datos = await reader.readline()
+                except ValueError:
+                    # línea más larga que el límite del StreamReader: el resto
+                    # todavía puede estar llegando, así que no se sigue leyendo
+                    conexion.enviar({"ok": False, "error": "La línea es demasiado larga."})
+                    await writer.drain()
+                    break
+                if not datos:
+                    break
+                sala = conexion.sala
+                try:
+                    mensaje = json.loads(datos)
+                except ValueError:
+                    respuesta = {"ok": False, "error": "La línea no es JSON válido."}
+                else:
+                    try:
+                        respuesta = self.procesar(conexion, mensaje)
+                    except ValueError as e:
+                        respuesta = {"ok": False, "error": str(e)}
+                if respuesta is not None:
+                    conexion.enviar(respuesta)
+                await writer.drain()
+                # los eventos también le llegaron al otro jugador: si no lee, que
+                # espere este (sin que crezca sin límite el buffer de escritura),
+                # pero no más de self.espera segundos
+                sala = sala or conexion.sala
+                if sala is not None:
+                    for otra in sala.conexiones:
+                        if otra is not None and otra is not conexion:
+                            await otra.vaciar(self.espera)
+        except ConnectionError:
+            pass
+        finally:
+            self.desconectar(conexion)
+            writer.close()
+
+    async def escuchar(self, host="127.0.0.1", puerto=8765, unix=None):
+        """Devuelve el asyncio.Server ya escuchando (puerto 0 = uno libre)."""
+        if unix is not None:
+            return await asyncio.start_unix_server(self.atender, path=unix, backlog=BACKLOG)
+        return await asyncio.start_server(self.atender, host, puerto, backlog=BACKLOG)
+
+# -------------------------------
+# Cliente automático (para probar en localhost)
+# -------------------------------
+async def cliente_automatico(abrir, nombre, partida, semilla=None):
+    """
+    Juega una partida completa eligiendo todo al azar. `abrir()` devuelve la
+    corrutina que abre la conexión (reader, writer). Si `partida` es un
+    asyncio.Future, crea una partida y pone su id en él; si es un id, se une.
+    Reconstruye el tablero desde la semilla y verifica cada turno informado.
+    Devuelve el evento "fin".
+    """
+    rnd = random.Random(semilla)
+    reader, writer = await abrir()
+
+    def enviar(mensaje):
+        writer.write(linea(mensaje))
+
+    async def recibir():
+        datos = await reader.readline()
+        if not datos:
+            raise ConnectionError("El servidor cerró la conexión.")
+        mensaje = json.loads(datos)
+        if mensaje.get("ok") is False:
+            raise RuntimeError(mensaje["error"])
+        return mensaje
+
+    if isinstance(partida, asyncio.Future):
+        enviar({"op": "nueva", "nombre": nombre})
+        respuesta = await recibir()
+        partida.set_result(respuesta["partida"])
+    else:
+        enviar({"op": "unirse", "partida": partida, "nombre": nombre})
+        respuesta = await recibir()
+    yo = respuesta["jugador"]
+    tablero = None
+    posiciones = [None, None]
+    try:
+        while True:
+            ev = await recibir()
+            if ev["evento"] == "tablero":
+                tablero = Tablero.desde_semilla(ev["filas"], ev["columnas"], ev["semilla"])
+            elif ev["evento"] == "posicion":
+                posiciones[ev["jugador"]] = (ev["fila"], ev["columna"])
+            elif ev["evento"] == "turno":
+                nueva, rotada = tablero.mover_desde(posiciones[ev["jugador"]])
+                esperado = None if ev["posicion"] is None else tuple(ev["posicion"])
+                if nueva != esperado or list(rotada) != ev["rotada"]:
+                    raise RuntimeError(f"El turno {ev['turno']} no coincide con el tablero de la semilla.")
+                posiciones[ev["jugador"]] = nueva
+            elif ev["evento"] == "fin":
+                return ev
+
+            etapa = ev["etapa"]
+            if etapa in ("numero_tablero", "numero_turno") and ev["evento"] in ("inicio", "tablero"):
+                enviar({"op": "numero", "valor": rnd.randint(1, 100)})
+            elif ev["siguiente"] == yo:
+                if etapa == "elegir_tablero":
+                    filas, columnas = rnd.choice(TAMANIOS)
+                    enviar({"op": "tablero", "filas": filas, "columnas": columnas})
+                elif etapa == "posiciones":
+                    libres = [(i, j) for i in range(tablero.filas) for j in range(tablero.columnas)
+                              if (i, j) != posiciones[1 - yo]]
+                    fila, columna = rnd.choice(libres)
+                    enviar({"op": "posicion", "fila": fila, "columna": columna})
+                elif etapa == "jugando":
+                    enviar({"op": "mover"})
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def prueba(cantidad, unix=False):
+    """Levanta un servidor en localhost y juega `cantidad` partidas a la vez con clientes automáticos."""
+    servidor = Servidor(semilla=0)
+    if unix:
+        ruta = os.path.join(tempfile.mkdtemp(), "repulsor.sock")
+        srv = await servidor.escuchar(unix=ruta)
+
+        def abrir():
+            return asyncio.open_unix_connection(ruta)
+    else:
+        srv = await servidor.escuchar(puerto=0)
+        puerto = srv.sockets[0].getsockname()[1]
+
+        def abrir():
+            return asyncio.open_connection("127.0.0.1", puerto)
+
+    async def una_partida(n):
+        creada = asyncio.get_running_loop().create_future()
+        primero = asyncio.create_task(cliente_automatico(abrir, f"A{n}", creada, semilla=2 * n))
+        segundo = asyncio.create_task(cliente_automatico(abrir, f"B{n}", await creada, semilla=2 * n + 1))
+        fin_a, fin_b = await asyncio.gather(primero, segundo)
+        if fin_a != fin_b:
+            raise RuntimeError("Los dos clientes recibieron finales distintos.")
+        return fin_a
+
+    t0 = time.perf_counter()
+    async with srv:
+        finales = await asyncio.gather(*(una_partida(n) for n in range(cantidad)))
+    segundos = time.perf_counter() - t0
+    turnos = sum(f["turnos"] for f in finales)
+    print(f"{cantidad} partidas simultáneas ({'unix' if unix else 'tcp'}) en {segundos:.2f} s: "
+          f"{turnos} turnos, {turnos / segundos:,.0f} turnos/s, "
+          f"{servidor.partidas_terminadas} terminadas, {len(servidor.salas)} abiertas")
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Servidor de partidas del Sistema Dinámico Repulsor.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--unix", help="escuchar en este socket Unix en lugar de TCP")
+    parser.add_argument("--prueba", type=int, metavar="N", help="jugar N partidas automáticas en localhost y salir")
+    args = parser.parse_args(argv)
+
+    if args.prueba:
+        asyncio.run(prueba(args.prueba, unix=args.unix is not None))
+        return
+
+    async def servir():
+        srv = await Servidor().escuchar(args.host, args.puerto, args.unix)
+        print(f"Escuchando en {args.unix or f'{args.host}:{args.puerto}'}", file=sys.stderr)
+        async with srv:
+            await srv.serve_forever()
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
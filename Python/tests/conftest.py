@@ -0,0 +1,7 @@
+# Los módulos del juego se importan por nombre (como hacen los scripts de
+# Python/): agregar ese directorio al path de los tests.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# Tabla de parejas (analisis.py) contra simular cada pareja por separado.
+
+import pytest
+
+from analisis import analizar
+from logica import Tablero
+from motor import simular
+
+@pytest.mark.parametrize("filas, columnas, semilla", [(1, 2, 0), (3, 3, 1), (4, 5, 2), (6, 6, 3), (5, 7, 4)])
+def test_tabla_igual_a_simular_cada_pareja(filas, columnas, semilla):
+    tablero = Tablero.desde_semilla(filas, columnas, semilla)
+    original = bytes(tablero.direcciones)
+    tabla = analizar(tablero)
+    assert bytes(tablero.direcciones) == original  # no lo modifica
+    casillas = [(i, j) for i in range(filas) for j in range(columnas)]
+    for pos in casillas:
+        # tiempo de salida de un caminante solitario
+        t = Tablero(filas, columnas, original)
+        pasos, actual = 0, pos
+        while actual is not None:
+            actual, _ = t.mover_desde(actual)
+            pasos += 1
+        assert tabla.salida[pos[0]][pos[1]] == pasos
+    for pos1 in casillas:
+        for pos2 in casillas:
+            if pos1 == pos2:
+                continue
+            esperado = simular(Tablero(filas, columnas, original), pos1, pos2)
+            assert (tabla.ganador(pos1, pos2), tabla.turnos(pos1, pos2)) == (esperado.ganador, esperado.turnos)
+    if filas * columnas > 2:
+        # hubo parejas resueltas por los tiempos de salida y otras simuladas
+        assert 0 < tabla.simuladas < len(casillas) * (len(casillas) - 1)
+
+def test_probabilidad_y_respuestas():
+    tablero = Tablero.desde_semilla(4, 4, 7)
+    tabla = analizar(tablero)
+    casillas = [(i, j) for i in range(4) for j in range(4)]
+    for pos1 in casillas:
+        gana = sum(tabla.ganador(pos1, pos2) == 1 for pos2 in casillas if pos2 != pos1)
+        assert tabla.probabilidad_inicio()[pos1[0]][pos1[1]] == gana / 15
+        respuestas = tabla.respuestas(pos1)
+        assert respuestas[pos1[0]][pos1[1]] is None
+        assert sum(v for fila in respuestas for v in fila if v is not None) == 15 - gana
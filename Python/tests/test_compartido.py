@@ -0,0 +1,99 @@
+# Tablero en memoria compartida (compartido.py): lo que publica el Simulador.
+
+import pytest
+
+from compartido import Simulador, TableroCompartido
+from logica import Tablero
+from motor import PartidaMultiple
+
+POSICIONES = [(10, 10), (5, 30), (30, 5)]
+
+def _pisadas(tablero, posiciones, max_turnos):
+    """Casillas por jugador que debería marcar el Simulador, jugando aparte."""
+    partida = PartidaMultiple(tablero, posiciones)
+    pisadas = [{k} for k in partida.posiciones]
+    while not partida.terminada and partida.turnos < max_turnos:
+        jug = partida.vivos[partida.siguiente]
+        pisadas[jug].add(partida.posiciones[jug])
+        partida.avanzar()
+    for jug, k in enumerate(partida.posiciones):
+        if k >= 0:
+            pisadas[jug].add(k)
+    return partida, pisadas
+
+def _bits(bitset):
+    valor = int.from_bytes(bitset, "little")
+    return {k for k in range(len(bitset) * 8) if valor >> k & 1}
+
+@pytest.fixture
+def simulador():
+    sim = Simulador(Tablero.desde_semilla(40, 45, 8), POSICIONES)
+    yield sim
+    sim.compartido.cerrar()
+
+def test_al_crear_publica_el_tablero_inicial(simulador):
+    c = simulador.compartido
+    assert (c.filas, c.columnas, c.jugadores) == (40, 45, 3)
+    assert bytes(c.grilla) == bytes(Tablero.desde_semilla(40, 45, 8).direcciones)
+    assert c.estado() == (0, None, POSICIONES)
+
+def test_publicar_copia_lo_jugado(simulador):
+    c = simulador.compartido
+    version = c.version
+    simulador.correr(max_turnos=5000)
+    assert c.version > version and not c.version & 1
+    turnos = simulador.partida.turnos
+    partida, pisadas = _pisadas(Tablero.desde_semilla(40, 45, 8), POSICIONES, turnos)
+    assert bytes(c.grilla) == bytes(simulador.tablero.direcciones) == bytes(partida.tablero.direcciones)
+    turno, ganador, posiciones = c.estado()
+    assert (turno, ganador) == (turnos, simulador.partida.ganador)
+    assert posiciones == [None if k < 0 else divmod(k, 45) for k in simulador.partida.posiciones]
+    assert [_bits(b) for b in c.visitadas] == pisadas
+    por_jugador, total = c.cobertura()
+    assert por_jugador == [len(p) for p in pisadas] and total == len(set().union(*pisadas))
+
+def test_region_igual_al_tablero(simulador):
+    simulador.correr(max_turnos=3000)
+    c = simulador.compartido
+    region = c.region(7, 19, 3, 28, jugadores=[0, 2])
+    datos = simulador.tablero.direcciones
+    assert region.turno == simulador.partida.turnos
+    for i in range(7, 19):
+        for j in range(3, 28):
+            k = i * 45 + j
+            assert region.contiene((i, j)) and region.direccion((i, j)) == datos[k]
+            for jug in (0, 2):
+                assert region.visitada(jug, (i, j)) == bool(c.visitadas[jug][k >> 3] >> (k & 7) & 1)
+            assert not region.visitada(1, (i, j))
+    assert not region.contiene((19, 3)) and not region.contiene((7, 28))
+
+def test_partida_terminada_publica_el_ganador():
+    tablero = Tablero.desde_semilla(6, 6, 2)
+    sim = Simulador(tablero, [(0, 0), (5, 5)])
+    try:
+        assert sim.correr() == sim.partida.ganador is not None
+        assert sim.compartido.estado()[1] == sim.partida.ganador
+        assert bytes(sim.compartido.grilla) == bytes(tablero.direcciones)
+    finally:
+        sim.compartido.cerrar()
+
+def test_abrir_por_nombre_y_cerrar(simulador):
+    simulador.correr(max_turnos=2000)
+    nombre = simulador.compartido.memoria.name
+    with TableroCompartido.abrir(nombre) as lector:
+        assert bytes(lector.grilla) == bytes(simulador.tablero.direcciones)
+        assert lector.estado() == simulador.compartido.estado()
+        simulador.correr(max_turnos=4000)
+        assert bytes(lector.grilla) == bytes(simulador.tablero.direcciones)
+    simulador.compartido.cerrar()
+    with pytest.raises(FileNotFoundError):
+        TableroCompartido.abrir(nombre)
+
+def test_leer_se_rinde_si_el_escritor_no_termina(simulador):
+    c = simulador.compartido
+    c._contadores[0] += 1  # publicación a medias
+    try:
+        with pytest.raises(RuntimeError):
+            c.leer(lambda c: c.posiciones.tolist(), intentos=3)
+    finally:
+        c._contadores[0] += 1
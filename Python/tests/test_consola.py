@@ -0,0 +1,75 @@
+# Dibujo del tablero en la terminal (consola.py).
+
+import io
+
+from consola import RenderizadorConsola, ocupadas, texto_tablero
+from logica import Casilla, Tablero
+
+def _a_mano(tablero, posiciones, i0, i1, j0, j1):
+    marcas = {}
+    for n, pos in enumerate(posiciones):
+        if pos is not None:
+            marcas[pos] = "X" if pos in marcas else str(n + 1)
+    return "\n".join(" ".join(marcas.get((i, j)) or tablero.casillas[i][j].obtener_simbolo()
+                              for j in range(j0, j1))
+                     for i in range(i0, i1))
+
+def test_texto_tablero_como_las_casillas():
+    tablero = Tablero.desde_semilla(7, 9, 4)
+    posiciones = [(0, 0), (3, 4), None, (3, 4), (6, 8)]
+    assert texto_tablero(tablero, posiciones) == _a_mano(tablero, posiciones, 0, 7, 0, 9)
+    assert texto_tablero(tablero, posiciones, 2, 5, 3, 7) == _a_mano(tablero, posiciones, 2, 5, 3, 7)
+    assert texto_tablero(tablero) == _a_mano(tablero, (), 0, 7, 0, 9)
+    assert ocupadas(posiciones) == {(0, 0): "1", (3, 4): "X", (6, 8): "5"}
+
+def test_modo_texto_imprime_el_cuadro_entero():
+    tablero = Tablero.desde_semilla(4, 5, 1)
+    salida = io.StringIO()
+    pantalla = RenderizadorConsola(tablero, salida, modo="texto", alto=50, ancho=80)
+    pantalla.dibujar([(1, 1), (2, 3)], "Turno 1")
+    assert salida.getvalue() == texto_tablero(tablero, [(1, 1), (2, 3)]) + "\n\nTurno 1\n"
+
+def _pantalla_ansi(tablero, posiciones):
+    salida = io.StringIO()
+    pantalla = RenderizadorConsola(tablero, salida, modo="ansi", alto=50, ancho=80)
+    pantalla.dibujar(posiciones, "inicio")
+    assert salida.getvalue().startswith("\x1b[H\x1b[2J" + texto_tablero(tablero, posiciones))
+    salida.seek(0)
+    salida.truncate()
+    return pantalla, salida
+
+def test_ansi_reescribe_solo_la_casilla_cambiada():
+    tablero = Tablero.desde_semilla(6, 6, 2)
+    posiciones = [(1, 1), (4, 4)]
+    pantalla, salida = _pantalla_ansi(tablero, posiciones)
+    tablero.direcciones[2 * 6 + 5] = (tablero.direcciones[2 * 6 + 5] + 1) & 3
+    pantalla.marcar((2, 5))
+    pantalla.dibujar(posiciones, "sigue")
+    simbolo = Casilla.SIMBOLOS[tablero.direccion((2, 5))]
+    assert salida.getvalue() == f"\x1b[3;11H{simbolo}" + "\x1b[7;1Hsigue\x1b[K\n\x1b[K"
+
+def test_ansi_movimiento_de_un_jugador():
+    tablero = Tablero.desde_semilla(6, 6, 3)
+    posiciones = [(2, 2), (4, 4)]
+    pantalla, salida = _pantalla_ansi(tablero, posiciones)
+    nueva, rotada = tablero.mover_desde(posiciones[0])
+    posiciones = [nueva, (4, 4)]
+    pantalla.dibujar(posiciones, "")
+    escrito = salida.getvalue()
+    estado = "\x1b[7;1H\x1b[K\n\x1b[K"
+    assert escrito.endswith(estado)
+    # la casilla que dejó (con la flecha ya rotada) y a la que llegó; el otro jugador no
+    dejada = f"\x1b[3;5H{Casilla.SIMBOLOS[tablero.direccion(rotada)]}"
+    llegada = f"\x1b[{nueva[0] + 1};{2 * nueva[1] + 1}H1"
+    assert escrito[:-len(estado)] in (dejada + llegada, llegada + dejada)
+
+def test_ansi_redibuja_todo_si_la_vista_se_mueve():
+    tablero = Tablero.desde_semilla(30, 30, 5)
+    salida = io.StringIO()
+    pantalla = RenderizadorConsola(tablero, salida, modo="ansi", alto=8, ancho=10)
+    pantalla.dibujar([(0, 0)], "")
+    salida.seek(0)
+    salida.truncate()
+    pantalla.dibujar([(20, 20)], "")
+    assert salida.getvalue().startswith("\x1b[H\x1b[2J")
+    assert pantalla._en_vista((20, 20))
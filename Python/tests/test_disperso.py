@@ -0,0 +1,62 @@
+# Tablero disperso (disperso.py) contra el Tablero denso que materializa.
+
+import random
+
+import pytest
+
+from disperso import TableroDisperso, caminar
+from motor import resolver, simular
+
+def _caminar_denso(tablero, pos, max_pasos=None):
+    pasos = 0
+    while pasos != max_pasos:
+        nueva, rotada = tablero.mover_desde(pos)
+        pasos += 1
+        if nueva is None:
+            return rotada, pasos
+        pos = nueva
+    return None, pasos
+
+@pytest.mark.parametrize("semilla", range(15))
+def test_caminar_como_el_tablero_materializado(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(1, 30), rnd.randint(1, 30)
+    disperso = TableroDisperso(filas, columnas, semilla)
+    disperso.activar_hash()
+    denso = disperso.materializar()
+    inicial = denso.hash
+    assert disperso.hash == 0
+    for _ in range(5):
+        pos = (rnd.randrange(filas), rnd.randrange(columnas))
+        assert caminar(disperso, pos) == _caminar_denso(denso, pos)
+        assert disperso.materializar().direcciones == denso.direcciones
+        assert disperso.direccion(pos) == denso.direccion(pos)
+    # el hash disperso es relativo al tablero inicial, el denso es absoluto
+    assert disperso.materializar().hash == denso.hash == disperso.hash ^ inicial
+
+def test_caminar_con_limite_de_pasos():
+    disperso = TableroDisperso(40, 40, 9)
+    denso = disperso.materializar()
+    assert caminar(disperso, (20, 20), 7) == _caminar_denso(denso, (20, 20), 7) == (None, 7)
+    assert disperso.materializar().direcciones == denso.direcciones
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_partida_como_simular(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(2, 15), rnd.randint(2, 15)
+    pos1, pos2 = rnd.sample([(i, j) for i in range(filas) for j in range(columnas)], 2)
+    disperso = TableroDisperso(filas, columnas, semilla)
+    denso = disperso.materializar()
+    assert resolver(disperso, pos1, pos2) == simular(denso, pos1, pos2)
+    assert disperso.materializar().direcciones == denso.direcciones
+
+def test_tablero_enorme_sin_grilla():
+    disperso = TableroDisperso(10 ** 6, 10 ** 6, 1)
+    salida, pasos = caminar(disperso, (500000, 500000), 20000)
+    assert salida is None and pasos == 20000
+    assert 0 < len(disperso.rotadas) <= 20000
+    copia = TableroDisperso(10 ** 6, 10 ** 6, 1)
+    pos = (500000, 500000)
+    for _ in range(20000):
+        pos, _ = copia.mover_desde(pos)
+    assert copia.rotadas == disperso.rotadas
@@ -0,0 +1,81 @@
+# Instantáneas con mmap y caminatas reanudables (instantaneas.py).
+
+import os
+import signal
+
+import pytest
+
+import instantaneas
+from instantaneas import Instantanea, caminar, crear_desde_semilla, guardar
+from logica import Tablero
+from motor import simular
+
+FILAS, COLUMNAS, SEMILLA = 60, 50, 11
+POS1, POS2 = (30, 25), (20, 10)
+
+@pytest.fixture
+def inicial(tmp_path):
+    ruta = str(tmp_path / "inicial.rtab")
+    crear_desde_semilla(ruta, FILAS, COLUMNAS, SEMILLA, POS1, POS2)
+    return ruta
+
+def _copia(origen, destino):
+    with open(origen, "rb") as f, open(destino, "wb") as g:
+        g.write(f.read())
+    return str(destino)
+
+def test_crear_desde_semilla_igual_al_tablero(inicial):
+    with Instantanea(inicial, "lectura") as inst:
+        assert (inst.filas, inst.columnas, inst.semilla, inst.turno) == (FILAS, COLUMNAS, SEMILLA, 0)
+        assert (inst.pos1, inst.pos2, inst.ganador) == (POS1, POS2, None)
+        tablero = inst.tablero.materializar()
+    assert tablero.direcciones == Tablero.desde_semilla(FILAS, COLUMNAS, SEMILLA).direcciones
+
+def test_guardar_y_abrir(tmp_path):
+    tablero = Tablero.desde_semilla(7, 9, 3)
+    tablero.mover_desde((2, 2))
+    ruta = str(tmp_path / "t.rtab")
+    guardar(ruta, tablero, (1, 1), None, turno=5, pasos1=3, pasos2=2)
+    with Instantanea(ruta) as inst:
+        assert inst.tablero.materializar().direcciones == tablero.direcciones
+        assert (inst.turno, inst.pos1, inst.pos2, inst.pasos1, inst.pasos2) == (5, (1, 1), None, 3, 2)
+        assert inst.ganador == 1
+
+def test_caminata_por_partes_igual_a_seguida(inicial, tmp_path):
+    seguida = _copia(inicial, tmp_path / "seguida.rtab")
+    por_partes = _copia(inicial, tmp_path / "partes.rtab")
+    total = 20000
+    fin = caminar(seguida, total)
+    for _ in range(total // 3000):
+        caminar(por_partes, 3000)
+    resultado = caminar(por_partes, total % 3000)
+    assert resultado == fin
+    with open(seguida, "rb") as a, open(por_partes, "rb") as b:
+        assert a.read() == b.read()
+    esperado = simular(Tablero.desde_semilla(FILAS, COLUMNAS, SEMILLA), POS1, POS2, total)
+    assert fin == (esperado.ganador, esperado.turnos)
+
+def test_ctrl_c_deja_un_checkpoint_reanudable(inicial, tmp_path, monkeypatch):
+    seguida = _copia(inicial, tmp_path / "seguida.rtab")
+    cortada = _copia(inicial, tmp_path / "cortada.rtab")
+    monkeypatch.setattr(instantaneas, "CHEQUEO", 64)
+    total = 20000
+    fin = caminar(seguida, total)
+
+    def interrumpir(turno):
+        os.kill(os.getpid(), signal.SIGINT)  # como un Ctrl+C en medio de la caminata
+    with pytest.raises(KeyboardInterrupt):
+        caminar(cortada, total, cada=0, progreso=interrumpir)
+    with Instantanea(cortada, "lectura") as inst:
+        hecho = inst.turno
+    assert 0 < hecho < total and hecho % 64 == 0  # se cortó entre turnos
+    assert caminar(cortada, total - hecho) == fin
+    with open(seguida, "rb") as a, open(cortada, "rb") as b:
+        assert a.read() == b.read()
+
+def test_partida_terminada_no_se_sigue(tmp_path):
+    ruta = str(tmp_path / "chico.rtab")
+    crear_desde_semilla(ruta, 4, 4, 1, (0, 0), (3, 3))
+    esperado = simular(Tablero.desde_semilla(4, 4, 1), (0, 0), (3, 3))
+    assert caminar(ruta) == (esperado.ganador, esperado.turnos)
+    assert caminar(ruta) == (esperado.ganador, esperado.turnos)
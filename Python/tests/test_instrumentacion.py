@@ -0,0 +1,77 @@
+# Observadores de motor.Partida y motor.PartidaMultiple, y las Metricas incorporadas.
+
+import json
+
+from instrumentacion import VARIABLE_ENTORNO, Metricas, Observador, metricas_del_entorno
+from logica import Tablero
+from motor import Partida, PartidaMultiple, simular
+
+class Registro(Observador):
+    def __init__(self):
+        self.eventos = []
+
+    def inicio_turno(self, turno, jugador):
+        self.eventos.append(("inicio_turno", turno, jugador))
+
+    def rotacion(self, turno, jugador, pos):
+        self.eventos.append(("rotacion", turno, jugador, pos))
+
+    def salida(self, turno, jugador, pos):
+        self.eventos.append(("salida", turno, jugador, pos))
+
+    def fin_turno(self, turno, jugador, sigue):
+        self.eventos.append(("fin_turno", turno, jugador, sigue))
+
+def test_partida_notifica_cada_turno():
+    tablero = Tablero.desde_semilla(8, 8, 4)
+    esperado = simular(tablero.copiar(), (3, 3), (5, 2))
+    partida = Partida(tablero, (3, 3), (5, 2))
+    registro = Registro()
+    partida.observadores.append(registro)
+    while partida.avanzar():
+        pass
+    eventos = registro.eventos
+    assert partida.turnos == esperado.turnos
+    # por turno: inicio, rotación y fin; el último además tiene la salida
+    assert len(eventos) == 3 * esperado.turnos + 1
+    for t in range(1, esperado.turnos):
+        inicio, rotacion, fin = eventos[3 * (t - 1):3 * t]
+        jugador = (t - 1) & 1
+        assert inicio == ("inicio_turno", t, jugador)
+        assert rotacion[:3] == ("rotacion", t, jugador)
+        assert fin == ("fin_turno", t, jugador, True)
+    ultimo = 2 - esperado.ganador
+    assert eventos[-2] == ("salida", esperado.turnos, ultimo, esperado.salida)
+    assert eventos[-1] == ("fin_turno", esperado.turnos, ultimo, False)
+
+def test_partida_multiple_con_observadores_juega_igual():
+    inicios = [(1, 1), (4, 6), (7, 2), (3, 3)]
+    sin = PartidaMultiple(Tablero.desde_semilla(9, 9, 8), inicios)
+    sin.jugar()
+    con = PartidaMultiple(Tablero.desde_semilla(9, 9, 8), inicios)
+    registro = Registro()
+    con.observadores.append(registro)
+    con.jugar()
+    assert (con.ganador, con.turnos, con.eliminados) == (sin.ganador, sin.turnos, sin.eliminados)
+    salidas = [e for e in registro.eventos if e[0] == "salida"]
+    assert [(jug, turno) for _, turno, jug, _ in salidas] == [(j, t) for j, t, _ in con.eliminados]
+
+def test_metricas_cuentan_turnos(tmp_path):
+    metricas = Metricas(str(tmp_path / "m.json"))
+    partida = Partida(Tablero.desde_semilla(8, 8, 4), (3, 3), (5, 2))
+    partida.observadores.append(metricas)
+    while partida.avanzar():
+        pass
+    assert metricas.turnos == partida.turnos
+    assert metricas.salidas == 1
+    assert sum(metricas.rotaciones.values()) == partida.turnos
+    assert sum(metricas.histograma) == partida.turnos
+    metricas.informar()
+    datos = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+    assert datos["turnos"] == partida.turnos
+
+def test_metricas_del_entorno(monkeypatch):
+    monkeypatch.delenv(VARIABLE_ENTORNO, raising=False)
+    assert metricas_del_entorno() is None
+    monkeypatch.setenv(VARIABLE_ENTORNO, "-")
+    assert metricas_del_entorno().destino == "-"
@@ -0,0 +1,103 @@
+# Tablero (generación por semilla, empaquetado de las direcciones) y Visitadas.
+
+import random
+
+import pytest
+
+import logica
+from logica import Tablero, Visitadas, desempaquetar, direcciones_al_azar, empaquetar
+
+def test_misma_semilla_mismo_tablero():
+    a = Tablero.desde_semilla(37, 23, 1234)
+    random.random()  # el estado del random global no influye
+    b = Tablero.desde_semilla(37, 23, 1234)
+    assert a.direcciones == b.direcciones
+    assert a.semilla == b.semilla == 1234
+    assert Tablero.desde_semilla(37, 23, 1235).direcciones != a.direcciones
+
+def test_semilla_fija_el_tablero():
+    # las repeticiones, el servidor y las instantáneas guardan solo la semilla:
+    # cambiar cómo se sortea rompería los archivos ya guardados
+    assert bytes(Tablero.desde_semilla(2, 3, 42).direcciones) == b"\x03\x02\x03\x00\x02\x02"
+
+def test_semilla_direcciones_validas_y_parejas():
+    t = Tablero.desde_semilla(100, 100, 7)
+    conteo = [t.direcciones.count(d) for d in range(4)]
+    assert sum(conteo) == 100 * 100
+    assert all(2300 < c < 2700 for c in conteo)
+
+def test_copiar_es_independiente():
+    t = Tablero.desde_semilla(5, 5, 3)
+    copia = t.copiar()
+    copia.mover_desde((2, 2))
+    assert copia.direcciones != t.direcciones
+
+@pytest.mark.parametrize("cantidad", [0, 1, 3, 4, 5, 1001])
+def test_empaquetar_ida_y_vuelta(cantidad):
+    direcciones = direcciones_al_azar(cantidad, random.Random(cantidad))
+    empaquetadas = empaquetar(direcciones)
+    assert len(empaquetadas) == (cantidad + 3) // 4
+    assert desempaquetar(empaquetadas, cantidad) == direcciones
+
+# -------------------------------
+# Visitadas
+# -------------------------------
+def test_visitadas_como_un_set():
+    filas, columnas = 40, 70
+    rnd = random.Random(2)
+    v = Visitadas(filas, columnas)
+    referencia = {}
+    for turno in range(3000):
+        pos = (rnd.randrange(filas), rnd.randrange(columnas))
+        if rnd.random() < 0.1:
+            v.discard(pos)
+            referencia.pop(pos, None)
+        else:
+            assert v.add(pos, turno) == (pos not in referencia)
+            referencia.setdefault(pos, turno)
+    assert len(v) == len(referencia)
+    assert list(v) == sorted(referencia)  # en el orden del tablero
+    for i in range(filas):
+        for j in range(columnas):
+            assert ((i, j) in v) == ((i, j) in referencia)
+            assert v.primer_turno((i, j)) == referencia.get((i, j))
+    assert v.cobertura() == len(referencia) / (filas * columnas)
+
+@pytest.mark.parametrize("pos", [None, (-1, 0), (0, -1), (3, 0), (0, 4), (-1, 5)])
+def test_visitadas_fuera_del_tablero(pos):
+    v = Visitadas(3, 4)
+    for i in range(3):
+        for j in range(4):
+            v.add((i, j))
+    assert pos not in v
+    assert v.primer_turno(pos) is None
+    v.discard(pos)
+    assert len(v) == 12
+
+def test_visitadas_bitset_solo_del_rango_visitado():
+    v = Visitadas(10000, 10000)
+    v.add((5000, 5000))
+    v.add((5001, 5003))
+    assert len(v.bits) < 10000  # no (10000*10000)/8 bytes
+    assert v.primeras is None and len(v.turnos) == 8 * len(v.bits)
+    assert (5001, 5003) in v and (5001, 5002) not in v
+
+def test_visitadas_sin_bitset_si_el_rango_es_enorme(monkeypatch):
+    monkeypatch.setattr(logica, "MAX_BITS", 1024)
+    v = Visitadas(1000, 1000)
+    v.add((0, 0), 1)
+    v.add((999, 999), 2)
+    assert v.bits is None
+    assert (999, 999) in v and (500, 500) not in v
+    assert v.primer_turno((999, 999)) == 2 and v.primer_turno((0, 0)) == 1
+    assert len(v) == 2 and list(v) == [(0, 0), (999, 999)]
+
+def test_visitadas_compartidas():
+    a, b = Visitadas(50, 50), Visitadas(50, 50)
+    for k in range(0, 2500, 3):
+        a.add(divmod(k, 50))
+    for k in range(1000, 2500, 2):
+        b.add(divmod(k, 50))
+    esperado = len({k for k in range(0, 2500, 3)} & {k for k in range(1000, 2500, 2)})
+    assert a.compartidas(b) == b.compartidas(a) == esperado
+    assert a.compartidas(Visitadas(50, 50)) == 0
@@ -0,0 +1,69 @@
+# lotes.simular_lote contra el camino escalar (motor.simular).
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logica import Tablero
+from lotes import desde_tableros, simular_lote
+from motor import simular
+
+def _lote(k, filas, columnas, semilla):
+    rnd = random.Random(semilla)
+    tableros = [Tablero.desde_semilla(filas, columnas, s) for s in range(semilla, semilla + k)]
+    pos1 = [(rnd.randrange(filas), rnd.randrange(columnas)) for _ in range(k)]
+    pos2 = [(rnd.randrange(filas), rnd.randrange(columnas)) for _ in range(k)]
+    return tableros, pos1, pos2
+
+@pytest.mark.parametrize("max_turnos", [None, 7])
+def test_lote_igual_a_simular(max_turnos):
+    tableros, pos1, pos2 = _lote(200, 9, 7, 0)
+    lote = desde_tableros(tableros)
+    res = simular_lote(lote, np.array(pos1), np.array(pos2), max_turnos)
+    for n, t in enumerate(tableros):
+        esperado = simular(t, pos1[n], pos2[n], max_turnos)
+        assert res.ganador[n] == (esperado.ganador or 0)
+        assert res.turnos[n] == esperado.turnos
+        salida = None if res.salida[n, 0] < 0 else tuple(int(x) for x in res.salida[n])
+        assert salida == esperado.salida
+        # las rotaciones quedan en el arreglo, como en el tablero de simular
+        assert lote[n].tobytes() == bytes(t.direcciones)
+
+def test_lote_no_contiguo_da_error():
+    lote = desde_tableros([Tablero.desde_semilla(5, 5, s) for s in range(4)])
+    with pytest.raises(ValueError):
+        simular_lote(lote[:, :, ::-1], (0, 0), (1, 1))
+
+def test_lote_de_otro_tipo_da_error():
+    with pytest.raises(ValueError):
+        simular_lote(np.zeros((2, 3, 3), dtype=np.int64), (0, 0), (1, 1))
+
+@pytest.mark.parametrize("filas, columnas", [(1, 6), (6, 1), (2, 2), (13, 4)])
+@pytest.mark.parametrize("max_turnos", [None, 0, 1, 30])
+def test_lote_al_paso_de_simular(filas, columnas, max_turnos):
+    # partidas de largos muy distintos en el mismo lote: las que terminan salen
+    # de los activos y las demás siguen igual que en simular
+    tableros, pos1, pos2 = _lote(60, filas, columnas, 3)
+    lote = desde_tableros(tableros)
+    res = simular_lote(lote, np.array(pos1), np.array(pos2), max_turnos)
+    assert len(res) == 60
+    for n, t in enumerate(tableros):
+        esperado = simular(t, pos1[n], pos2[n], max_turnos)
+        assert (int(res.ganador[n]), int(res.turnos[n])) == (esperado.ganador or 0, esperado.turnos)
+        assert lote[n].tobytes() == bytes(t.direcciones)
+
+def test_lote_con_un_mismo_par_para_todas():
+    tableros = [Tablero.desde_semilla(8, 8, s) for s in range(50)]
+    lote = desde_tableros(tableros)
+    res = simular_lote(lote, (3, 4), (3, 4))  # los dos empiezan en la misma casilla
+    for n, t in enumerate(tableros):
+        esperado = simular(t, (3, 4), (3, 4))
+        assert (int(res.ganador[n]), int(res.turnos[n])) == (esperado.ganador, esperado.turnos)
+
+def test_lote_de_otra_forma_da_error():
+    with pytest.raises(ValueError):
+        simular_lote(np.zeros((3, 3), dtype=np.uint8), (0, 0), (1, 1))
+    with pytest.raises(ValueError):
+        desde_tableros([Tablero.desde_semilla(3, 3, 0), Tablero.desde_semilla(3, 4, 0)])
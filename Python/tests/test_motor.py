@@ -0,0 +1,190 @@
+# Motor sin interfaz (motor.py): PartidaMultiple contra simular y contra sí
+# misma, deshacer turnos, hash Zobrist y detección de ciclos.
+
+import random
+
+import pytest
+
+from instrumentacion import Observador
+from logica import Jugador, Tablero
+from motor import Partida, PartidaMultiple, resolver, simular
+
+def _al_azar(rnd, filas, columnas, cantidad):
+    return rnd.sample([(i, j) for i in range(filas) for j in range(columnas)], cantidad)
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_dos_jugadores_como_simular(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(1, 12), rnd.randint(2, 12)
+    pos1, pos2 = _al_azar(rnd, filas, columnas, 2)
+    tablero = Tablero.desde_semilla(filas, columnas, semilla)
+    esperado = simular(tablero.copiar(), pos1, pos2)
+    partida = PartidaMultiple(tablero, [pos1, pos2])
+    assert partida.jugar() == esperado.ganador - 1
+    assert partida.turnos == esperado.turnos
+    assert partida.eliminados == [(2 - esperado.ganador, esperado.turnos, esperado.salida)]
+
+@pytest.mark.parametrize("semilla", range(60))
+def test_ronda_como_avanzar(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(2, 10), rnd.randint(2, 10)
+    jugadores = rnd.randint(1, min(6, filas * columnas))
+    posiciones = _al_azar(rnd, filas, columnas, jugadores)
+    if rnd.random() < 0.3:
+        posiciones[-1] = posiciones[0]  # dos jugadores en la misma casilla
+    por_rondas = Tablero.desde_semilla(filas, columnas, semilla)
+    por_turnos = por_rondas.copiar()
+    por_rondas.activar_hash()
+    por_turnos.activar_hash()
+    a = PartidaMultiple(por_rondas, posiciones)
+    b = PartidaMultiple(por_turnos, posiciones)
+    while not a.terminada:
+        # a veces se empieza la ronda a mitad de vuelta
+        if rnd.random() < 0.3:
+            a.avanzar()
+            b.avanzar()
+            continue
+        a.ronda()
+        rondas = b.rondas
+        while b.rondas == rondas and not b.terminada:
+            b.avanzar()
+        assert a.turnos == b.turnos
+        if not a.terminada:
+            assert (a.rondas, a.siguiente) == (b.rondas, b.siguiente)
+        assert list(a.posiciones) == list(b.posiciones) and list(a.vivos) == list(b.vivos)
+        assert por_rondas.direcciones == por_turnos.direcciones
+        assert por_rondas.hash == por_turnos.hash == por_rondas.copiar().activar_hash()
+    assert b.terminada and a.ganador == b.ganador and a.eliminados == b.eliminados
+
+def test_ronda_corta_si_la_partida_termina():
+    # el primero sale enseguida: el segundo gana sin que muevan los demás
+    tablero = Tablero(1, 4, [3, 0, 0, 0])
+    partida = PartidaMultiple(tablero, [(0, 0), (0, 1)])
+    partida.ronda()
+    assert partida.terminada and partida.ganador == 1 and partida.turnos == 1
+    assert tablero.direcciones == bytearray([0, 0, 0, 0])
+
+class _Contador(Observador):
+    def __init__(self):
+        self.turnos = 0
+
+    def fin_turno(self, turno, jugador, sigue):
+        self.turnos += 1
+
+def test_ronda_con_observadores_completa_la_vuelta():
+    # con observadores se juega de a un turno; si sale el primero de la vuelta
+    # los demás igual tienen que mover
+    tablero = Tablero(1, 5, [3, 1, 1, 1, 0])
+    partida = PartidaMultiple(tablero, [(0, 0), (0, 1), (0, 2)])
+    partida.observadores = [_Contador()]
+    assert partida.ronda() == 1
+    assert partida.turnos == 3 and partida.observadores[0].turnos == 3
+    assert partida.posiciones_actuales() == [None, (0, 2), (0, 3)]
+
+# -------------------------------
+# Deshacer (Partida.retroceder, Jugador.deshacer)
+# -------------------------------
+@pytest.mark.parametrize("semilla", range(20))
+def test_retroceder_hasta_el_principio(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(2, 12), rnd.randint(2, 12)
+    pos1, pos2 = _al_azar(rnd, filas, columnas, 2)
+    tablero = Tablero.desde_semilla(filas, columnas, semilla)
+    tablero.activar_hash()
+    partida = Partida(tablero, pos1, pos2)
+    estados = []
+    while partida.ganador is None:
+        estados.append((bytes(tablero.direcciones), tablero.hash, list(partida.posiciones)))
+        partida.avanzar()
+    assert partida.ganador == simular(Tablero.desde_semilla(filas, columnas, semilla), pos1, pos2).ganador
+    while estados:
+        partida.retroceder()
+        assert (bytes(tablero.direcciones), tablero.hash, partida.posiciones) == estados.pop()
+        assert partida.ganador is None and partida.turnos == len(estados)
+    with pytest.raises(ValueError):
+        partida.retroceder()
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_jugadores_deshacen_visitadas_y_pasos(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(2, 12), rnd.randint(2, 12)
+    tablero = Tablero.desde_semilla(filas, columnas, semilla)
+    tablero.activar_hash()
+    jugadores = [Jugador("A"), Jugador("B")]
+    for jugador, pos in zip(jugadores, _al_azar(rnd, filas, columnas, 2)):
+        jugador.posicion = pos
+        jugador.preparar(tablero)
+
+    def estado():
+        return (bytes(tablero.direcciones), tablero.hash,
+                [(j.posicion, j.pasos, list(j.visitadas), [j.visitadas.primer_turno(p) for p in j.visitadas])
+                 for j in jugadores])
+    historia = []
+    turno = 0
+    while True:
+        jugador = jugadores[turno & 1]
+        antes = estado()
+        primera = jugador.posicion not in jugador.visitadas
+        pos = jugador.posicion
+        turno += 1
+        sigue, _ = jugador.mover(tablero, turno)
+        historia.append((jugador, pos, primera, antes))
+        if not sigue:
+            break
+    while historia:
+        jugador, pos, primera, antes = historia.pop()
+        jugador.deshacer(tablero, pos, primera)
+        assert estado() == antes
+
+# -------------------------------
+# Hash Zobrist y detección de ciclos
+# -------------------------------
+def test_hash_incremental_igual_al_recalculado():
+    rnd = random.Random(5)
+    tablero = Tablero.desde_semilla(9, 13, 5)
+    tablero.activar_hash()
+    inicial = tablero.hash
+    pos = (4, 6)
+    for _ in range(2000):
+        nueva, rotada = tablero.mover_desde(pos)
+        assert tablero.hash == tablero.copiar().activar_hash()
+        pos = nueva or (rnd.randrange(9), rnd.randrange(13))
+    assert tablero.hash != inicial
+    # cuatro rotaciones de la misma casilla dejan la flecha y el hash como estaban
+    antes = tablero.hash
+    for _ in range(4):
+        tablero.mover_desde((0, 0))
+    assert tablero.hash == antes
+
+class _Toro(Tablero):
+    """Tablero cuyos bordes se tocan: nadie sale nunca, así que la partida entra en un ciclo."""
+    def mover_desde(self, pos):
+        nueva, rotada = super().mover_desde(pos)
+        if nueva is None:
+            di, dj = Tablero.DELTAS[(self.direccion(rotada) - 1) & 3]
+            nueva = ((rotada[0] + di) % self.filas, (rotada[1] + dj) % self.columnas)
+        return nueva, rotada
+
+def _estado_del_toro(semilla, turnos):
+    tablero = _Toro(3, 3, Tablero.desde_semilla(3, 3, semilla).direcciones)
+    posiciones = [(0, 0), (2, 1)]
+    for t in range(turnos):
+        posiciones[t & 1] = tablero.mover_desde(posiciones[t & 1])[0]
+    return bytes(tablero.direcciones), posiciones
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_resolver_encuentra_el_ciclo(semilla):
+    tablero = _Toro(3, 3, Tablero.desde_semilla(3, 3, semilla).direcciones)
+    resultado = resolver(tablero, (0, 0), (2, 1))
+    assert resultado.ganador is None and resultado.salida is None
+    assert resultado.ciclo > 0 and resultado.ciclo % 2 == 0  # mismo jugador por mover
+    # el estado en el que cortó ya se había dado `ciclo` turnos antes
+    assert _estado_del_toro(semilla, resultado.turnos) == _estado_del_toro(semilla, resultado.turnos - resultado.ciclo)
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_resolver_como_simular_si_termina(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(1, 15), rnd.randint(2, 15)
+    pos1, pos2 = _al_azar(rnd, filas, columnas, 2)
+    esperado = simular(Tablero.desde_semilla(filas, columnas, semilla), pos1, pos2)
+    assert resolver(Tablero.desde_semilla(filas, columnas, semilla), pos1, pos2) == esperado
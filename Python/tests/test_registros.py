@@ -0,0 +1,66 @@
+# Archivos columnares de registros.py: ida y vuelta en binario y CSV.
+
+import pytest
+
+from logica import Tablero
+from motor import simular
+from registros import (CAMPOS, EscritorColumnar, LectorColumnar, bloques_en_paralelo, jugar,
+                       partidas, resumir)
+from torneo import todas_las_parejas
+
+def _registros():
+    return list(partidas(4, 4, range(6), todas_las_parejas(4, 4)[:20], max_turnos=500))
+
+def test_jugar_como_simular_con_cobertura():
+    t = Tablero.desde_semilla(6, 6, 9)
+    esperado = simular(t.copiar(), (1, 1), (4, 2))
+    ganador, turnos, salida, cobertura = jugar(t.copiar(), (1, 1), (4, 2))
+    assert (ganador, turnos, salida) == (esperado.ganador, esperado.turnos, esperado.salida)
+    assert 2 <= cobertura <= 36
+    # con primero=2 mueve antes el jugador 2: es la misma partida con los papeles cambiados
+    ganador, turnos, salida, _ = jugar(t.copiar(), (4, 2), (1, 1), primero=2)
+    assert (ganador, turnos, salida) == (3 - esperado.ganador, esperado.turnos, esperado.salida)
+
+@pytest.mark.parametrize("extension", ["rcol", "csv"])
+def test_ida_y_vuelta(tmp_path, extension):
+    ruta = str(tmp_path / f"partidas.{extension}")
+    registros = _registros()
+    with EscritorColumnar(ruta, tam_bloque=7) as escritor:
+        escritor.escribir_todos(registros)
+    lector = LectorColumnar(ruta, tam_bloque=7)
+    assert lector.formato == ("csv" if extension == "csv" else "binario")
+    assert list(lector) == registros
+    bloques = list(lector.bloques())
+    assert all(len(b) == len(CAMPOS) for b in bloques)
+    assert sum(len(b[0]) for b in bloques) == len(registros)
+
+@pytest.mark.parametrize("extension", ["rcol", "csv"])
+def test_agregar_a_un_archivo_existente(tmp_path, extension):
+    ruta = str(tmp_path / f"partidas.{extension}")
+    registros = _registros()
+    mitad = len(registros) // 2
+    with EscritorColumnar(ruta, tam_bloque=5) as escritor:
+        escritor.escribir_todos(registros[:mitad])
+    with EscritorColumnar(ruta, tam_bloque=5) as escritor:
+        escritor.escribir_todos(registros[mitad:])
+    assert list(LectorColumnar(ruta)) == registros
+
+def test_binario_truncado_da_error(tmp_path):
+    ruta = tmp_path / "partidas.rcol"
+    with EscritorColumnar(str(ruta)) as escritor:
+        escritor.escribir_todos(_registros())
+    datos = ruta.read_bytes()
+    ruta.write_bytes(datos[:-3])
+    with pytest.raises(ValueError):
+        list(LectorColumnar(str(ruta)))
+
+def test_en_paralelo_igual_que_en_serie(tmp_path):
+    pares = todas_las_parejas(4, 4)[:10]
+    ruta = str(tmp_path / "paralelo.rcol")
+    with EscritorColumnar(ruta) as escritor:
+        for cols in bloques_en_paralelo(4, 4, range(5), pares, trabajadores=2, semillas_por_bloque=2):
+            escritor.escribir_columnas(cols)
+    assert list(LectorColumnar(ruta)) == list(partidas(4, 4, range(5), pares))
+    resumen = resumir(LectorColumnar(ruta).bloques())
+    assert resumen.partidas == 50
+    assert resumen.victorias1 + resumen.victorias2 + resumen.empates == 50
@@ -0,0 +1,76 @@
+# Una partida grabada con GrabadorPartida se reconstruye igual con LectorRepeticion.
+
+import io
+
+import pytest
+
+from logica import Tablero
+from motor import Partida
+from repeticion import GrabadorPartida, LectorRepeticion
+
+def _grabar(tablero, pos1, pos2, semilla, intervalo, max_turnos=5000):
+    """Juega y graba; devuelve (archivo, estados después de cada turno, eventos)."""
+    archivo = io.BytesIO()
+    grabador = GrabadorPartida(archivo, tablero, pos1, pos2, semilla=semilla, intervalo=intervalo)
+    partida = Partida(tablero, pos1, pos2)
+    estados = [(tablero.instantanea(), pos1, pos2)]
+    eventos = []
+    while partida.ganador is None and partida.turnos < max_turnos:
+        jug = partida.turnos & 1
+        sigue = partida.avanzar()
+        p1, p2 = partida.posiciones
+        if not sigue:
+            if jug == 0:
+                p1 = None
+            else:
+                p2 = None
+        grabador.registrar(jug, not sigue, p1, p2)
+        estados.append((tablero.instantanea(), p1, p2))
+        eventos.append((partida.turnos, jug, not sigue))
+    grabador.cerrar()
+    archivo.seek(0)
+    return archivo, estados, eventos
+
+@pytest.mark.parametrize("con_semilla", [True, False])
+def test_repeticion_ida_y_vuelta(con_semilla):
+    tablero = Tablero.desde_semilla(12, 12, 5)
+    archivo, estados, eventos = _grabar(tablero, (6, 6), (3, 8), 5 if con_semilla else None, intervalo=16)
+    lector = LectorRepeticion(archivo)
+    assert (lector.filas, lector.columnas) == (12, 12)
+    assert lector.total_turnos == len(estados) - 1
+    assert len(lector.keyframes) > 1
+    assert list(lector.eventos()) == eventos
+    assert list(lector.eventos(desde=10)) == eventos[10:]
+    for turno in list(range(0, len(estados), 7)) + [len(estados) - 1]:
+        t, p1, p2 = lector.estado_en(turno)
+        assert (t.instantanea(), p1, p2) == estados[turno]
+
+def test_repeticion_truncada_da_error():
+    archivo, _, _ = _grabar(Tablero.desde_semilla(8, 8, 1), (0, 0), (7, 7), 1, intervalo=16)
+    datos = archivo.getvalue()
+    with pytest.raises(ValueError):
+        LectorRepeticion(io.BytesIO(datos[:30]))
+    with pytest.raises(ValueError):
+        LectorRepeticion(io.BytesIO(b"XXXX" + datos[4:]))
+
+@pytest.mark.parametrize("semilla", [-1, -7, 1 << 63, 10 ** 30, "tablero", True])
+def test_semilla_que_no_entra_en_la_cabecera(semilla):
+    # desde_semilla acepta estas semillas; la repetición guarda la grilla en su lugar
+    tablero = Tablero.desde_semilla(10, 10, semilla)
+    inicial = tablero.instantanea()
+    archivo, estados, _ = _grabar(tablero, (5, 5), (2, 7), semilla, intervalo=16)
+    lector = LectorRepeticion(archivo)
+    assert lector.semilla is None and lector.keyframes[0].largo > 0
+    assert lector.estado_en(0)[0].instantanea() == inicial
+    t, p1, p2 = lector.estado_en(lector.total_turnos)
+    assert (t.instantanea(), p1, p2) == estados[-1]
+
+def test_estado_en_cada_turno_con_muchos_keyframes():
+    archivo, estados, _ = _grabar(Tablero.desde_semilla(30, 30, 2), (15, 15), (10, 20), 2, intervalo=4)
+    lector = LectorRepeticion(archivo)
+    assert len(lector.keyframes) > 10
+    for turno, (instantanea, p1, p2) in enumerate(estados):
+        t, q1, q2 = lector.estado_en(turno)
+        assert (t.instantanea(), q1, q2) == (instantanea, p1, p2)
+    with pytest.raises(ValueError):
+        lector.estado_en(len(estados))
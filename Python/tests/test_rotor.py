@@ -0,0 +1,60 @@
+# Modo rotor masivo (rotor.py): soltar en lote contra mover de a un caminante.
+
+import random
+
+import pytest
+
+from logica import Tablero
+from rotor import soltar, soltar_varios
+
+def _de_a_uno(tablero, caminantes):
+    """Mueve cada caminante hasta que sale, uno detrás de otro, con mover_desde."""
+    salidas = {}
+    pasos = 0
+    for pos in caminantes:
+        while True:
+            d = tablero.direccion(pos)
+            nueva, rotada = tablero.mover_desde(pos)
+            pasos += 1
+            if nueva is None:
+                salidas[(rotada, d)] = salidas.get((rotada, d), 0) + 1
+                break
+            pos = nueva
+    return salidas, pasos
+
+@pytest.mark.parametrize("semilla", range(15))
+def test_soltar_como_de_a_uno(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(1, 12), rnd.randint(1, 12)
+    pos = (rnd.randrange(filas), rnd.randrange(columnas))
+    cantidad = rnd.randint(1, 300)
+    lote = Tablero.desde_semilla(filas, columnas, semilla)
+    lote.activar_hash()
+    uno = lote.copiar()
+    resultado = soltar(lote, pos, cantidad)
+    salidas, pasos = _de_a_uno(uno, [pos] * cantidad)
+    assert resultado.salidas == salidas and resultado.pasos == pasos
+    assert sum(resultado.por_lado) == cantidad
+    assert lote.direcciones == uno.direcciones
+    assert lote.hash == uno.hash == lote.copiar().activar_hash()
+
+@pytest.mark.parametrize("semilla", range(15))
+def test_soltar_varios_no_depende_del_orden(semilla):
+    rnd = random.Random(semilla)
+    filas, columnas = rnd.randint(2, 10), rnd.randint(2, 10)
+    inicios = {}
+    for _ in range(rnd.randint(1, 6)):
+        pos = (rnd.randrange(filas), rnd.randrange(columnas))
+        inicios[pos] = inicios.get(pos, 0) + rnd.randint(0, 50)
+    caminantes = [pos for pos, cant in inicios.items() for _ in range(cant)]
+    rnd.shuffle(caminantes)  # el orden no importa: el rotor-router es abeliano
+    lote = Tablero.desde_semilla(filas, columnas, semilla)
+    uno = lote.copiar()
+    resultado = soltar_varios(lote, inicios)
+    salidas, pasos = _de_a_uno(uno, caminantes)
+    assert resultado.salidas == salidas and resultado.pasos == pasos
+    assert lote.direcciones == uno.direcciones
+
+def test_soltar_fuera_del_tablero():
+    with pytest.raises(ValueError):
+        soltar(Tablero.desde_semilla(3, 3, 0), (3, 0), 5)
@@ -0,0 +1,72 @@
+# Servidor de partidas (servidor.py) con clientes automáticos en localhost.
+
+import asyncio
+import os
+
+import pytest
+
+from servidor import Conexion, Servidor, cliente_automatico
+
+async def _partidas(servidor, abrir, cantidad):
+    async def una(n):
+        creada = asyncio.get_running_loop().create_future()
+        primero = asyncio.create_task(cliente_automatico(abrir, f"A{n}", creada, semilla=2 * n))
+        segundo = asyncio.create_task(cliente_automatico(abrir, f"B{n}", await creada, semilla=2 * n + 1))
+        return await asyncio.gather(primero, segundo)
+    return await asyncio.gather(*(una(n) for n in range(cantidad)))
+
+def test_partidas_por_tcp():
+    async def correr():
+        servidor = Servidor(semilla=1)
+        srv = await servidor.escuchar(puerto=0)
+        puerto = srv.sockets[0].getsockname()[1]
+        async with srv:
+            finales = await _partidas(servidor, lambda: asyncio.open_connection("127.0.0.1", puerto), 20)
+        return servidor, finales
+    servidor, finales = asyncio.run(correr())
+    for fin_a, fin_b in finales:
+        assert fin_a == fin_b
+        assert fin_a["motivo"] == "salida" and fin_a["ganador"] in (0, 1) and fin_a["turnos"] > 0
+    assert servidor.partidas_terminadas == 20 and not servidor.salas
+
+def test_partida_por_socket_unix(tmp_path):
+    ruta = os.path.join(str(tmp_path), "repulsor.sock")
+
+    async def correr():
+        servidor = Servidor(semilla=2)
+        srv = await servidor.escuchar(unix=ruta)
+        async with srv:
+            return await _partidas(servidor, lambda: asyncio.open_unix_connection(ruta), 3)
+    for fin_a, fin_b in asyncio.run(correr()):
+        assert fin_a == fin_b
+
+def test_unirse_fallido_no_cambia_el_nombre():
+    servidor = Servidor()
+    conexion = Conexion(None)
+    with pytest.raises(ValueError):
+        servidor.procesar(conexion, {"op": "unirse", "partida": 7, "nombre": "Beto"})
+    with pytest.raises(ValueError):
+        servidor.procesar(conexion, {"op": "unirse", "partida": [7], "nombre": "Beto"})
+    assert conexion.nombre is None and conexion.sala is None
+
+class _EscritorTrabado:
+    """Escritor de un cliente que no lee nunca: drain() no termina."""
+    class _Transporte:
+        abortado = False
+
+        def abort(self):
+            self.abortado = True
+
+    def __init__(self):
+        self.transport = self._Transporte()
+
+    def is_closing(self):
+        return self.transport.abortado
+
+    async def drain(self):
+        await asyncio.sleep(3600)
+
+def test_vaciar_desconecta_al_que_no_lee():
+    escritor = _EscritorTrabado()
+    asyncio.run(Conexion(escritor).vaciar(0.01))
+    assert escritor.transport.abortado
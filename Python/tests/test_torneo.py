@@ -0,0 +1,29 @@
+# Torneo en varios procesos (torneo.py) contra jugar las semillas en serie.
+
+from torneo import correr_torneo, jugar_bloque, parejas_distintas, todas_las_parejas
+
+def _como_tuplas(estadisticas):
+    return [(e.partidas, e.victorias1, e.victorias2, e.turnos) for e in estadisticas]
+
+def test_varios_trabajadores_como_en_serie():
+    pares = todas_las_parejas(3, 3)[::5]
+    esperado = _como_tuplas(jugar_bloque(6, 6, 10, 90, pares))
+    progreso = []
+    res = correr_torneo(6, 6, range(10, 90), pares, trabajadores=3, tam_bloque=7,
+                        progreso=lambda jugadas, total: progreso.append((jugadas, total)))
+    assert list(res) == pares
+    assert _como_tuplas(res.values()) == esperado
+    assert progreso[-1] == (80, 80) and len(progreso) == 12
+
+def test_con_limite_de_turnos():
+    pares = [((0, 0), (4, 4)), ((2, 2), (2, 3))]
+    res = correr_torneo(5, 5, (0, 40), pares, trabajadores=2, max_turnos=3)
+    assert _como_tuplas(res.values()) == _como_tuplas(jugar_bloque(5, 5, 0, 40, pares, 3))
+    assert all(e.empates > 0 for e in res.values())
+
+def test_parejas_repetidas_se_juegan_una_vez():
+    pares = [((0, 0), (1, 1)), [[2, 2], [0, 1]], [(0, 0), (1, 1)]]
+    assert parejas_distintas(pares) == [((0, 0), (1, 1)), ((2, 2), (0, 1))]
+    res = correr_torneo(4, 4, range(0, 30), pares, trabajadores=2)
+    assert list(res) == [((0, 0), (1, 1)), ((2, 2), (0, 1))]
+    assert [e.partidas for e in res.values()] == [30, 30]
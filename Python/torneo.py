@@ -0,0 +1,182 @@
+# Torneo multi-núcleo: barrido de semillas y posiciones iniciales en paralelo.
+#
+# A cada proceso se le envían solo rangos de semillas (no tableros): el
+# trabajador genera el tablero de cada semilla, juega todas las parejas de
+# posiciones iniciales sobre copias de ese tablero y devuelve únicamente los
+# acumulados por pareja. El proceso principal va sumando los bloques a medida
+# que terminan.
+#
+# Uso:  python torneo.py --tamanio 8 --semillas 0:100000 --par 0,0:7,7 --par 3,3:4,4
+#       (sin --par se juegan todas las parejas de casillas distintas)
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from logica import Tablero
+from motor import simular
+
+class EstadisticaPar:
+    """Acumulado de las partidas jugadas desde una pareja de posiciones iniciales."""
+    __slots__ = ('partidas', 'victorias1', 'victorias2', 'turnos')
+
+    def __init__(self, partidas=0, victorias1=0, victorias2=0, turnos=0):
+        self.partidas = partidas
+        self.victorias1 = victorias1
+        self.victorias2 = victorias2
+        self.turnos = turnos
+
+    def sumar(self, otra):
+        self.partidas += otra.partidas
+        self.victorias1 += otra.victorias1
+        self.victorias2 += otra.victorias2
+        self.turnos += otra.turnos
+
+    @property
+    def empates(self):
+        return self.partidas - self.victorias1 - self.victorias2
+
+    @property
+    def tasa_victoria1(self):
+        return self.victorias1 / self.partidas if self.partidas else 0.0
+
+    @property
+    def turnos_promedio(self):
+        return self.turnos / self.partidas if self.partidas else 0.0
+
+def jugar_bloque(filas, columnas, inicio, fin, pares, max_turnos=None):
+    """Juega las semillas [inicio, fin) para cada pareja. Se ejecuta en el trabajador."""
+    acum = [[0, 0, 0, 0] for _ in pares]
+    for semilla in range(inicio, fin):
+        original = Tablero.desde_semilla(filas, columnas, semilla)
+        for a, (p1, p2) in zip(acum, pares):
+            r = simular(original.copiar(), p1, p2, max_turnos)
+            a[0] += 1
+            if r.ganador == 1:
+                a[1] += 1
+            elif r.ganador == 2:
+                a[2] += 1
+            a[3] += r.turnos
+    return [EstadisticaPar(*a) for a in acum]
+
+def todas_las_parejas(filas, columnas):
+    celdas = [(i, j) for i in range(filas) for j in range(columnas)]
+    return [(p1, p2) for p1 in celdas for p2 in celdas if p1 != p2]
+
+def parejas_distintas(pares):
+    """Las parejas como tuplas, sin repetidas (una pareja repetida se contaría dos veces)."""
+    return list(dict.fromkeys((tuple(p1), tuple(p2)) for p1, p2 in pares))
+
+def bloques(semillas, tam_bloque):
+    for inicio in range(semillas.start, semillas.stop, tam_bloque):
+        yield inicio, min(inicio + tam_bloque, semillas.stop)
+
+def iterar_torneo(filas, columnas, semillas, pares, trabajadores=None, tam_bloque=None, max_turnos=None):
+    """
+    Reparte el barrido en un ProcessPoolExecutor y va devolviendo, a medida que
+    terminan, tuplas (semillas_jugadas, estadisticas_del_bloque).
+    """
+    if not isinstance(semillas, range):
+        semillas = range(*semillas)
+    pares = parejas_distintas(pares)
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if tam_bloque is None:
+        # unos 8 bloques por trabajador para balancear la carga
+        tam_bloque = max(1, len(semillas) // (trabajadores * 8))
+    with ProcessPoolExecutor(max_workers=trabajadores) as ex:
+        futuros = {ex.submit(jugar_bloque, filas, columnas, ini, fin, pares, max_turnos): fin - ini
+                   for ini, fin in bloques(semillas, tam_bloque)}
+        for fut in as_completed(futuros):
+            yield futuros[fut], fut.result()
+
+def correr_torneo(filas, columnas, semillas, pares, trabajadores=None, tam_bloque=None, max_turnos=None, progreso=None):
+    """
+    Juega todas las semillas para cada pareja de posiciones iniciales y devuelve
+    un dict {(pos1, pos2): EstadisticaPar}. `progreso(jugadas, total)` se llama
+    cada vez que llega un bloque.
+    """
+    if not isinstance(semillas, range):
+        semillas = range(*semillas)
+    pares = parejas_distintas(pares)
+    total = {par: EstadisticaPar() for par in pares}
+    jugadas = 0
+    for cant, parcial in iterar_torneo(filas, columnas, semillas, pares, trabajadores, tam_bloque, max_turnos):
+        for par, est in zip(pares, parcial):
+            total[par].sumar(est)
+        jugadas += cant
+        if progreso is not None:
+            progreso(jugadas, len(semillas))
+    return total
+
+# -------------------------------
+# Línea de comandos
+# -------------------------------
+def leer_par(texto):
+    """Tipo de argparse para "fila,col:fila,col" (también lo usa registros.py)."""
+    try:
+        a, b = texto.split(":")
+        p1 = tuple(int(x) for x in a.split(","))
+        p2 = tuple(int(x) for x in b.split(","))
+        if len(p1) != 2 or len(p2) != 2:
+            raise ValueError
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"pareja inválida '{texto}' (formato: fila,col:fila,col)")
+    return p1, p2
+
+def leer_rango(texto):
+    """Tipo de argparse para "inicio:fin" -> range(inicio, fin)."""
+    try:
+        ini, fin = (int(x) for x in texto.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"rango inválido '{texto}' (formato: inicio:fin)")
+    return range(ini, fin)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Torneo del Sistema Dinámico Repulsor en varios núcleos.")
+    parser.add_argument("--tamanio", type=int, default=8, help="lado del tablero (8 o 10 en el juego)")
+    parser.add_argument("--semillas", type=leer_rango, default=range(0, 1000), help="rango inicio:fin")
+    parser.add_argument("--par", type=leer_par, action="append", dest="pares",
+                        help="posiciones iniciales fila,col:fila,col (se puede repetir)")
+    parser.add_argument("--trabajadores", type=int, default=None)
+    parser.add_argument("--bloque", type=int, default=None, help="semillas por unidad de trabajo")
+    parser.add_argument("--max-turnos", type=int, default=None)
+    parser.add_argument("--mostrar", type=int, default=20, help="cantidad de parejas a listar")
+    args = parser.parse_args(argv)
+
+    if not args.semillas:
+        parser.error(f"el rango de semillas {args.semillas.start}:{args.semillas.stop} está vacío")
+    if args.trabajadores is not None and args.trabajadores < 1:
+        parser.error("--trabajadores tiene que ser al menos 1")
+    if args.bloque is not None and args.bloque < 1:
+        parser.error("--bloque tiene que ser al menos 1")
+
+    n = args.tamanio
+    pares = args.pares or todas_las_parejas(n, n)
+    for p1, p2 in pares:
+        for f, c in (p1, p2):
+            if not (0 <= f < n and 0 <= c < n):
+                parser.error(f"la posición ({f}, {c}) está fuera del tablero {n}x{n}")
+
+    def progreso(jugadas, total):
+        print(f"\r{jugadas}/{total} semillas", end="", file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    res = correr_torneo(n, n, args.semillas, pares, args.trabajadores, args.bloque, args.max_turnos, progreso)
+    seg = time.perf_counter() - t0
+    print(file=sys.stderr)
+
+    partidas = sum(e.partidas for e in res.values())
+    if not partidas:
+        print("No se jugó ninguna partida.")
+        return
+    print(f"{partidas} partidas en {seg:.2f} s ({partidas / seg:,.0f} partidas/s)")
+    print(f"{'pos1':>8} {'pos2':>8} {'gana 1':>8} {'gana 2':>8} {'empate':>7} {'turnos':>8}")
+    orden = sorted(res.items(), key=lambda kv: kv[1].tasa_victoria1, reverse=True)
+    for (p1, p2), e in orden[:args.mostrar]:
+        print(f"{str(p1):>8} {str(p2):>8} {e.tasa_victoria1:>8.3f} {e.victorias2 / e.partidas:>8.3f} "
+              f"{e.empates / e.partidas:>7.3f} {e.turnos_promedio:>8.2f}")
+
+if __name__ == "__main__":
+    main()
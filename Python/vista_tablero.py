@@ -0,0 +1,198 @@
+# Dibujo del tablero sobre un único tk.Canvas, con scroll, zoom y virtualización.
+#
+# En lugar de un tk.Label por casilla, solo existen ítems del Canvas (un
+# rectángulo y un texto) para las casillas que se ven en pantalla. Al hacer
+# scroll o zoom, los ítems de las casillas que salen de la vista se reciclan
+# para las que entran, así que crear el tablero y desplazarse cuesta lo mismo
+# en un 10x10 que en un 1000x1000.
+#
+# La vista no conoce las reglas del juego: pide el contenido de cada casilla
+# a la función estado_casilla(pos) -> (texto, color_de_fondo).
+
+import tkinter as tk
+
+TAM_CELDA = 40      # píxeles por casilla con zoom 1
+TAM_MIN = 6
+TAM_MAX = 120
+TAM_MIN_TEXTO = 14  # por debajo de este tamaño solo se pintan los colores
+ANCHO_MAX = 880     # tamaño máximo pedido para el Canvas (el resto se ve con scroll)
+ALTO_MAX = 520
+
+class VistaTablero:
+    def __init__(self, parent, filas, columnas, estado_casilla, tam_celda=TAM_CELDA):
+        self.filas = filas
+        self.columnas = columnas
+        self.estado_casilla = estado_casilla
+        self.tam = tam_celda
+
+        self.frame = tk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, bg="gray85", highlightthickness=0,
+                                width=min(columnas * tam_celda, ANCHO_MAX),
+                                height=min(filas * tam_celda, ALTO_MAX))
+        barra_v = tk.Scrollbar(self.frame, orient="vertical", command=self._scroll_y)
+        barra_h = tk.Scrollbar(self.frame, orient="horizontal", command=self._scroll_x)
+        self.canvas.config(yscrollcommand=barra_v.set, xscrollcommand=barra_h.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        barra_v.grid(row=0, column=1, sticky="ns")
+        barra_h.grid(row=1, column=0, sticky="ew")
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        zoom = tk.Frame(self.frame)
+        zoom.grid(row=2, column=0, columnspan=2, sticky="e")
+        tk.Button(zoom, text="−", width=2, command=lambda: self.zoom(0.8)).pack(side="left")
+        tk.Button(zoom, text="+", width=2, command=lambda: self.zoom(1.25)).pack(side="left")
+
+        self.items = {}   # (i, j) -> [rect, texto, texto_mostrado, bg_mostrado]
+        self.libres = []  # ítems ocultos listos para reutilizar
+        self._rango = (0, 0, 0, 0)
+        self._pendiente = None
+
+        self.canvas.bind("<Configure>", lambda ev: self.programar_sincronizar())
+        self.canvas.bind("<MouseWheel>", self._rueda)
+        self.canvas.bind("<Shift-MouseWheel>", lambda ev: self._rueda(ev, horizontal=True))
+        self.canvas.bind("<Control-MouseWheel>", lambda ev: self.zoom(1.25 if ev.delta > 0 else 0.8))
+        self.canvas.bind("<Button-4>", lambda ev: self._scroll_y("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda ev: self._scroll_y("scroll", 3, "units"))
+        self.canvas.bind("<Shift-Button-4>", lambda ev: self._scroll_x("scroll", -3, "units"))
+        self.canvas.bind("<Shift-Button-5>", lambda ev: self._scroll_x("scroll", 3, "units"))
+        self.canvas.bind("<Control-Button-4>", lambda ev: self.zoom(1.25))
+        self.canvas.bind("<Control-Button-5>", lambda ev: self.zoom(0.8))
+        self._actualizar_region()
+
+    def pack(self, **kw):
+        self.frame.pack(**kw)
+
+    def _tamanio_vista(self):
+        """Ancho y alto del Canvas (el pedido, si todavía no se mostró en pantalla)."""
+        ancho, alto = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if ancho <= 1 or alto <= 1:
+            ancho, alto = int(self.canvas.cget("width")), int(self.canvas.cget("height"))
+        return ancho, alto
+
+    # -------- scroll y zoom --------
+    def _actualizar_region(self):
+        self.canvas.config(scrollregion=(0, 0, self.columnas * self.tam, self.filas * self.tam),
+                           xscrollincrement=self.tam, yscrollincrement=self.tam)
+
+    def _scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self.programar_sincronizar()
+
+    def _scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self.programar_sincronizar()
+
+    def _rueda(self, ev, horizontal=False):
+        pasos = -1 if ev.delta > 0 else 1
+        if horizontal:
+            self._scroll_x("scroll", pasos * 3, "units")
+        else:
+            self._scroll_y("scroll", pasos * 3, "units")
+
+    def zoom(self, factor):
+        nuevo = max(TAM_MIN, min(TAM_MAX, int(round(self.tam * factor))))
+        if nuevo == self.tam:
+            return
+        # conservar la casilla que está en el centro de la vista
+        ancho, alto = self._tamanio_vista()
+        ci = (self.canvas.canvasy(alto / 2)) / self.tam
+        cj = (self.canvas.canvasx(ancho / 2)) / self.tam
+        self.tam = nuevo
+        for pos in list(self.items):
+            self._liberar(pos)
+        self._rango = (0, 0, 0, 0)
+        self._actualizar_region()
+        self.centrar_en((ci, cj))
+
+    def centrar_en(self, pos):
+        """Desplaza la vista para que la casilla pos (admite fracciones) quede en el centro."""
+        i, j = pos
+        ancho, alto = self._tamanio_vista()
+        total_x, total_y = self.columnas * self.tam, self.filas * self.tam
+        if total_x > 0:
+            self.canvas.xview_moveto(max(0.0, (j * self.tam - ancho / 2) / total_x))
+        if total_y > 0:
+            self.canvas.yview_moveto(max(0.0, (i * self.tam - alto / 2) / total_y))
+        self.programar_sincronizar()
+
+    # -------- virtualización --------
+    def programar_sincronizar(self):
+        """Agrupa varios eventos de scroll/resize en un único redibujo."""
+        if self._pendiente is None:
+            self._pendiente = self.canvas.after_idle(self.sincronizar)
+
+    def rango_visible(self):
+        t = self.tam
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        ancho, alto = self._tamanio_vista()
+        x1 = self.canvas.canvasx(ancho)
+        y1 = self.canvas.canvasy(alto)
+        return (max(0, int(y0 // t)), min(self.filas, int(y1 // t) + 1),
+                max(0, int(x0 // t)), min(self.columnas, int(x1 // t) + 1))
+
+    def sincronizar(self):
+        """Crea/recicla ítems para que existan exactamente los de las casillas visibles."""
+        self._pendiente = None
+        i0, i1, j0, j1 = rango = self.rango_visible()
+        if rango == self._rango:
+            return
+        for pos in [p for p in self.items if not (i0 <= p[0] < i1 and j0 <= p[1] < j1)]:
+            self._liberar(pos)
+        for i in range(i0, i1):
+            for j in range(j0, j1):
+                if (i, j) not in self.items:
+                    self._ocupar((i, j))
+        self._rango = rango
+
+    def _ocupar(self, pos):
+        i, j = pos
+        t = self.tam
+        x, y = j * t, i * t
+        if self.libres:
+            rect, txt = self.libres.pop()
+            self.canvas.coords(rect, x, y, x + t, y + t)
+            self.canvas.coords(txt, x + t / 2, y + t / 2)
+            self.canvas.itemconfig(rect, state="normal")
+            self.canvas.itemconfig(txt, state="normal")
+        else:
+            rect = self.canvas.create_rectangle(x, y, x + t, y + t, outline="gray60")
+            txt = self.canvas.create_text(x + t / 2, y + t / 2)
+        fuente = ("Consolas", max(6, t * 14 // TAM_CELDA))
+        self.canvas.itemconfig(txt, font=fuente)
+        self.items[pos] = [rect, txt, None, None]
+        self.refrescar(pos)
+
+    def _liberar(self, pos):
+        rect, txt, _, _ = self.items.pop(pos)
+        self.canvas.itemconfig(rect, state="hidden")
+        self.canvas.itemconfig(txt, state="hidden")
+        self.libres.append((rect, txt))
+
+    # -------- contenido --------
+    def refrescar(self, pos):
+        """Vuelve a pedir el estado de la casilla pos; no hace nada si no está visible."""
+        item = self.items.get(pos)
+        if item is None:
+            return
+        texto, bg = self.estado_casilla(pos)
+        if self.tam < TAM_MIN_TEXTO:
+            texto = ""
+        if texto != item[2]:
+            self.canvas.itemconfig(item[1], text=texto)
+            item[2] = texto
+        if bg != item[3]:
+            self.canvas.itemconfig(item[0], fill=bg)
+            item[3] = bg
+
+    def refrescar_todo(self):
+        for pos in self.items:
+            self.refrescar(pos)
+
+    def pintar_fondo(self, pos, color):
+        """Pinta el fondo de pos sin pasar por estado_casilla (para animaciones)."""
+        item = self.items.get(pos)
+        if item is not None:
+            self.canvas.itemconfig(item[0], fill=color)
+            item[3] = color